@@ -0,0 +1,67 @@
+"""Measure the throughput of the compute plan auto batching.
+
+The compute plan is made of chains of traintuples, each traintuple being tested once.
+The time and the memory allocated to split the plan into batches are reported, the
+batches are consumed as they are generated, as when they are submitted.
+
+Usage:
+    python benchmarks/auto_batching.py --tuples 1000 10000 100000 --batch-size 500
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from substra.sdk import compute_plan, schemas
+
+
+def _make_spec(n_tuples, chain_length):
+    traintuples = list()
+    testtuples = list()
+    for i in range(n_tuples // 2):
+        in_models_ids = [f'traintuple-{i - 1}'] if i % chain_length else None
+        traintuples.append({
+            'algo_key': 'algo-key',
+            'data_manager_key': 'dataset-key',
+            'train_data_sample_keys': [f'data-sample-{i}'],
+            'traintuple_id': f'traintuple-{i}',
+            'in_models_ids': in_models_ids,
+        })
+        testtuples.append({'objective_key': 'objective-key', 'traintuple_id': f'traintuple-{i}'})
+    return schemas.ComputePlanSpec(traintuples=traintuples, testtuples=testtuples)
+
+
+def _run(spec, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_batches = sum(1 for _ in compute_plan.auto_batching(spec, **kwargs))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n_batches, elapsed, peak
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tuples', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--max-batch-bytes', type=int, default=None)
+    parser.add_argument('--batch-by-rank', action='store_true')
+    parser.add_argument('--chain-length', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f'{"tuples":>8} {"batches":>8} {"time (s)":>9} {"tuples/s":>10} {"peak (MB)":>10}')
+    for n_tuples in args.tuples:
+        spec = _make_spec(n_tuples, args.chain_length)
+        n_batches, elapsed, peak = _run(
+            spec,
+            batch_size=args.batch_size,
+            max_batch_bytes=args.max_batch_bytes,
+            batch_by_rank=args.batch_by_rank,
+        )
+        print(f'{n_tuples:>8} {n_batches:>8} {elapsed:>9.3f} {n_tuples / elapsed:>10.0f} '
+              f'{peak / 1024 / 1024:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
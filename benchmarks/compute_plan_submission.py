@@ -0,0 +1,68 @@
+"""Compare the submission time of a compute plan to the time spent in the network.
+
+The requests are sent to a fake server which answers after a fixed latency. The
+pure network time is the latency multiplied by the number of batches which must be
+sent one after the other, because of the dependencies between their tuples.
+
+Usage:
+    python benchmarks/compute_plan_submission.py --tuples 20000 --batch-size 100
+"""
+import argparse
+import sys
+import time
+
+from substra.sdk import compute_plan, models, schemas
+from substra.sdk.backends.remote import submission
+
+
+def _make_spec(n_tuples, n_chains):
+    traintuples = [
+        {
+            'algo_key': 'algo-key',
+            'data_manager_key': 'dataset-key',
+            'train_data_sample_keys': [f'data-sample-{i}'],
+            'traintuple_id': f'traintuple-{i}',
+            'in_models_ids': [f'traintuple-{i - n_chains}'] if i >= n_chains else None,
+        }
+        for i in range(n_tuples)
+    ]
+    return schemas.ComputePlanSpec(traintuples=traintuples)
+
+
+def _make_server(latency):
+    def receive(spec):
+        time.sleep(latency)
+        ids, _ = compute_plan.get_ids_and_dependencies(spec)
+        return models.ComputePlan.construct(key='key', id_to_key={i: i for i in ids})
+
+    def update(key, data):
+        return receive(schemas.UpdateComputePlanSpec(**data))
+
+    return receive, update
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tuples', type=int, default=20000)
+    parser.add_argument('--chains', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    spec = _make_spec(args.tuples, args.chains)
+    n_batches = sum(1 for _ in compute_plan.auto_batching(spec, batch_size=args.batch_size))
+    print(f'{n_batches} batches, network time if sent one by one: '
+          f'{n_batches * args.latency:.2f}s')
+
+    for max_in_flight in (1, 2, 4, 8):
+        create, update = _make_server(args.latency)
+        batches = compute_plan.auto_batching(spec, batch_size=args.batch_size)
+        submitter = submission.BatchSubmitter(create, update, max_in_flight=max_in_flight)
+        start = time.perf_counter()
+        submitter.submit(batches)
+        elapsed = time.perf_counter() - start
+        print(f'max_in_flight={max_in_flight}: {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
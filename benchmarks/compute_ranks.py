@@ -0,0 +1,43 @@
+"""Measure the time spent computing the ranks of compute plans of increasing size.
+
+Each tuple depends on the previous one and on a random earlier tuple, as in a compute
+plan mixing training chains and aggregations. The time per tuple should be constant.
+
+Usage:
+    python benchmarks/compute_ranks.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import random
+import sys
+import time
+
+from substra.sdk import graph
+
+
+def _make_graph(size, seed):
+    rng = random.Random(seed)
+    return {
+        f'tuple-{i}': [f'tuple-{i - 1}', f'tuple-{rng.randrange(i)}'] if i > 0 else []
+        for i in range(size)
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f'{"tuples":>10} {"time (s)":>10} {"us/tuple":>10}')
+    for size in args.sizes:
+        node_graph = _make_graph(size, args.seed)
+        start = time.perf_counter()
+        ranks = graph.compute_ranks(node_graph=node_graph)
+        elapsed = time.perf_counter() - start
+        assert len(ranks) == size
+        print(f'{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+"""Measure the time spent hashing a directory with and without the hash cache.
+
+A synthetic tree of small files is created in a temporary directory, then hashed
+serially, in parallel with an empty cache (cold) and again with the filled cache
+(warm). The digests of the three runs must be identical.
+
+Usage:
+    python benchmarks/hash_directory.py --files 10000 --file-size 65536
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from substra.sdk import fs
+
+
+def _make_tree(root, n_files, file_size, files_per_dir):
+    for i in range(n_files):
+        directory = os.path.join(root, f'dir_{i // files_per_dir}')
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f'file_{i}'), 'wb') as f:
+            f.write(os.urandom(file_size))
+
+
+def _measure(name, path, cache=None, **kwargs):
+    start = time.perf_counter()
+    digest = fs.hash_directory(path, cache=cache, **kwargs)
+    if cache is not None:
+        cache.save()
+    elapsed = time.perf_counter() - start
+    print(f'{name:>10} {elapsed:>10.3f}')
+    return digest
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--file-size', type=int, default=64 * 1024)
+    parser.add_argument('--files-per-dir', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=fs.DEFAULT_HASH_WORKERS)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tree = os.path.join(tmp_dir, 'tree')
+        _make_tree(tree, args.files, args.file_size, args.files_per_dir)
+        cache_path = os.path.join(tmp_dir, 'hashes.json')
+
+        print(f'{"run":>10} {"time (s)":>10}')
+        serial = _measure('serial', tree, max_workers=1)
+        cold = _measure('cold', tree, max_workers=args.workers,
+                        cache=fs.HashCache(cache_path))
+        warm = _measure('warm', tree, max_workers=args.workers,
+                        cache=fs.HashCache(cache_path))
+        assert serial == cold == warm
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
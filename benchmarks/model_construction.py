@@ -0,0 +1,142 @@
+"""Compare the validated and the fast construction of the models of the assets.
+
+The assets are built from synthetic responses of the platform, as `Client.list_*` does
+with `validate_responses` set to True (default) and to False.
+
+Usage:
+    python benchmarks/model_construction.py --assets 30000
+"""
+import argparse
+import sys
+import time
+
+from substra.sdk import models, schemas
+
+_CHECKSUM = '0' * 64
+_URL = 'http://testserver/asset/file/'
+
+
+def _file():
+    return {'checksum': _CHECKSUM, 'storage_address': _URL}
+
+
+def _permissions():
+    return {'process': {'public': False, 'authorized_ids': ['node-1', 'node-2']}}
+
+
+def _algo(i):
+    return {
+        'key': f'algo-{i}', 'name': 'algo', 'owner': 'node-1', 'permissions': _permissions(),
+        'metadata': {'foo': 'bar'}, 'description': _file(), 'content': _file(),
+    }
+
+
+def _tuple_algo(i):
+    return {'key': f'algo-{i}', 'checksum': _CHECKSUM, 'storage_address': _URL,
+            'name': 'algo'}
+
+
+def _in_models(i):
+    return [
+        {'key': f'model-{j}', 'checksum': _CHECKSUM, 'storage_address': _URL,
+         'traintuple_key': f'traintuple-{j}'}
+        for j in range(i, i + 2)
+    ]
+
+
+def _tuple(i):
+    return {
+        'key': f'tuple-{i}', 'creator': 'node-1', 'algo': _tuple_algo(i), 'tag': 'tag',
+        'compute_plan_key': 'compute-plan', 'rank': i, 'status': 'done', 'log': '',
+        'metadata': {'foo': 'bar'},
+    }
+
+
+def _tuple_dataset(i):
+    return {
+        'key': 'dataset', 'opener_checksum': _CHECKSUM, 'worker': 'node-1',
+        'data_sample_keys': [f'data-sample-{j}' for j in range(10)], 'metadata': {},
+    }
+
+
+_FACTORIES = {
+    schemas.Type.Dataset: lambda i: {
+        'key': f'dataset-{i}', 'name': 'dataset', 'owner': 'node-1', 'objective_key': None,
+        'permissions': _permissions(), 'type': 'csv', 'opener': _file(),
+        'description': _file(), 'metadata': {},
+        'train_data_sample_keys': [f'data-sample-{j}' for j in range(100)],
+        'test_data_sample_keys': [f'data-sample-{j}' for j in range(100, 120)],
+    },
+    schemas.Type.Objective: lambda i: {
+        'key': f'objective-{i}', 'name': 'objective', 'owner': 'node-1', 'metadata': {},
+        'permissions': _permissions(), 'description': _file(),
+        'metrics': dict(_file(), name='metrics'),
+        'test_dataset': {'data_manager_key': 'dataset', 'worker': 'node-1', 'metadata': {},
+                         'data_sample_keys': [f'data-sample-{j}' for j in range(20)]},
+    },
+    schemas.Type.Algo: _algo,
+    schemas.Type.Traintuple: lambda i: dict(
+        _tuple(i), dataset=_tuple_dataset(i), permissions=_permissions(),
+        in_models=_in_models(i), out_model=dict(_file(), key=f'model-{i}'),
+    ),
+    schemas.Type.Aggregatetuple: lambda i: dict(
+        _tuple(i), worker='node-1', permissions=_permissions(), in_models=_in_models(i),
+        out_model=dict(_file(), key=f'model-{i}'),
+    ),
+    schemas.Type.CompositeTraintuple: lambda i: dict(
+        _tuple(i), dataset=_tuple_dataset(i), in_head_model=_in_models(i)[0],
+        in_trunk_model=_in_models(i)[1],
+        out_head_model={'permissions': _permissions(),
+                        'out_model': {'key': f'head-{i}', 'checksum': _CHECKSUM}},
+        out_trunk_model={'permissions': _permissions(),
+                         'out_model': dict(_file(), key=f'trunk-{i}')},
+    ),
+    schemas.Type.Testtuple: lambda i: dict(
+        _tuple(i), traintuple_key=f'traintuple-{i}', certified=False,
+        traintuple_type='compositeTraintuple',
+        objective={'key': 'objective', 'metrics': dict(_file(), name='metrics')},
+        dataset={'key': 'dataset', 'opener_checksum': _CHECKSUM, 'worker': 'node-1',
+                 'data_sample_keys': [f'data-sample-{j}' for j in range(10)], 'perf': 0.5},
+    ),
+    schemas.Type.ComputePlan: lambda i: {
+        'key': f'compute-plan-{i}', 'status': 'done', 'tag': '', 'metadata': {},
+        'traintuple_keys': [f'traintuple-{j}' for j in range(100)],
+        'composite_traintuple_keys': None, 'aggregatetuple_keys': None,
+        'testtuple_keys': [f'testtuple-{j}' for j in range(10)],
+        'id_to_key': {f'id-{j}': f'traintuple-{j}' for j in range(100)},
+        'tuple_count': 110, 'done_count': 110,
+    },
+}
+
+
+def _measure(build, items):
+    start = time.perf_counter()
+    for item in items:
+        build(item)
+    return time.perf_counter() - start
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--assets', type=int, default=30000)
+    args = parser.parse_args(argv)
+
+    print(f'{"asset":>22} {"validated (s)":>14} {"fast (s)":>10} {"lazy (s)":>10} '
+          f'{"speedup":>8}')
+    for asset_type, factory in _FACTORIES.items():
+        model = models.SCHEMA_TO_MODEL[asset_type]
+        items = [factory(i) for i in range(args.assets)]
+        # both paths build the same models
+        assert models.construct(model, items[0]) == model(**items[0])
+        assert models.build_lazy(model, items[0]) == model(**items[0])
+
+        validated = _measure(lambda item: model(**item), items)
+        fast = _measure(lambda item: models.construct(model, item), items)
+        # the large fields of the lazy models are validated on first access only
+        lazy = _measure(lambda item: models.build_lazy(model, item), items)
+        print(f'{asset_type.value:>22} {validated:>14.3f} {fast:>10.3f} {lazy:>10.3f} '
+              f'{validated / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,77 @@
+"""Count the connections opened by the REST client against a local stub server.
+
+Usage:
+    python benchmarks/rest_client_connections.py --requests 1000
+"""
+import argparse
+import http.server
+import json
+import sys
+import threading
+import time
+
+from substra.sdk.backends.remote import rest_client
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 is required for the server to honour keep-alive
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _StubHandler.lock:
+            _StubHandler.connections += 1
+
+    def do_GET(self):
+        body = json.dumps({'key': self.path.strip('/').split('/')[-1]}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _StubServer(http.server.ThreadingHTTPServer):
+    request_queue_size = 128
+
+
+def _run(url, n_requests, keep_alive):
+    _StubHandler.connections = 0
+    client = rest_client.Client(url, insecure=False, token=None, keep_alive=keep_alive)
+    start = time.time()
+    for i in range(n_requests):
+        client.get('traintuple', f'key-{i}')
+    elapsed = time.time() - start
+    client.close()
+    return _StubHandler.connections, elapsed
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    server = _StubServer(('127.0.0.1', 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    try:
+        for keep_alive in (False, True):
+            connections, elapsed = _run(url, args.requests, keep_alive)
+            print(f'keep_alive={keep_alive}: {connections} connections for '
+                  f'{args.requests} requests in {elapsed:.2f}s')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+"""Measure the throughput of the zip archives of folders mixing images and text files.
+
+The images are random bytes with a .png extension, as the content of compressed images,
+and the text files are compressible CSV lines. The archive is written with a single
+worker and deflating every file, as before the zip builder, then with the zip builder.
+
+Usage:
+    python benchmarks/zip_folder.py --images 200 --texts 200 --file-size 262144
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+from substra.sdk import archive
+
+
+def _make_folder(root, n_images, n_texts, file_size, seed):
+    rng = random.Random(seed)
+    os.makedirs(root)
+    for i in range(n_images):
+        with open(os.path.join(root, f'image_{i}.png'), 'wb') as f:
+            f.write(os.urandom(file_size))
+    for i in range(n_texts):
+        lines = []
+        size = 0
+        while size < file_size:
+            line = ','.join(str(rng.random()) for _ in range(8)) + '\n'
+            lines.append(line)
+            size += len(line)
+        with open(os.path.join(root, f'text_{i}.csv'), 'w') as f:
+            f.write(''.join(lines))
+
+
+def _zip_deflate_all(fp, path):
+    with zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for root, _, files in os.walk(path):
+            for f in files:
+                abspath = os.path.join(root, f)
+                zipf.write(abspath, arcname=os.path.relpath(abspath, start=path))
+
+
+def _measure(name, write, total_size):
+    fp = io.BytesIO()
+    start = time.perf_counter()
+    write(fp)
+    elapsed = time.perf_counter() - start
+    throughput = total_size / elapsed / 1024 / 1024
+    size = fp.getbuffer().nbytes / 1024 / 1024
+    print(f'{name:>24} {elapsed:>10.3f} {throughput:>10.1f} {size:>10.1f}')
+
+
+def main(argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=int, default=200)
+    parser.add_argument('--texts', type=int, default=200)
+    parser.add_argument('--file-size', type=int, default=256 * 1024)
+    parser.add_argument('--workers', type=int, default=archive.DEFAULT_MAX_WORKERS)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        folder = os.path.join(tmp_dir, 'folder')
+        _make_folder(folder, args.images, args.texts, args.file_size, args.seed)
+        total_size = sum(
+            os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder)
+        )
+
+        print(f'{"archive":>24} {"time (s)":>10} {"MiB/s":>10} {"size (MiB)":>10}')
+        _measure('deflate all, 1 worker', lambda fp: _zip_deflate_all(fp, folder), total_size)
+        _measure('zip builder, 1 worker',
+                 lambda fp: archive.write_zip(fp, folder, max_workers=1), total_size)
+        _measure(f'zip builder, {args.workers} workers',
+                 lambda fp: archive.write_zip(fp, folder, max_workers=args.workers),
+                 total_size)
+        _measure('zip builder, level 1',
+                 lambda fp: archive.write_zip(
+                     fp, folder, compresslevel=1, max_workers=args.workers),
+                 total_size)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -4,12 +4,13 @@ import inspect
 from pathlib import Path
 import sys
 
-from substra import Client
+from substra import Client, AsyncClient
 from substra.sdk.utils import retry_on_exception
 
 
 MODULE_LIST = [
     Client,
+    AsyncClient,
     retry_on_exception
 ]
 
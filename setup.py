@@ -53,7 +53,10 @@ setup(
     install_requires=['click', 'requests', 'docker', 'consolemd', 'pyyaml', 'pydantic>=1.5.1'],
     python_requires='>=3.6',
     setup_requires=['pytest-runner'],
-    tests_require=['pytest', 'pytest-cov', 'pytest-mock'],
+    extras_require={
+        'async': ['aiohttp>=3.6'],
+    },
+    tests_require=['pytest', 'pytest-cov', 'pytest-mock', 'aiohttp'],
     entry_points={
         'console_scripts': [
             'substra=substra.cli.interface:cli',
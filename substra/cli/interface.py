@@ -16,14 +16,18 @@ import json
 import functools
 import os
 import logging
+import sys
 
 import click
 import consolemd
+import docker
 
 from substra import __version__
 from substra.cli import printers
-from substra.sdk import assets, exceptions, utils
+from substra.sdk import artifact_cache, assets, bulk, exceptions, utils
+from substra.sdk import sync as synchronization
 from substra.sdk import config as configuration
+from substra.sdk.backends.local.compute import spawner
 from substra.sdk.client import Client, DEFAULT_BATCH_SIZE
 
 DEFAULT_RETRY_TIMEOUT = 300
@@ -253,6 +257,14 @@ def _format_server_errors(fn, errors):
         {pluralized_error}:\n- " + '\n- '.join(lines)
 
 
+def _get_journal(journal):
+    if not journal:
+        raise click.BadOptionUsage('--resume', "The --resume option requires a --journal.")
+    if not os.path.exists(journal):
+        raise click.BadParameter(f"File '{journal}' does not exist.", param_hint='--journal')
+    return journal
+
+
 def error_printer(fn):
     """Command decorator to pretty print a few selected exceptions from sdk."""
     @functools.wraps(fn)
@@ -276,6 +288,9 @@ def error_printer(fn):
         except exceptions.RequestException as e:
             raise click.ClickException(f"Request failed: {e.__class__.__name__}: {e}")
         except (exceptions.ConnectionError,
+                exceptions.ComputePlanSubmissionError,
+                exceptions.InvalidJournal,
+                exceptions.InvalidManifest,
                 exceptions.InvalidResponse,
                 exceptions.LoadDataException,
                 exceptions.BadConfiguration) as e:
@@ -348,30 +363,61 @@ def add(ctx):
               help='Add multiple data samples at once.')
 @click.option('--test-only', is_flag=True, default=False,
               help='Data sample(s) used as test data only.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=bulk.DEFAULT_CHUNK_SIZE,
+              show_default=True,
+              help='Number of data samples sent in a single request (with --multiple).')
+@click.option('--max-workers', type=click.IntRange(min=1), default=bulk.DEFAULT_MAX_WORKERS,
+              show_default=True,
+              help='Number of requests sent at the same time (with --multiple).')
 @click_global_conf
 @click_global_conf_retry_timeout
 @click.pass_context
 @error_printer
-def add_data_sample(ctx, path, dataset_key, local, multiple, test_only):
+def add_data_sample(ctx, path, dataset_key, local, multiple, test_only, chunk_size,
+                    max_workers):
     """Add data sample(s).
 
 
     The path is either a directory representing a data sample or a parent
     directory containing data samples directories (if --multiple option is
     set).
+
+    With the --multiple option, the data samples are sent by chunks and the
+    paths which could not be added are reported at the end.
     """
     client = get_client(ctx.obj)
     if multiple and local:
-        subdirs = next(os.walk(path))[1]
+        subdirs = sorted(next(os.walk(path))[1])
         paths = [os.path.join(path, s) for s in subdirs]
         if not paths:
             raise click.UsageError(f'No data sample directory in {path}')
 
-    else:
-        paths = [path]
+        data = {
+            'paths': paths,
+            'data_manager_keys': [dataset_key],
+        }
+        if test_only:
+            data['test_only'] = True
+        with click.progressbar(length=len(paths), label='Adding data samples',
+                               file=sys.stderr) as bar:
+            report = client.add_data_samples_in_bulk(
+                data,
+                local=local,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                progress=bar.update,
+            )
+        display(report.keys)
+        for result in report.failed:
+            click.echo(f'{result.path}: {result.error}', err=True)
+        if report.failed:
+            raise click.ClickException(
+                f'{len(report.failed)} of {len(paths)} data samples could not be added'
+            )
+        return
 
     data = {
-        'paths': paths,
+        'paths': [path],
         'data_manager_keys': [dataset_key],
         'multiple': multiple,
     }
@@ -539,10 +585,14 @@ def add_algo(ctx, data):
 @click.option('--batch-size', '-b', type=int,
               help='Batch size for the auto batching',
               default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--journal', type=click.Path(dir_okay=False),
+              help='File where the submitted batches are recorded, to resume the submission')
+@click.option('--resume', is_flag=True, default=False,
+              help='Resume the submission recorded in the journal')
 @click_global_conf_with_output_format
 @click.pass_context
 @error_printer
-def add_compute_plan(ctx, data, no_auto_batching, batch_size):
+def add_compute_plan(ctx, data, no_auto_batching, batch_size, journal, resume):
     """Add compute plan.
 
     The path must point to a valid JSON file with the following schema:
@@ -596,13 +646,20 @@ def add_compute_plan(ctx, data, no_auto_batching, batch_size):
     compute plan at once.
     If the auto batching is enabled, change the `batch_size` to define the number of
     tuples uploaded in each batch (default 20).
+
+    If a journal is given, the submitted batches are recorded in it. If the submission
+    fails, run the same command with the --resume option to submit the remaining batches.
     """
     if no_auto_batching and batch_size:
         raise click.BadOptionUsage('--batch_size',
                                    "The --batch_size option cannot be used when using "
                                    "--no_auto_batching.")
     client = get_client(ctx.obj)
-    res = client.add_compute_plan(data, auto_batching=not no_auto_batching, batch_size=batch_size)
+    if resume:
+        res = client.resume_compute_plan(data, _get_journal(journal))
+    else:
+        res = client.add_compute_plan(data, auto_batching=not no_auto_batching,
+                                      batch_size=batch_size, journal=journal)
     printer = printers.get_asset_printer(assets.COMPUTE_PLAN, ctx.obj.output_format)
     printer.print(res, is_list=False)
 
@@ -988,9 +1045,10 @@ def list_(ctx, asset_name, filters, filters_logical_clause, advanced_filters):
                 filters.insert(i + 1, 'OR')
     elif advanced_filters:
         filters = advanced_filters
-    res = method(filters)
+    # the assets are printed as soon as they are received
+    res = method(filters, stream=True)
     printer = printers.get_asset_printer(asset_name, ctx.obj.output_format)
-    dict_res = [result.dict(exclude_none=False, by_alias=True) for result in res]
+    dict_res = (result.dict(exclude_none=False, by_alias=True) for result in res)
     printer.print(dict_res, is_list=True)
 
 
@@ -1034,6 +1092,55 @@ def node_info(ctx):
     printer.print(res)
 
 
+def click_option_cache_dir(f):
+    """Add cache dir option to command."""
+    return click.option(
+        '--cache-dir',
+        type=click.Path(),
+        envvar='SUBSTRA_CACHE_DIR',
+        default=artifact_cache.DEFAULT_PATH,
+        help=f'Cache directory (default {artifact_cache.DEFAULT_PATH}).')(f)
+
+
+@cli.group()
+@click.pass_context
+def cache(ctx):
+    """Manage the cache of the asset files downloaded in debug mode."""
+
+
+@cache.command('ls')
+@click_option_cache_dir
+def cache_ls(cache_dir):
+    """List the cached files, from the least to the most recently used."""
+    store = artifact_cache.ArtifactCache(cache_dir)
+    printer = printers.CachePrinter()
+    printer.print(store.entries())
+
+
+@cache.command('prune')
+@click_option_cache_dir
+@click.option('--max-size', type=click.INT, envvar='SUBSTRA_CACHE_MAX_SIZE',
+              default=artifact_cache.DEFAULT_MAX_SIZE,
+              help='Maximum size of the cache in bytes, the least recently used files are '
+                   f'removed until the cache fits (default {artifact_cache.DEFAULT_MAX_SIZE}).')
+@click.option('--all', 'all_', is_flag=True,
+              help='Remove all the cached files.')
+@click.option('--images', is_flag=True,
+              help='Also remove the docker images built from the algos and metrics.')
+def cache_prune(cache_dir, max_size, all_, images):
+    """Remove files from the cache."""
+    store = artifact_cache.ArtifactCache(cache_dir)
+    removed = store.prune(0 if all_ else max_size)
+    size = sum(entry.size for entry in removed)
+    print(f'Removed {len(removed)} files ({size} bytes).')
+    if images:
+        try:
+            removed_images = spawner.prune_images()
+        except docker.errors.DockerException as e:
+            raise click.ClickException(f'Could not remove the docker images: {e}')
+        print(f'Removed {len(removed_images)} images.')
+
+
 @cli.command()
 @click.argument('asset-name', type=click.Choice([
     assets.ALGO,
@@ -1189,10 +1296,15 @@ def update_dataset(ctx, dataset_key, objective_key):
 @click.option('--batch-size', '-b', type=int,
               help='Batch size for the auto batching',
               default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option('--journal', type=click.Path(dir_okay=False),
+              help='File where the submitted batches are recorded, to resume the submission')
+@click.option('--resume', is_flag=True, default=False,
+              help='Resume the submission recorded in the journal')
 @click_global_conf_with_output_format
 @click.pass_context
 @error_printer
-def update_compute_plan(ctx, compute_plan_key, tuples, no_auto_batching, batch_size):
+def update_compute_plan(ctx, compute_plan_key, tuples, no_auto_batching, batch_size, journal,
+                        resume):
     """Update compute plan.
 
     The tuples path must point to a valid JSON file with the following schema:
@@ -1243,16 +1355,77 @@ def update_compute_plan(ctx, compute_plan_key, tuples, no_auto_batching, batch_s
     compute plan at once.
     If the auto batching is enabled, change the `batch_size` to define the number of
     tuples uploaded in each batch (default 20).
+
+    If a journal is given, the submitted batches are recorded in it. If the submission
+    fails, run the same command with the --resume option to submit the remaining batches.
     """
     if no_auto_batching and batch_size:
         raise click.BadOptionUsage('--batch_size',
                                    "The --batch_size option cannot be used when using "
                                    "--no_auto_batching.")
     client = get_client(ctx.obj)
-    res = client.update_compute_plan(compute_plan_key, tuples, not no_auto_batching, batch_size)
+    if resume:
+        res = client.resume_compute_plan(tuples, _get_journal(journal))
+    else:
+        res = client.update_compute_plan(compute_plan_key, tuples, not no_auto_batching,
+                                         batch_size, journal=journal)
     printer = printers.get_asset_printer(assets.COMPUTE_PLAN, ctx.obj.output_format)
     printer.print(res, is_list=False)
 
 
+@cli.group()
+@click.pass_context
+def sync(ctx):
+    """Register the assets which are not registered yet."""
+    pass
+
+
+@sync.command('data_sample')
+@click.argument('path', type=click.Path(exists=True, file_okay=False))
+@click.option('--dataset-key', required=True)
+@click.option('--test-only', is_flag=True, default=False,
+              help='Data samples used as test data only.')
+@click.option('--manifest', type=click.Path(dir_okay=False),
+              help='Manifest of the registered data samples (default: '
+                   f'{synchronization.MANIFEST_NAME} in PATH).')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=bulk.DEFAULT_CHUNK_SIZE,
+              show_default=True,
+              help='Number of data samples sent in a single request.')
+@click.option('--max-workers', type=click.IntRange(min=1), default=bulk.DEFAULT_MAX_WORKERS,
+              show_default=True,
+              help='Number of requests sent at the same time.')
+@click_global_conf
+@click_global_conf_retry_timeout
+@click.pass_context
+@error_printer
+def sync_data_sample(ctx, path, dataset_key, test_only, manifest, chunk_size, max_workers):
+    """Add the new or changed data samples of a directory.
+
+    Each sub-directory of the path is a data sample. The data samples registered
+    are recorded in a manifest: the folders already registered are not sent
+    again, they are only linked to the dataset if needed.
+    """
+    client = get_client(ctx.obj)
+    n_folders = len(synchronization.list_folders(path))
+    with click.progressbar(length=n_folders, label='Adding data samples',
+                           file=sys.stderr) as bar:
+        report = client.sync_data_samples(
+            dataset_key,
+            path,
+            test_only=test_only,
+            manifest_path=manifest,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            progress=bar.update,
+        )
+    display(report.keys)
+    for result in report.failed:
+        click.echo(f'{result.path}: {result.error}', err=True)
+    if report.failed:
+        raise click.ClickException(
+            f'{len(report.failed)} of {len(report.results)} data samples could not be added'
+        )
+
+
 if __name__ == '__main__':
     cli()
@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import itertools
 import json
 import math
+import types
 import pydantic
 
 import yaml
@@ -31,6 +34,10 @@ def find_dict_composite_key_value(asset_dict, composite_key):
     return _recursive_find(asset_dict, composite_key.split('.'))
 
 
+# number of rows used to compute the width of the table columns
+TABLE_BUFFER_SIZE = 100
+
+
 class Field:
     def __init__(self, name, ref):
         self.name = name
@@ -164,14 +171,23 @@ class BasePrinter:
         return column_widths
 
     def print_table(self, items, fields):
-        columns = self._get_columns(items, fields)
+        # the column widths are computed from the first items, the next ones are printed
+        # as soon as they are received
+        items = iter(items)
+        first_items = list(itertools.islice(items, TABLE_BUFFER_SIZE))
+        columns = self._get_columns(first_items, fields)
         column_widths = self._get_column_widths(columns)
 
-        for row_index in range(len(items) + 1):
+        for row_index in range(len(first_items) + 1):
             for col_index, column in enumerate(columns):
                 print(column[row_index].ljust(column_widths[col_index]), end='')
             print()
 
+        for item in items:
+            for field, width in zip(fields, column_widths):
+                print(str(field.get_value(item)).ljust(width), end='')
+            print()
+
     @staticmethod
     def _get_field_name_length(fields):
         max_length = max([len(field.name) for field in fields])
@@ -238,12 +254,16 @@ class AssetPrinter(BasePrinter):
 class JsonPrinter:
     @staticmethod
     def print(data, *args, **kwargs):
+        if isinstance(data, types.GeneratorType):
+            data = list(data)
         print(json.dumps(data, indent=2))
 
 
 class YamlPrinter:
     @staticmethod
     def print(data, *args, **kwargs):
+        if isinstance(data, types.GeneratorType):
+            data = list(data)
         print(yaml.dump(data, default_flow_style=False))
 
 
@@ -261,6 +281,23 @@ class BaseAlgoPrinter(AssetPrinter):
     download_message = 'Download this algorithm\'s code:'
 
 
+class CachePrinter(BasePrinter):
+    list_fields = (
+        Field('Checksum', 'checksum'),
+        Field('Size (bytes)', 'size'),
+        Field('Last used', 'last_used'),
+    )
+
+    def print(self, entries):
+        items = [{
+            'checksum': entry.checksum,
+            'size': entry.size,
+            'last_used': datetime.datetime.fromtimestamp(entry.last_used).strftime(
+                '%Y-%m-%d %H:%M:%S'),
+        } for entry in entries]
+        self.print_table(items, self.list_fields)
+
+
 class NodeInfoPrinter(BasePrinter):
     single_fields = (
         Field('HOST', 'host'),
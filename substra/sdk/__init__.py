@@ -13,11 +13,13 @@
 # limitations under the License.
 
 from substra.sdk.client import Client
+from substra.sdk.async_client import AsyncClient
 from substra.sdk.utils import retry_on_exception
 from substra.sdk.backends.local.backend import DEBUG_OWNER
 
 __all__ = [
     'Client',
+    'AsyncClient',
     'retry_on_exception',
     'DEBUG_OWNER',
 ]
@@ -0,0 +1,159 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Zip archives of the folders sent to the platform.
+
+The files are compressed in parallel by a thread pool, zlib releases the GIL, and
+written in the archive in the order of the walk. The already compressed files, such as
+images or numpy archives, are stored without compression as deflate would not reduce
+their size.
+
+Writing a file compressed beforehand relies on the private state of `zipfile.ZipFile`,
+if it is not available the files are compressed sequentially by `ZipFile.write`.
+"""
+import collections
+import concurrent.futures
+import inspect
+import os
+import typing
+import zipfile
+import zlib
+
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# extensions of the files whose content is already compressed
+STORED_EXTENSIONS = frozenset([
+    '.7z', '.avi', '.bz2', '.gif', '.gz', '.h5', '.jpeg', '.jpg', '.mkv', '.mov', '.mp3',
+    '.mp4', '.npz', '.png', '.tgz', '.webp', '.xz', '.zip', '.zst',
+])
+
+# larger files are compressed while they are written in the archive, not in memory
+_MAX_PARALLEL_SIZE = 32 * 1024 * 1024
+# maximum size of the compressed files waiting to be written in the archive
+_MAX_PENDING_SIZE = 256 * 1024 * 1024
+
+# private state of ZipFile used by `_write_member`
+_ZIPFILE_STATE = ('fp', 'start_dir', 'filelist', 'NameToInfo', '_didModify', '_writecheck')
+# the compression level can only be given to ZipFile.write from python 3.7
+_HAS_COMPRESSLEVEL = 'compresslevel' in inspect.signature(zipfile.ZipFile.write).parameters
+
+
+class _Member(typing.NamedTuple):
+    """Content of a file compressed before being written in the archive."""
+    data: bytes
+    crc: int
+    compress_type: int
+
+
+def is_compressed(path):
+    return os.path.splitext(path)[1].lower() in STORED_EXTENSIONS
+
+
+def _compress(path, compresslevel):
+    with open(path, 'rb') as f:
+        content = f.read()
+    crc = zlib.crc32(content)
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -15)
+    data = compressor.compress(content) + compressor.flush()
+    if len(data) >= len(content):
+        # the content is not compressible
+        return _Member(content, crc, zipfile.ZIP_STORED)
+    return _Member(data, crc, zipfile.ZIP_DEFLATED)
+
+
+def _can_write_member(zipf):
+    return all(hasattr(zipf, attr) for attr in _ZIPFILE_STATE) and \
+        not getattr(zipf, '_writing', False)
+
+
+def _write_file(zipf, abspath, archive_path, compress_type, compresslevel):
+    kwargs = dict()
+    if compress_type == zipfile.ZIP_DEFLATED and _HAS_COMPRESSLEVEL:
+        kwargs['compresslevel'] = compresslevel
+    zipf.write(abspath, arcname=archive_path, compress_type=compress_type, **kwargs)
+
+
+def _write_member(zipf, zinfo, member, file_size):
+    """Write a file already compressed in the archive.
+
+    This mirrors `ZipFile._open_to_write`, which would compress the content again.
+    """
+    zinfo.compress_type = member.compress_type
+    zinfo.file_size = file_size
+    zinfo.compress_size = len(member.data)
+    zinfo.CRC = member.crc
+    zinfo.flag_bits = 0x00
+
+    zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+    zipf.fp.write(zinfo.FileHeader(False))
+    zipf.fp.write(member.data)
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_zip(fp, path, compresslevel=None, max_workers=DEFAULT_MAX_WORKERS):
+    """Write a zip archive of the files of a folder.
+
+    Args:
+        fp: seekable file object the archive is written to
+        path (str): path of the folder
+        compresslevel (int, optional): deflate compression level, from 0 to 9.
+            Defaults to the zlib default level.
+        max_workers (int): maximum number of files compressed at the same time
+    """
+    if compresslevel is None:
+        compresslevel = zlib.Z_DEFAULT_COMPRESSION
+
+    with zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED) as zipf, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as e:
+        parallel = _can_write_member(zipf)
+        # files compressed in memory, written in the archive in the order of the walk
+        pending = collections.deque()
+        pending_size = 0
+
+        def write_pending():
+            nonlocal pending_size
+            zinfo, future, file_size = pending.popleft()
+            pending_size -= file_size
+            _write_member(zipf, zinfo, future.result(), file_size)
+
+        for root, _, files in os.walk(path):
+            for f in files:
+                abspath = os.path.join(root, f)
+                archive_path = os.path.relpath(abspath, start=path)
+
+                if is_compressed(abspath):
+                    while pending:
+                        write_pending()
+                    _write_file(zipf, abspath, archive_path, zipfile.ZIP_STORED, compresslevel)
+                    continue
+
+                zinfo = zipfile.ZipInfo.from_file(abspath, arcname=archive_path)
+                if zinfo.file_size > _MAX_PARALLEL_SIZE or not parallel:
+                    while pending:
+                        write_pending()
+                    _write_file(zipf, abspath, archive_path, zipfile.ZIP_DEFLATED, compresslevel)
+                    continue
+
+                while pending and pending_size + zinfo.file_size > _MAX_PENDING_SIZE:
+                    write_pending()
+                future = e.submit(_compress, abspath, compresslevel)
+                pending.append((zinfo, future, zinfo.file_size))
+                pending_size += zinfo.file_size
+
+        while pending:
+            write_pending()
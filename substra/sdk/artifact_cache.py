@@ -0,0 +1,171 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import logging
+import os
+import pathlib
+import shutil
+import stat
+import tempfile
+import threading
+import typing
+
+from substra.sdk import exceptions, fs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = '~/.substra-cache'
+DEFAULT_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
+_OBJECTS_DIR = 'objects'
+_TMP_DIR = 'tmp'
+
+
+class Entry(typing.NamedTuple):
+    checksum: str
+    size: int
+    last_used: float
+    path: pathlib.Path
+
+
+def get_default_directory():
+    return pathlib.Path(os.getenv('SUBSTRA_CACHE_DIR') or DEFAULT_PATH).expanduser()
+
+
+def get_default_max_size():
+    return int(os.getenv('SUBSTRA_CACHE_MAX_SIZE') or DEFAULT_MAX_SIZE)
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # different file systems or no hardlink support
+        shutil.copyfile(src, dst)
+
+
+class ArtifactCache:
+    """Persistent store of the downloaded asset files, addressed by their checksum.
+
+    The files are shared across sessions so that the same algo, opener or metrics is
+    downloaded once. They are hardlinked into the working directories, and are read-only
+    so that they cannot be modified through a link.
+
+    When the size of the cache exceeds max_size (in bytes), the least recently used
+    files are removed.
+    """
+
+    def __init__(self, directory=None, max_size=None):
+        self._directory = pathlib.Path(directory or get_default_directory()).expanduser()
+        self._max_size = max_size if max_size is not None else get_default_max_size()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def _path(self, checksum):
+        return self._directory / _OBJECTS_DIR / checksum[:2] / checksum
+
+    def get(self, checksum) -> typing.Optional[pathlib.Path]:
+        """Returns the path of the cached file, None if it is not in the cache."""
+        path = self._path(checksum)
+        try:
+            # mark the file as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def add(self, checksum, path) -> pathlib.Path:
+        """Move a file to the cache after checking its checksum."""
+        actual_checksum = fs.hash_file(path)
+        if actual_checksum != checksum:
+            raise exceptions.InvalidChecksum(
+                f"Invalid checksum for {path}: expected {checksum}, got {actual_checksum}"
+            )
+
+        cache_path = self._path(checksum)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        os.chmod(path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.replace(path, cache_path)
+        self.prune(self._max_size, keep=checksum)
+        return cache_path
+
+    def fetch(self, checksum, destination, download):
+        """Get a file from the cache or download it.
+
+        Args:
+            checksum (str): checksum of the file
+            destination (pathlib.Path): path where the file is linked
+            download (callable): downloads the file to the path given as argument
+
+        Returns:
+            bool: True if the file was in the cache
+        """
+        cache_path = self.get(checksum)
+        hit = cache_path is not None
+        if hit:
+            logger.debug(f'Artifact cache hit: {checksum}')
+        else:
+            tmp_dir = self._directory / _TMP_DIR
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+            os.close(fd)
+            try:
+                download(tmp_path)
+                cache_path = self.add(checksum, tmp_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        _link_or_copy(cache_path, destination)
+        return hit
+
+    def entries(self) -> typing.List[Entry]:
+        """List the cached files, from the least to the most recently used."""
+        entries = []
+        for path in (self._directory / _OBJECTS_DIR).glob('*/*'):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append(Entry(path.name, st.st_size, st.st_mtime, path))
+        return sorted(entries, key=lambda entry: entry.last_used)
+
+    def size(self):
+        """Size of the cache in bytes."""
+        return sum(entry.size for entry in self.entries())
+
+    def prune(self, max_size=0, keep=None) -> typing.List[Entry]:
+        """Remove the least recently used files until the cache fits in max_size.
+
+        Returns the removed entries.
+        """
+        with self._lock:
+            entries = self.entries()
+            size = sum(entry.size for entry in entries)
+            removed = []
+            for entry in entries:
+                if size <= max_size:
+                    break
+                if entry.checksum == keep:
+                    continue
+                try:
+                    entry.path.unlink()
+                except FileNotFoundError:
+                    pass
+                size -= entry.size
+                removed.append(entry)
+                logger.debug(f'Artifact cache: removed {entry.checksum}')
+        return removed
@@ -0,0 +1,504 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import logging
+import os
+import time
+from typing import Union, Optional, List
+
+from substra.sdk import schemas, models
+from substra.sdk.backends.remote import async_backend, async_rest_client
+from substra.sdk.client import Client, DEFAULT_BATCH_SIZE, DEFAULT_RETRY_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = async_rest_client.DEFAULT_MAX_CONCURRENCY
+
+
+def logit(f):
+    """Decorator used to log all high-level coroutines of the async Substra client."""
+
+    @functools.wraps(f)
+    async def wrapper(*args, **kwargs):
+        logger.debug(f'{f.__name__}: call')
+        ts = time.time()
+        error = None
+        try:
+            return await f(*args, **kwargs)
+        except Exception as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            te = time.time()
+            elapsed = (te - ts) * 1000
+            logger.info(f'{f.__name__}: done in {elapsed:.2f}ms; error={error}')
+
+    return wrapper
+
+
+class AsyncClient(object):
+    """Create an asynchronous client
+
+    The async client exposes the same methods as the `Client` for a remote Substra
+    platform, all of them are coroutines. It is well suited to watch or update many
+    assets from a single event loop.
+
+    Example:
+        ```python
+        async with AsyncClient(url=url, token=token) as client:
+            traintuples = await asyncio.gather(
+                *[client.get_traintuple(key) for key in keys]
+            )
+        ```
+
+    Args:
+        url (str): URL of the Substra platform.
+        token (str, optional): Token to authenticate to the Substra platform.
+            If no token is given, use the 'login' function to authenticate.
+            Defaults to None.
+        retry_timeout (int, optional): Number of seconds before attempting a retry call in case
+            of timeout.
+            Defaults to 5 minutes.
+        insecure (bool, optional): If True, the client can call a not-certified backend. This is
+            for development purposes.
+            Defaults to False.
+        max_concurrency (int, optional): Maximum number of requests sent at the same time,
+            the other requests wait for one of them to complete.
+            Defaults to 100.
+        validate_responses (bool, optional): If False, the assets returned by the Substra
+            platform are built without being validated, please refer to `Client`.
+            Defaults to True.
+        lazy_models (bool, optional): If True, the large fields of the assets returned by the
+            Substra platform are built on first access, please refer to `Client`.
+            Defaults to False.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: Optional[str] = None,
+        retry_timeout: int = DEFAULT_RETRY_TIMEOUT,
+        insecure: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        validate_responses: bool = True,
+        lazy_models: bool = False,
+    ):
+        self._token = token
+        self._backend = async_backend.AsyncRemote(
+            url=url,
+            insecure=insecure,
+            token=token,
+            retry_timeout=retry_timeout,
+            max_concurrency=max_concurrency,
+            validate_responses=validate_responses,
+            lazy_models=lazy_models,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connections to the Substra platform."""
+        await self._backend.close()
+
+    @logit
+    async def login(self, username, password):
+        """Login to a remote server. """
+        self._token = await self._backend.login(username, password)
+        return self._token
+
+    @logit
+    async def add_data_sample(
+        self,
+        data: Union[dict, schemas.DataSampleSpec],
+        local: bool = True
+    ) -> str:
+        """Create a new data sample asset and return its key, see `Client.add_data_sample`."""
+        spec = Client._get_spec(schemas.DataSampleSpec, data)
+        if spec.paths:
+            raise ValueError("data: invalid 'paths' field")
+        if not spec.path:
+            raise ValueError("data: missing 'path' field")
+        return await self._backend.add(spec, spec_options={"local": local})
+
+    @logit
+    async def add_data_samples(
+        self,
+        data: Union[dict, schemas.DataSampleSpec],
+        local: bool = True,
+    ) -> List[str]:
+        """Create many data sample assets and return a list of keys,
+        see `Client.add_data_samples`."""
+        spec = Client._get_spec(schemas.DataSampleSpec, data)
+        if spec.path:
+            raise ValueError("data: invalid 'path' field")
+        if not spec.paths:
+            raise ValueError("data: missing 'paths' field")
+        return await self._backend.add(spec, spec_options={"local": local})
+
+    @logit
+    async def add_dataset(self, data: Union[dict, schemas.DatasetSpec]) -> str:
+        """Create new dataset asset and return its key."""
+        spec = Client._get_spec(schemas.DatasetSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_objective(self, data: Union[dict, schemas.ObjectiveSpec]) -> str:
+        """Create new objective asset and return its key."""
+        spec = Client._get_spec(schemas.ObjectiveSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_algo(self, data: Union[dict, schemas.AlgoSpec]) -> str:
+        """Create new algo asset and return its key."""
+        spec = Client._get_spec(schemas.AlgoSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_aggregate_algo(self, data: Union[dict, schemas.AggregateAlgoSpec]) -> str:
+        """Create new aggregate algo asset and return its key."""
+        spec = Client._get_spec(schemas.AggregateAlgoSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_composite_algo(self, data: Union[dict, schemas.CompositeAlgoSpec]) -> str:
+        """Create new composite algo asset and return its key."""
+        spec = Client._get_spec(schemas.CompositeAlgoSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_traintuple(self, data: Union[dict, schemas.TraintupleSpec]) -> str:
+        """Create new traintuple asset and return its key."""
+        spec = Client._get_spec(schemas.TraintupleSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_aggregatetuple(self, data: Union[dict, schemas.AggregatetupleSpec]) -> str:
+        """Create new aggregatetuple asset and return its key."""
+        spec = Client._get_spec(schemas.AggregatetupleSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_composite_traintuple(
+        self,
+        data: Union[dict, schemas.CompositeTraintupleSpec]
+    ) -> str:
+        """Create new composite traintuple asset and return its key."""
+        spec = Client._get_spec(schemas.CompositeTraintupleSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_testtuple(self, data: Union[dict, schemas.TesttupleSpec]) -> str:
+        """Create new testtuple asset and return its key."""
+        spec = Client._get_spec(schemas.TesttupleSpec, data)
+        return await self._backend.add(spec)
+
+    @logit
+    async def add_compute_plan(
+        self,
+        data: Union[dict, schemas.ComputePlanSpec],
+        auto_batching: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: Optional[int] = None,
+        batch_by_rank: bool = False,
+    ) -> models.ComputePlan:
+        """Create new compute plan asset, see `Client.add_compute_plan`.
+
+        The submission cannot be recorded in a journal to be resumed, use `Client`
+        for this.
+        """
+        spec = Client._get_spec(schemas.ComputePlanSpec, data)
+        spec_options = {
+            "auto_batching": auto_batching,
+            "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+            "batch_by_rank": batch_by_rank,
+        }
+        return await self._backend.add(spec, spec_options=spec_options)
+
+    @logit
+    async def get_algo(self, key: str) -> models.Algo:
+        """Get algo by key, the returned object is described
+        in the [models.Algo](sdk_models.md#Algo) model"""
+        return await self._backend.get(schemas.Type.Algo, key)
+
+    @logit
+    async def get_compute_plan(self, key: str) -> models.ComputePlan:
+        """Get compute plan by key, the returned object is described
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model"""
+        return await self._backend.get(schemas.Type.ComputePlan, key)
+
+    @logit
+    async def get_aggregate_algo(self, key: str) -> models.AggregateAlgo:
+        """Get aggregate algo by key, the returned object is described
+        in the [models.AggregateAlgo](sdk_models.md#AggregateAlgo) model"""
+        return await self._backend.get(schemas.Type.AggregateAlgo, key)
+
+    @logit
+    async def get_composite_algo(self, key: str) -> models.CompositeAlgo:
+        """Get composite algo by key, the returned object is described
+        in the [models.CompositeAlgo](sdk_models.md#CompositeAlgo) model"""
+        return await self._backend.get(schemas.Type.CompositeAlgo, key)
+
+    @logit
+    async def get_dataset(self, key: str) -> models.Dataset:
+        """Get dataset by key, the returned object is described
+        in the [models.Dataset](sdk_models.md#Dataset) model"""
+        return await self._backend.get(schemas.Type.Dataset, key)
+
+    @logit
+    async def get_objective(self, key: str) -> models.Objective:
+        """Get objective by key, the returned object is described
+        in the [models.Objective](sdk_models.md#Objective) model"""
+        return await self._backend.get(schemas.Type.Objective, key)
+
+    @logit
+    async def get_testtuple(self, key: str) -> models.Testtuple:
+        """Get testtuple by key, the returned object is described
+        in the [models.Testtuple](sdk_models.md#Testtuple) model"""
+        return await self._backend.get(schemas.Type.Testtuple, key)
+
+    @logit
+    async def get_traintuple(self, key: str) -> models.Traintuple:
+        """Get traintuple by key, the returned object is described
+        in the [models.Traintuple](sdk_models.md#Traintuple) model"""
+        return await self._backend.get(schemas.Type.Traintuple, key)
+
+    @logit
+    async def get_aggregatetuple(self, key: str) -> models.Aggregatetuple:
+        """Get aggregatetuple by key, the returned object is described
+        in the [models.Aggregatetuple](sdk_models.md#Aggregatetuple) model"""
+        return await self._backend.get(schemas.Type.Aggregatetuple, key)
+
+    @logit
+    async def get_composite_traintuple(self, key: str) -> models.CompositeTraintuple:
+        """Get composite traintuple by key, the returned object is described
+        in the [models.CompositeTraintuple](sdk_models.md#CompositeTraintuple) model"""
+        return await self._backend.get(schemas.Type.CompositeTraintuple, key)
+
+    @logit
+    async def list_algo(self, filters=None) -> List[models.Algo]:
+        """List algos, the returned object is described
+        in the [models.Algo](sdk_models.md#Algo) model"""
+        return await self._backend.list(schemas.Type.Algo, filters)
+
+    @logit
+    async def list_compute_plan(self, filters=None) -> List[models.ComputePlan]:
+        """List compute plans, the returned object is described
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model"""
+        return await self._backend.list(schemas.Type.ComputePlan, filters)
+
+    @logit
+    async def list_aggregate_algo(self, filters=None) -> List[models.AggregateAlgo]:
+        """List aggregate algos, the returned object is described
+        in the [models.AggregateAlgo](sdk_models.md#AggregateAlgo) model"""
+        return await self._backend.list(schemas.Type.AggregateAlgo, filters)
+
+    @logit
+    async def list_composite_algo(self, filters=None) -> List[models.CompositeAlgo]:
+        """List composite algos, the returned object is described
+        in the [models.CompositeAlgo](sdk_models.md#CompositeAlgo) model"""
+        return await self._backend.list(schemas.Type.CompositeAlgo, filters)
+
+    @logit
+    async def list_data_sample(self, filters=None) -> List[models.DataSample]:
+        """List data samples, the returned object is described
+        in the [models.DataSample](sdk_models.md#DataSample) model"""
+        return await self._backend.list(schemas.Type.DataSample, filters)
+
+    @logit
+    async def list_dataset(self, filters=None) -> List[models.Dataset]:
+        """List datasets, the returned object is described
+        in the [models.Dataset](sdk_models.md#Dataset) model"""
+        return await self._backend.list(schemas.Type.Dataset, filters)
+
+    @logit
+    async def list_objective(self, filters=None) -> List[models.Objective]:
+        """List objectives, the returned object is described
+        in the [models.Objective](sdk_models.md#Objective) model"""
+        return await self._backend.list(schemas.Type.Objective, filters)
+
+    @logit
+    async def list_testtuple(self, filters=None) -> List[models.Testtuple]:
+        """List testtuples, the returned object is described
+        in the [models.Testtuple](sdk_models.md#Testtuple) model"""
+        return await self._backend.list(schemas.Type.Testtuple, filters)
+
+    @logit
+    async def list_traintuple(self, filters=None) -> List[models.Traintuple]:
+        """List traintuples, the returned object is described
+        in the [models.Traintuple](sdk_models.md#Traintuple) model"""
+        return await self._backend.list(schemas.Type.Traintuple, filters)
+
+    @logit
+    async def list_aggregatetuple(self, filters=None) -> List[models.Aggregatetuple]:
+        """List aggregatetuples, the returned object is described
+        in the [models.Aggregatetuple](sdk_models.md#Aggregatetuple) model"""
+        return await self._backend.list(schemas.Type.Aggregatetuple, filters)
+
+    @logit
+    async def list_composite_traintuple(self, filters=None) -> List[models.CompositeTraintuple]:
+        """List composite traintuples, the returned object is described
+        in the [models.CompositeTraintuple](sdk_models.md#CompositeTraintuple) model"""
+        return await self._backend.list(schemas.Type.CompositeTraintuple, filters)
+
+    @logit
+    async def list_node(self, *args, **kwargs) -> List[models.Node]:
+        """List nodes, the returned object is described
+        in the [models.Node](sdk_models.md#Node) model"""
+        return await self._backend.list(schemas.Type.Node)
+
+    @logit
+    async def update_compute_plan(
+        self,
+        key: str,
+        data: Union[dict, schemas.UpdateComputePlanSpec],
+        auto_batching: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: Optional[int] = None,
+        batch_by_rank: bool = False,
+    ) -> models.ComputePlan:
+        """Update compute plan, see `Client.update_compute_plan`.
+
+        The submission cannot be recorded in a journal to be resumed, use `Client`
+        for this.
+        """
+        spec = Client._get_spec(schemas.UpdateComputePlanSpec, data)
+        spec_options = {
+            "auto_batching": auto_batching,
+            "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+            "batch_by_rank": batch_by_rank,
+        }
+        return await self._backend.update_compute_plan(key, spec, spec_options=spec_options)
+
+    @logit
+    async def link_dataset_with_objective(self, dataset_key: str, objective_key: str) -> str:
+        """Link dataset with objective."""
+        return await self._backend.link_dataset_with_objective(dataset_key, objective_key)
+
+    @logit
+    async def link_dataset_with_data_samples(
+        self, dataset_key: str,
+        data_sample_keys: str,
+    ) -> List[str]:
+        """Link dataset with data samples."""
+        return await self._backend.link_dataset_with_data_samples(
+            dataset_key, data_sample_keys
+        )
+
+    @logit
+    async def download_dataset(self, key: str, destination_folder: str) -> None:
+        """Download opener script in destination folder."""
+        await self._backend.download(
+            schemas.Type.Dataset,
+            'opener.storage_address',
+            key,
+            os.path.join(destination_folder, 'opener.py'),
+        )
+
+    @logit
+    async def download_algo(self, key: str, destination_folder: str) -> None:
+        """Download algo package in destination folder."""
+        await self._backend.download(
+            schemas.Type.Algo,
+            'content.storage_address',
+            key,
+            os.path.join(destination_folder, 'algo.tar.gz'),
+        )
+
+    @logit
+    async def download_aggregate_algo(self, key: str, destination_folder: str) -> None:
+        """Download aggregate algo package in destination folder."""
+        await self._backend.download(
+            schemas.Type.AggregateAlgo,
+            'content.storage_address',
+            key,
+            os.path.join(destination_folder, 'aggregate_algo.tar.gz'),
+        )
+
+    @logit
+    async def download_composite_algo(self, key: str, destination_folder: str) -> None:
+        """Download composite algo package in destination folder."""
+        await self._backend.download(
+            schemas.Type.CompositeAlgo,
+            'content.storage_address',
+            key,
+            os.path.join(destination_folder, 'composite_algo.tar.gz'),
+        )
+
+    @logit
+    async def download_objective(self, key: str, destination_folder: str) -> None:
+        """Download metrics script in destination folder."""
+        await self._backend.download(
+            schemas.Type.Objective,
+            'metrics.storage_address',
+            key,
+            os.path.join(destination_folder, 'metrics.py'),
+        )
+
+    @logit
+    async def download_model(self, key: str, folder, checksum: Optional[str] = None) -> None:
+        """Download model to destination file.
+
+        If the checksum of the model is given, the downloaded file is verified against it.
+        """
+        await self._backend.download_model(
+            key, os.path.join(folder, f'model_{key}'), checksum=checksum,
+        )
+
+    @logit
+    async def describe_algo(self, key: str) -> str:
+        """Get algo description."""
+        return await self._backend.describe(schemas.Type.Algo, key)
+
+    @logit
+    async def describe_aggregate_algo(self, key: str) -> str:
+        """Get aggregate algo description."""
+        return await self._backend.describe(schemas.Type.AggregateAlgo, key)
+
+    @logit
+    async def describe_composite_algo(self, key: str) -> str:
+        """Get composite algo description."""
+        return await self._backend.describe(schemas.Type.CompositeAlgo, key)
+
+    @logit
+    async def describe_dataset(self, key: str) -> str:
+        """Get dataset description."""
+        return await self._backend.describe(schemas.Type.Dataset, key)
+
+    @logit
+    async def describe_objective(self, key: str) -> str:
+        """Get objective description."""
+        return await self._backend.describe(schemas.Type.Objective, key)
+
+    @logit
+    async def node_info(self) -> str:
+        """Get node information."""
+        return await self._backend.node_info()
+
+    @logit
+    async def leaderboard(self, objective_key: str, sort: str = 'desc') -> str:
+        """Get objective leaderboard"""
+        return await self._backend.leaderboard(objective_key, sort=sort)
+
+    @logit
+    async def cancel_compute_plan(self, key: str) -> models.ComputePlan:
+        """Cancel execution of compute plan, the returned object is described
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model"""
+        return await self._backend.cancel_compute_plan(key)
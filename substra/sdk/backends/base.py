@@ -18,6 +18,9 @@ class BaseBackend(abc.ABC):
     def update_compute_plan(self, key, spec):
         raise NotImplementedError
 
+    def resume_compute_plan(self, spec, journal_path):
+        raise NotImplementedError
+
     def link_dataset_with_objective(self, dataset_key, objective_key):
         raise NotImplementedError
 
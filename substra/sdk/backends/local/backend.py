@@ -11,8 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
 import os
 import shutil
+import threading
 import typing
 import warnings
 from distutils import util
@@ -20,48 +22,84 @@ from pathlib import Path
 
 import substra
 from substra.sdk import schemas, models, exceptions, fs, graph, compute_plan as compute_plan_module
+from substra.sdk import artifact_cache
 from substra.sdk.backends import base
 from substra.sdk.backends.local import dal
 from substra.sdk.backends.local import compute
+from substra.sdk.backends.local import scheduler
+from substra.sdk.backends.local.compute import spawner
 
 _BACKEND_ID = "local-backend"
 _MAX_LEN_KEY_METADATA = 50
 _MAX_LEN_VALUE_METADATA = 100
+# number of data samples copied at the same time
+_COPY_MAX_WORKERS = 8
 DEBUG_OWNER = "debug_owner"
 
 
 class Local(base.BaseBackend):
-    def __init__(self, backend, *args, **kwargs):
-        self._local_worker_dir = Path.cwd() / "local-worker"
-        self._local_worker_dir.mkdir(exist_ok=True)
+    def __init__(self, backend, *args,
+                 max_concurrent_tuples=scheduler.DEFAULT_MAX_WORKERS,
+                 local_workspace=None, **kwargs):
+        # the assets of a workspace are persisted and loaded back when it is opened again
+        self._workspace = Path(local_workspace).resolve() if local_workspace else None
+        self._local_worker_dir = self._workspace or Path.cwd() / "local-worker"
+        self._local_worker_dir.mkdir(parents=True, exist_ok=True)
 
         self._support_chainkeys = bool(util.strtobool(os.getenv("CHAINKEYS_ENABLED", 'False')))
         self._chainkey_dir = self._local_worker_dir / "chainkeys"
         if self._support_chainkeys:
             print(f"Chainkeys support is on, the directory is {self._chainkey_dir}")
 
+        # execute the tuples in docker containers or in child processes
+        self._spawner_name = os.getenv("DEBUG_SPAWNER", spawner.DOCKER)
+        # keep the containers running between the executions of the same algo
+        self._warm_containers = bool(
+            util.strtobool(os.getenv("DEBUG_WARM_CONTAINERS", 'False'))
+        )
+
+        # the data samples may be added from several threads
+        self._data_samples_lock = threading.Lock()
+        # the tuples of a compute plan are executed concurrently
+        self._max_concurrent_tuples = max_concurrent_tuples
+        self._tuples_lock = threading.Lock()
+
         # create a store to abstract the db
-        self._db = dal.DataAccess(backend, local_worker_dir=self._local_worker_dir)
+        self._db = dal.DataAccess(
+            backend,
+            local_worker_dir=self._local_worker_dir,
+            cache=artifact_cache.ArtifactCache() if backend else None,
+            workspace=self._workspace,
+        )
         self._worker = compute.Worker(
             self._db,
             local_worker_dir=self._local_worker_dir,
             support_chainkeys=self._support_chainkeys,
             chainkey_dir=self._chainkey_dir,
+            compute_plan_lock=self._tuples_lock,
+            spawner_name=self._spawner_name,
+            warm_containers=self._warm_containers,
         )
 
     @property
     def temp_directory(self):
         """Get the temporary directory where the assets are saved.
-        The directory is deleted at the end of the execution."""
+        The directory is deleted at the end of the execution, unless the backend uses a
+        local workspace."""
         return self._db.tmp_dir
 
+    @property
+    def response_cache(self):
+        """The response cache of the remote backend, None if there is none."""
+        return self._db.remote_response_cache
+
     def login(self, username, password):
         self._db.login(username, password)
 
     def get(self, asset_type, key):
         return self._db.get(asset_type, key)
 
-    def list(self, asset_type, filters=None):
+    def list(self, asset_type, filters=None, stream=False):
         """List the assets
 
         This is a simplified version of the backend 'list' function,
@@ -74,6 +112,8 @@ class Local(base.BaseBackend):
         Args:
             asset_type (schemas.Type): Type of asset to return
             filters (str, optional): Filter the list of results. Defaults to None.
+            stream (bool, optional): If True, returns an iterator over the results.
+                Defaults to False.
 
         Returns:
             typing.List[models._BaseModel]: List of results
@@ -93,6 +133,8 @@ class Local(base.BaseBackend):
             # the filters use the 'response' (ie camel case) format
             if all([getattr(asset, key) == value for key, value in parsed_filters.items()]):
                 result.append(asset)
+        if stream:
+            return iter(result)
         return result
 
     @staticmethod
@@ -200,7 +242,9 @@ class Local(base.BaseBackend):
             setattr(compute_plan, spec.compute_plan_attr_name, list_keys)
 
             compute_plan.tuple_count += 1
-            compute_plan.status = models.Status.waiting
+            if compute_plan.status != models.Status.failed:
+                compute_plan.status = models.Status.waiting
+            self._db.update(compute_plan)
 
         else:
             compute_plan_key = ""
@@ -213,64 +257,83 @@ class Local(base.BaseBackend):
         id_ = next((k for k in id_to_key if id_to_key[k] == key), None)
         return id_, tuple_.rank
 
+    def __add_tuple(self, register, key, spec, spec_options):
+        # the registration updates the compute plan, it is done by one thread at a time
+        with self._tuples_lock:
+            tuple_ = register(key, spec, spec_options)
+        self.__schedule_tuple(tuple_)
+        return tuple_
+
+    def __schedule_tuple(self, tuple_):
+        if isinstance(tuple_, models.Testtuple):
+            self._worker.schedule_testtuple(tuple_)
+        elif tuple_.status == models.Status.waiting:
+            self._worker.schedule_traintuple(tuple_)
+
     def __execute_compute_plan(
                 self,
                 spec,
                 compute_plan,
                 visited,
+                tuple_graph,
                 traintuples,
                 aggregatetuples,
                 compositetuples,
                 spec_options
             ):
+        # {id: (spec class, tuple spec, register function, rank)}, sorted by rank
+        tuples = dict()
         for id_, rank in sorted(visited.items(), key=lambda item: item[1]):
             if id_ in traintuples:
-                traintuple = traintuples[id_]
-                traintuple_spec = schemas.TraintupleSpec.from_compute_plan(
-                    compute_plan_key=compute_plan.key,
-                    id_to_key=compute_plan.id_to_key,
-                    rank=rank,
-                    spec=traintuple
+                tuples[id_] = (
+                    schemas.TraintupleSpec, traintuples[id_], self._register_traintuple, rank
                 )
-                traintuple_key = self.add(traintuple_spec, spec_options)
-                compute_plan.id_to_key[id_] = traintuple_key
-
             elif id_ in aggregatetuples:
-                aggregatetuple = aggregatetuples[id_]
-                aggregatetuple_spec = schemas.AggregatetupleSpec.from_compute_plan(
-                    compute_plan_key=compute_plan.key,
-                    id_to_key=compute_plan.id_to_key,
-                    rank=rank,
-                    spec=aggregatetuple
-                )
-                aggregatetuple_key = self.add(
-                    aggregatetuple_spec,
-                    spec_options,
+                tuples[id_] = (
+                    schemas.AggregatetupleSpec,
+                    aggregatetuples[id_],
+                    self._register_aggregatetuple,
+                    rank,
                 )
-                compute_plan.id_to_key[id_] = aggregatetuple_key
-
             elif id_ in compositetuples:
-                compositetuple = compositetuples[id_]
-                compositetuple_spec = schemas.CompositeTraintupleSpec.from_compute_plan(
-                    compute_plan_key=compute_plan.key,
-                    id_to_key=compute_plan.id_to_key,
-                    rank=rank,
-                    spec=compositetuple
+                tuples[id_] = (
+                    schemas.CompositeTraintupleSpec,
+                    compositetuples[id_],
+                    self._register_composite_traintuple,
+                    rank,
                 )
-                compositetuple_key = self.add(
-                    compositetuple_spec,
-                    spec_options,
-                )
-                compute_plan.id_to_key[id_] = compositetuple_key
-
-        if spec.testtuples:
-            for testtuple in spec.testtuples:
-                testtuple_spec = schemas.TesttupleSpec.from_compute_plan(
-                    id_to_key=compute_plan.id_to_key,
-                    spec=testtuple
-                )
-                self.add(testtuple_spec, spec_options)
 
+        # a tuple is ready when its in models are done, the testtuples are identified
+        # by their index as they do not have an id
+        dependencies = {id_: tuple_graph[id_] for id_ in tuples}
+        testtuples = spec.testtuples or list()
+        for index, testtuple in enumerate(testtuples):
+            dependencies[index] = [testtuple.traintuple_id]
+
+        def add_tuple(id_):
+            with self._tuples_lock:
+                if id_ in tuples:
+                    spec_class, tuple_spec, register, rank = tuples[id_]
+                    tuple_spec = spec_class.from_compute_plan(
+                        compute_plan_key=compute_plan.key,
+                        id_to_key=compute_plan.id_to_key,
+                        rank=rank,
+                        spec=tuple_spec
+                    )
+                else:
+                    register = self._register_testtuple
+                    tuple_spec = schemas.TesttupleSpec.from_compute_plan(
+                        id_to_key=compute_plan.id_to_key,
+                        spec=testtuples[id_]
+                    )
+                key = self._db.get_local_key(tuple_spec.compute_key())
+                tuple_ = register(key, tuple_spec, spec_options)
+                if id_ in tuples:
+                    compute_plan.id_to_key[id_] = key
+                    self._db.update(compute_plan)
+            self.__schedule_tuple(tuple_)
+
+        scheduler.run(dependencies, add_tuple, max_workers=self._max_concurrent_tuples)
         return compute_plan
 
     def __format_for_leaderboard(self, testtuple):
@@ -384,18 +447,18 @@ class Local(base.BaseBackend):
         )
         return self._db.add(asset)
 
-    def _add_data_sample(self, key, spec, spec_options=None):
+    def _get_data_sample_datasets(self, spec):
         if len(spec.data_manager_keys) == 0:
             raise exceptions.InvalidRequest(
                 "Please add at least one data manager for the data sample",
                 400
             )
-        datasets = [
+        return [
             self._db.get(schemas.Type.Dataset, dataset_key)
             for dataset_key in spec.data_manager_keys
         ]
 
-        data_sample_file_path = self._db.save_file(spec.path, key)
+    def _register_data_sample(self, key, spec, datasets, data_sample_file_path):
         data_sample = models.DataSample(
             key=key,
             owner=_BACKEND_ID,
@@ -403,35 +466,49 @@ class Local(base.BaseBackend):
             data_manager_keys=spec.data_manager_keys,
             test_only=spec.test_only,
         )
-        data_sample = self._db.add(data_sample)
+        with self._data_samples_lock:
+            data_sample = self._db.add(data_sample)
 
-        # update dataset(s) accordingly
-        for dataset in datasets:
-            if spec.test_only:
-                samples_list = dataset.test_data_sample_keys
-            else:
-                samples_list = dataset.train_data_sample_keys
-            if data_sample.key not in samples_list:
-                samples_list.append(data_sample.key)
+            # update dataset(s) accordingly
+            for dataset in datasets:
+                if spec.test_only:
+                    samples_list = dataset.test_data_sample_keys
+                else:
+                    samples_list = dataset.train_data_sample_keys
+                if data_sample.key not in samples_list:
+                    samples_list.append(data_sample.key)
+                    if self._db.is_local(dataset.key):
+                        self._db.update(dataset)
 
         return data_sample
 
+    def _add_data_sample(self, key, spec, spec_options=None):
+        datasets = self._get_data_sample_datasets(spec)
+        data_sample_file_path = self._db.save_file(spec.path, key)
+        return self._register_data_sample(key, spec, datasets, data_sample_file_path)
+
     def _add_data_samples(self, spec, spec_options=None):
-        data_samples = list()
-        for path in spec.paths:
-            data_sample_spec = schemas.DataSampleSpec(
-                path=path,
-                data_manager_keys=spec.data_manager_keys,
-                test_only=spec.test_only,
-            )
-            key = self._db.get_local_key(data_sample_spec.compute_key())
-            data_sample = self._add_data_sample(
-                key,
-                data_sample_spec,
-                spec_options,
-            )
-            data_samples.append(data_sample)
-        return data_samples
+        datasets = self._get_data_sample_datasets(spec)
+        keys = [
+            self._db.get_local_key(schemas.DataSampleSpec.compute_key())
+            for _ in spec.paths
+        ]
+
+        # the copies are IO bound, they are done in parallel
+        with concurrent.futures.ThreadPoolExecutor(max_workers=_COPY_MAX_WORKERS) as e:
+            futures = [e.submit(self._db.save_file, p, k) for p, k in zip(spec.paths, keys)]
+        try:
+            file_paths = [future.result() for future in futures]
+        except Exception:
+            # none of the data samples is registered, the copies would be orphaned
+            for key in keys:
+                self._db.remove_files(key)
+            raise
+
+        return [
+            self._register_data_sample(key, spec, datasets, file_path)
+            for key, file_path in zip(keys, file_paths)
+        ]
 
     def _add_objective(self, key, spec, spec_options):
 
@@ -455,6 +532,8 @@ class Local(base.BaseBackend):
             }
             if not dataset.objective_key:
                 dataset.objective_key = key
+                if self._db.is_local(dataset.key):
+                    self._db.update(dataset)
             else:
                 raise substra.exceptions.InvalidRequest(
                     "dataManager is already associated with a objective", 400
@@ -493,12 +572,27 @@ class Local(base.BaseBackend):
 
         return objective
 
+    @staticmethod
+    def __check_journal(spec_options):
+        if spec_options and spec_options.get('journal'):
+            raise exceptions.SDKException(
+                "The submission of a compute plan cannot be recorded in a journal in debug "
+                "mode, the journal is only supported by the remote backend."
+            )
+
+    def resume_compute_plan(self, spec, journal_path):
+        raise exceptions.SDKException(
+            "The submission of a compute plan cannot be resumed in debug mode, it is only "
+            "supported by the remote backend."
+        )
+
     def _add_compute_plan(
         self,
         key: str,
         spec: schemas.ComputePlanSpec,
         spec_options: dict = None
     ):
+        self.__check_journal(spec_options)
         if spec.clean_models:
             warnings.warn(
                 "'clean_models=True' is not supported on the local backend."
@@ -531,6 +625,7 @@ class Local(base.BaseBackend):
             spec,
             compute_plan,
             visited,
+            tuple_graph,
             traintuples,
             aggregatetuples,
             compositetuples,
@@ -538,7 +633,7 @@ class Local(base.BaseBackend):
         )
         return compute_plan
 
-    def _add_traintuple(self, key, spec, spec_options=None):
+    def _register_traintuple(self, key, spec, spec_options=None):
         # validation
         owner = self._check_metadata(spec.metadata)
         algo = self._db.get(schemas.Type.Algo, spec.algo_key)
@@ -615,11 +710,12 @@ class Local(base.BaseBackend):
             **options,
         )
 
-        traintuple = self._db.add(traintuple)
-        self._worker.schedule_traintuple(traintuple)
-        return traintuple
+        return self._db.add(traintuple)
 
-    def _add_testtuple(self, key, spec, spec_options=None):
+    def _add_traintuple(self, key, spec, spec_options=None):
+        return self.__add_tuple(self._register_traintuple, key, spec, spec_options)
+
+    def _register_testtuple(self, key, spec, spec_options=None):
 
         # validation
         owner = self._check_metadata(spec.metadata)
@@ -684,7 +780,9 @@ class Local(base.BaseBackend):
             else:
                 compute_plan.testtuple_keys.append(key)
             compute_plan.tuple_count += 1
-            compute_plan.status = models.Status.waiting
+            if compute_plan.status != models.Status.failed:
+                compute_plan.status = models.Status.waiting
+            self._db.update(compute_plan)
 
         options = {}
         testtuple = models.Testtuple(
@@ -713,11 +811,12 @@ class Local(base.BaseBackend):
             metadata=spec.metadata if spec.metadata else dict(),
             **options,
         )
-        testtuple = self._db.add(testtuple)
-        self._worker.schedule_testtuple(testtuple)
-        return testtuple
+        return self._db.add(testtuple)
 
-    def _add_composite_traintuple(
+    def _add_testtuple(self, key, spec, spec_options=None):
+        return self.__add_tuple(self._register_testtuple, key, spec, spec_options)
+
+    def _register_composite_traintuple(
         self,
         key: str,
         spec: schemas.CompositeTraintupleSpec,
@@ -818,16 +917,16 @@ class Local(base.BaseBackend):
             },
             metadata=spec.metadata or dict()
         )
-        composite_traintuple = self._db.add(composite_traintuple)
-        if composite_traintuple.status == models.Status.waiting:
-            self._worker.schedule_traintuple(composite_traintuple)
-        return composite_traintuple
+        return self._db.add(composite_traintuple)
 
-    def _add_aggregatetuple(self,
-                            key: str,
-                            spec: schemas.AggregatetupleSpec,
-                            spec_options: dict = None,
-                            ):
+    def _add_composite_traintuple(self, key, spec, spec_options=None):
+        return self.__add_tuple(self._register_composite_traintuple, key, spec, spec_options)
+
+    def _register_aggregatetuple(self,
+                                 key: str,
+                                 spec: schemas.AggregatetupleSpec,
+                                 spec_options: dict = None,
+                                 ):
         # validation
         owner = self._check_metadata(spec.metadata)
         algo = self._db.get(schemas.Type.AggregateAlgo, spec.algo_key)
@@ -892,10 +991,10 @@ class Local(base.BaseBackend):
             out_model=None,
             metadata=spec.metadata or dict()
         )
-        aggregatetuple = self._db.add(aggregatetuple)
-        if aggregatetuple.status == models.Status.waiting:
-            self._worker.schedule_traintuple(aggregatetuple)
-        return aggregatetuple
+        return self._db.add(aggregatetuple)
+
+    def _add_aggregatetuple(self, key, spec, spec_options=None):
+        return self.__add_tuple(self._register_aggregatetuple, key, spec, spec_options)
 
     def add(self, spec, spec_options=None):
         # find dynamically the method to call to create the asset
@@ -924,6 +1023,8 @@ class Local(base.BaseBackend):
             )
 
         dataset.objective_key = objective_key
+        if self._db.is_local(dataset.key):
+            self._db.update(dataset)
         return dataset.key
 
     def link_dataset_with_data_samples(self, dataset_key, data_sample_keys):
@@ -937,6 +1038,9 @@ class Local(base.BaseBackend):
                     dataset.test_data_sample_keys.append(key)
                 else:
                     dataset.train_data_sample_keys.append(key)
+                self._db.update(data_sample)
+                if self._db.is_local(dataset.key):
+                    self._db.update(dataset)
             else:
                 print(f"Data sample already in dataset: {key}")
             data_samples.append(data_sample)
@@ -954,12 +1058,12 @@ class Local(base.BaseBackend):
         else:
             self._db.remote_download(asset_type, url_field_path, key, destination)
 
-    def download_model(self, key, destination_file):
+    def download_model(self, key, destination_file, checksum=None):
         if self._db.is_local(key):
             asset = self._db.get(type_=schemas.Type.Model, key=key)
             shutil.copyfile(asset.storage_address, destination_file)
         else:
-            self._db.remote_download_model(key, destination_file)
+            self._db.remote_download_model(key, destination_file, checksum=checksum)
 
     def describe(self, asset_type, key):
         if self._db.is_local(key):
@@ -998,6 +1102,7 @@ class Local(base.BaseBackend):
                             key: str,
                             spec: schemas.UpdateComputePlanSpec,
                             spec_options: dict = None):
+        self.__check_journal(spec_options)
         compute_plan = self._db.get(schemas.Type.ComputePlan, key)
         # Get all the new tuples and their dependencies
         (
@@ -1052,6 +1157,7 @@ class Local(base.BaseBackend):
             spec,
             compute_plan,
             visited,
+            tuple_graph,
             traintuples,
             aggregatetuples,
             compositetuples,
@@ -0,0 +1,173 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Runner of the commands sent to a long-lived container by the local backend.
+
+The runner is the main process of the container. It waits for the requests written in
+the control directory and executes each of them in a forked process, so that the modules
+imported by the previous executions are already loaded: the third-party modules imported
+by an execution are imported by the runner once it is completed.
+
+A request is a JSON file `<id>.request.json`, the output of the execution is written in
+`<id>.log` and its exit code in `<id>.result.json`.
+
+This file is executed by the python interpreter of the algo image, it only uses the
+standard library.
+"""
+import importlib
+import json
+import os
+import runpy
+import shutil
+import sys
+import time
+import traceback
+
+READY_FILE = 'ready'
+REQUEST_SUFFIX = '.request.json'
+RESULT_SUFFIX = '.result.json'
+LOG_SUFFIX = '.log'
+
+_POLL_INTERVAL = 0.05
+_PACKAGES_DIRS = ('site-packages', 'dist-packages')
+
+
+def _write_json(path, content):
+    """Write the file atomically so that it is never read partially."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(content, f)
+    os.rename(tmp_path, path)
+
+
+def _link(links, previous_links):
+    """Link the paths expected by the algo to the directories of the execution."""
+    for destination in previous_links:
+        if os.path.islink(destination):
+            os.unlink(destination)
+    for destination, source in links.items():
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.islink(destination) or os.path.isfile(destination):
+            os.unlink(destination)
+        elif os.path.isdir(destination):
+            shutil.rmtree(destination)
+        os.symlink(source, destination)
+
+
+def _installed_modules():
+    names = set()
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None) or ''
+        if any(d in path for d in _PACKAGES_DIRS):
+            names.add(name.split('.')[0])
+    return sorted(names)
+
+
+def _run(request, log_path, modules_path):
+    """Execute the request, called in the forked process."""
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+
+    os.environ.update(request.get('env') or {})
+    os.chdir(request['cwd'])
+    argv = request['argv']
+    sys.argv = list(argv)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(argv[0])))
+    try:
+        runpy.run_path(argv[0], run_name='__main__')
+        exit_code = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+
+    try:
+        _write_json(modules_path, _installed_modules())
+    except Exception:
+        pass
+    return exit_code
+
+
+def _execute(request, log_path, modules_path):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 1
+        try:
+            exit_code = _run(request, log_path, modules_path)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
+
+    _, status = os.waitpid(pid, 0)
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _preload(modules_path):
+    """Import the modules imported by the execution so that the next ones are faster."""
+    if not os.path.exists(modules_path):
+        return
+    with open(modules_path) as f:
+        names = json.load(f)
+    os.unlink(modules_path)
+    for name in names:
+        if name in sys.modules:
+            continue
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+
+def main(control_dir):
+    links = dict()
+    _write_json(os.path.join(control_dir, READY_FILE), {'pid': os.getpid()})
+    while True:
+        names = sorted(n for n in os.listdir(control_dir) if n.endswith(REQUEST_SUFFIX))
+        if not names:
+            time.sleep(_POLL_INTERVAL)
+            continue
+
+        for name in names:
+            request_id = name[:-len(REQUEST_SUFFIX)]
+            request_path = os.path.join(control_dir, name)
+            with open(request_path) as f:
+                request = json.load(f)
+            os.unlink(request_path)
+            if request.get('stop'):
+                return
+
+            _link(request['links'], links)
+            links = request['links']
+            modules_path = os.path.join(control_dir, request_id + '.modules.json')
+            exit_code = _execute(
+                request, os.path.join(control_dir, request_id + LOG_SUFFIX), modules_path
+            )
+            _preload(modules_path)
+            _write_json(
+                os.path.join(control_dir, request_id + RESULT_SUFFIX), {'exit_code': exit_code}
+            )
+
+
+if __name__ == '__main__':
+    main(sys.argv[1])
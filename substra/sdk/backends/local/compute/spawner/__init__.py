@@ -0,0 +1,48 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pathlib
+
+from substra.sdk.backends.local.compute.spawner.base import BaseSpawner, ExecutionError
+from substra.sdk.backends.local.compute.spawner.docker import (
+    IMAGE_REPOSITORY,
+    DockerSpawner,
+    WarmDockerSpawner,
+    prune_images,
+)
+from substra.sdk.backends.local.compute.spawner.subprocess import SubprocessSpawner
+
+DOCKER = 'docker'
+SUBPROCESS = 'subprocess'
+
+__all__ = [
+    'BaseSpawner',
+    'DockerSpawner',
+    'ExecutionError',
+    'IMAGE_REPOSITORY',
+    'SubprocessSpawner',
+    'WarmDockerSpawner',
+    'get',
+    'prune_images',
+]
+
+
+def get(name: str, local_worker_dir: pathlib.Path, warm_containers: bool = False) -> BaseSpawner:
+    """Get the spawner by its name, 'docker' or 'subprocess'."""
+    if name == SUBPROCESS:
+        return SubprocessSpawner(local_worker_dir=local_worker_dir)
+    if name != DOCKER:
+        raise ValueError(f"Unknown spawner '{name}', choose one of: {DOCKER}, {SUBPROCESS}")
+    if warm_containers:
+        return WarmDockerSpawner(local_worker_dir=local_worker_dir)
+    return DockerSpawner(local_worker_dir=local_worker_dir)
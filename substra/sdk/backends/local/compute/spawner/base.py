@@ -0,0 +1,85 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import abc
+import pathlib
+import tarfile
+import typing
+import zipfile
+
+from substra.sdk import exceptions
+
+
+class ExecutionError(Exception):
+    pass
+
+
+def _untar(archive, to_):
+    with tarfile.open(archive) as tf:
+        tf.extractall(to_)
+
+
+def _unzip(archive, to_):
+    with zipfile.ZipFile(archive) as zf:
+        zf.extractall(to_)
+
+
+def uncompress(archive, to_):
+    """Uncompress tar or zip archive to destination."""
+    if tarfile.is_tarfile(archive):
+        _untar(archive, to_)
+    elif zipfile.is_zipfile(archive):
+        _unzip(archive, to_)
+    else:
+        raise exceptions.InvalidRequest(f"Cannot uncompress '{archive}'", 400)
+
+
+class BaseSpawner(abc.ABC):
+    """Execute a command of an algo or metrics archive.
+
+    The archive contains a Dockerfile, the command is executed in an environment where
+    the volumes are available at the paths given by their 'bind' value, in the
+    '/sandbox' directory.
+    """
+
+    # whether the command is executed on the host filesystem, in which case the volumes
+    # may contain symbolic links to any host path
+    host_filesystem = False
+
+    def __init__(self, local_worker_dir: pathlib.Path):
+        self._local_worker_dir = local_worker_dir
+
+    @abc.abstractmethod
+    def spawn(
+        self,
+        name: str,
+        archive_path: str,
+        command: str,
+        volumes: typing.Optional[dict] = None,
+        envs: typing.Optional[dict] = None,
+        checksum: typing.Optional[str] = None,
+    ) -> str:
+        """Execute the command (blocking) and return its logs.
+
+        Args:
+            name (str): name of the execution environment
+            archive_path (str): path of the archive of the algo or metrics
+            command (str): arguments given to the entrypoint of the Dockerfile
+            volumes (dict, optional): {host path: {'bind': path, 'mode': 'ro' or 'rw'}}
+            envs (dict, optional): environment variables
+            checksum (str, optional): checksum of the archive, used to reuse the
+                environment built from the same archive
+
+        Raises:
+            ExecutionError: if the command failed
+        """
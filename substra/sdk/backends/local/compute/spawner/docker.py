@@ -0,0 +1,364 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import collections
+import json
+import logging
+import os
+import shlex
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+import pathlib
+
+import docker
+
+from substra.sdk.backends.local.compute import runner
+from substra.sdk.backends.local.compute.spawner.base import BaseSpawner, ExecutionError, uncompress
+
+logger = logging.getLogger(__name__)
+
+# repository of the images built from the archives, tagged with their checksum
+IMAGE_REPOSITORY = 'substra-local'
+
+# paths of the runner and of the local worker directory in the long-lived containers
+_RUNNER_PATH = '/substra-runner/runner.py'
+_WORKER_DIR = '/substra-worker'
+# the local worker directory is also mounted read-only, the read-only volumes of the
+# executions are linked to this mount
+_READ_ONLY_WORKER_DIR = '/substra-worker-ro'
+_STARTUP_TIMEOUT = 60
+_HEALTH_CHECK_INTERVAL = 1
+_POLL_INTERVAL = 0.02
+
+
+class DockerSpawner(BaseSpawner):
+    """Wrapper around docker daemon to execute a command in a container.
+
+    When the checksum of the archive is given, the image is tagged with it and is only
+    built if it does not exist yet, so that it is reused by the following executions and
+    the following sessions.
+    """
+
+    def __init__(self, local_worker_dir: pathlib.Path):
+        super().__init__(local_worker_dir)
+        self._docker = docker.from_env()
+        # the same image may be required by tuples executed concurrently
+        self._build_locks = collections.defaultdict(threading.Lock)
+        self._build_locks_lock = threading.Lock()
+        self._images = set()
+
+    def _build(self, archive_path, tag):
+        with tempfile.TemporaryDirectory(dir=self._local_worker_dir) as tmpdir:
+            uncompress(archive_path, tmpdir)
+            try:
+                self._docker.images.build(path=tmpdir, tag=tag, rm=True)
+            except docker.errors.BuildError as exc:
+                for line in exc.build_log:
+                    if 'stream' in line:
+                        print(line['stream'].strip())
+                raise
+
+    def _get_image(self, archive_path, checksum):
+        """Get the image built from the archive, build it if it does not exist."""
+        image = f'{IMAGE_REPOSITORY}:{checksum}'
+        with self._build_locks_lock:
+            lock = self._build_locks[checksum]
+        with lock:
+            if image in self._images:
+                return image
+            try:
+                self._docker.images.get(image)
+            except docker.errors.ImageNotFound:
+                logger.info(f'Building image {image}')
+                self._build(archive_path, image)
+            self._images.add(image)
+        return image
+
+    def prune_images(self):
+        """Remove the images built from the archives which were not used by this spawner.
+
+        Returns:
+            list: tags of the removed images
+        """
+        return prune_images(self._docker, keep=self._images)
+
+    def _get_image_or_build(self, name, archive_path, checksum):
+        if checksum:
+            return self._get_image(archive_path, checksum)
+        self._build(archive_path, name)
+        return name
+
+    def spawn(self, name, archive_path, command, volumes=None, envs=None, checksum=None):
+        """Spawn a docker container (blocking)."""
+        image = self._get_image_or_build(name, archive_path, checksum)
+
+        container = self._docker.containers.run(
+            image,
+            command=command,
+            volumes=volumes or {},
+            environment=envs,
+            remove=False,
+            detach=True,
+            tty=True,
+            stdin_open=True,
+            shm_size='8G',
+        )
+
+        execution_logs = []
+        for line in container.logs(stream=True, stdout=True, stderr=True):
+            execution_logs.append(line.decode('utf-8'))
+
+        r = container.wait()
+        execution_logs = ''.join(execution_logs)
+        exit_code = r['StatusCode']
+        if exit_code != 0:
+            print(f"\n\nExecution logs: {execution_logs}")
+            raise ExecutionError(f"Container '{name}' exited with status code '{exit_code}'")
+
+        container.remove()
+        return execution_logs
+
+
+def prune_images(docker_client=None, keep=()):
+    """Remove the images built from the archives by the local backend.
+
+    Args:
+        docker_client (docker.DockerClient, optional): client of the docker daemon,
+            created from the environment if None
+        keep (iterable, optional): tags of the images to keep
+
+    Returns:
+        list: tags of the removed images
+    """
+    docker_client = docker_client or docker.from_env()
+    keep = set(keep)
+    removed = list()
+    for image in docker_client.images.list(name=IMAGE_REPOSITORY):
+        tags = [tag for tag in image.tags if tag.startswith(f'{IMAGE_REPOSITORY}:')]
+        if not tags or any(tag in keep for tag in tags):
+            continue
+        try:
+            docker_client.images.remove(image.id)
+        except docker.errors.APIError as e:
+            # for instance, the image is used by a container
+            logger.warning(f'Could not remove image {tags[0]}: {e}')
+            continue
+        removed.extend(tags)
+    return removed
+
+
+def _get_python_entrypoint(image_config):
+    """Return the python interpreter, the script and the working directory of the image,
+    None if the entrypoint does not execute a python script."""
+    entrypoint = image_config.get('Entrypoint') or []
+    if len(entrypoint) != 2 or not os.path.basename(entrypoint[0]).startswith('python'):
+        return None
+    return entrypoint[0], entrypoint[1], image_config.get('WorkingDir') or '/'
+
+
+class _Executor:
+    """Long-lived container executing the commands sent to its runner."""
+
+    def __init__(self, docker_client, image, python, local_worker_dir):
+        self.image = image
+        self._local_worker_dir = local_worker_dir
+        self._control_dir = pathlib.Path(
+            tempfile.mkdtemp(prefix='executor-', dir=local_worker_dir)
+        )
+        self._n_requests = 0
+        try:
+            self._container = docker_client.containers.run(
+                image,
+                entrypoint=[python, _RUNNER_PATH, self.container_path(self._control_dir)],
+                # the same directory is mounted twice, which requires the list form
+                volumes=[
+                    f'{local_worker_dir}:{_WORKER_DIR}:rw',
+                    f'{local_worker_dir}:{_READ_ONLY_WORKER_DIR}:ro',
+                    f'{runner.__file__}:{_RUNNER_PATH}:ro',
+                ],
+                detach=True,
+                shm_size='8G',
+            )
+        except Exception:
+            shutil.rmtree(self._control_dir, ignore_errors=True)
+            raise
+        self._wait_ready()
+
+    def container_path(self, path):
+        """Path of a file of the local worker directory in the container."""
+        return _container_path(self._local_worker_dir, path)
+
+    def _wait_ready(self):
+        deadline = time.monotonic() + _STARTUP_TIMEOUT
+        while not (self._control_dir / runner.READY_FILE).exists():
+            if time.monotonic() > deadline or not self.is_alive():
+                logs = self._container.logs().decode('utf-8', errors='replace')
+                self.stop()
+                raise ExecutionError(f"Could not start a container from '{self.image}': {logs}")
+            time.sleep(_POLL_INTERVAL)
+
+    def is_alive(self):
+        try:
+            self._container.reload()
+        except docker.errors.NotFound:
+            return False
+        return self._container.status == 'running'
+
+    def execute(self, argv, cwd, links, envs=None):
+        """Execute the command in the container (blocking), return the exit code and
+        the logs."""
+        self._n_requests += 1
+        request_id = f'{self._n_requests:06d}'
+        runner._write_json(
+            str(self._control_dir / (request_id + runner.REQUEST_SUFFIX)),
+            {'argv': argv, 'cwd': cwd, 'links': links, 'env': envs or {}},
+        )
+
+        result_path = self._control_dir / (request_id + runner.RESULT_SUFFIX)
+        log_path = self._control_dir / (request_id + runner.LOG_SUFFIX)
+        last_check = time.monotonic()
+        while not result_path.exists():
+            time.sleep(_POLL_INTERVAL)
+            if time.monotonic() - last_check > _HEALTH_CHECK_INTERVAL:
+                if not self.is_alive():
+                    raise ExecutionError(f"The container of '{self.image}' stopped unexpectedly")
+                last_check = time.monotonic()
+
+        exit_code = json.loads(result_path.read_text())['exit_code']
+        logs = log_path.read_text(errors='replace') if log_path.exists() else ''
+        result_path.unlink()
+        if log_path.exists():
+            log_path.unlink()
+        return exit_code, logs
+
+    def stop(self):
+        try:
+            self._container.remove(force=True)
+        except docker.errors.APIError as e:
+            logger.warning(f'Could not remove the container of {self.image}: {e}')
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+
+
+def _container_path(local_worker_dir, path, read_only=False):
+    relative_path = pathlib.Path(path).resolve().relative_to(local_worker_dir.resolve())
+    worker_dir = _READ_ONLY_WORKER_DIR if read_only else _WORKER_DIR
+    return str(pathlib.PurePosixPath(worker_dir) / relative_path)
+
+
+def _stop_executors(executors):
+    for executor in list(executors):
+        executor.stop()
+    executors.clear()
+
+
+class WarmDockerSpawner(DockerSpawner):
+    """Execute the commands in long-lived containers, one pool of containers per image.
+
+    The local worker directory is mounted in the containers, and the volumes of each
+    execution are linked to the paths expected by the algo. The directory is also
+    mounted read-only: the read-only volumes, such as the data samples and the opener,
+    are linked to this mount so that they cannot be modified through these paths. The
+    executions of the same image reuse the idle containers, which skip the container
+    startup and keep the modules imported by the previous executions loaded.
+
+    A container is checked before each execution and is removed after a failed
+    execution, so that the next one starts from a clean container. The commands which
+    cannot be executed in a long-lived container, because the image does not execute
+    a python script or because a volume is not in the local worker directory, are
+    executed in a new container.
+    """
+
+    def __init__(self, local_worker_dir: pathlib.Path):
+        super().__init__(local_worker_dir)
+        self._entrypoints = dict()
+        self._idle = collections.defaultdict(list)
+        self._executors = set()
+        self._executors_lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _stop_executors, self._executors)
+
+    def _get_links(self, volumes):
+        links = dict()
+        for path, volume in (volumes or {}).items():
+            try:
+                links[volume['bind']] = _container_path(
+                    self._local_worker_dir, path, read_only=volume.get('mode') == 'ro',
+                )
+            except ValueError:
+                return None
+        return links
+
+    def _get_entrypoint(self, image):
+        if image not in self._entrypoints:
+            config = self._docker.images.get(image).attrs['Config']
+            self._entrypoints[image] = _get_python_entrypoint(config)
+        return self._entrypoints[image]
+
+    def _acquire(self, image, python):
+        while True:
+            with self._executors_lock:
+                executor = self._idle[image].pop() if self._idle[image] else None
+            if executor is None:
+                executor = _Executor(self._docker, image, python, self._local_worker_dir)
+                with self._executors_lock:
+                    self._executors.add(executor)
+                return executor
+            if executor.is_alive():
+                return executor
+            self._discard(executor)
+
+    def _release(self, executor):
+        with self._executors_lock:
+            self._idle[executor.image].append(executor)
+
+    def _discard(self, executor):
+        with self._executors_lock:
+            self._executors.discard(executor)
+        executor.stop()
+
+    def close(self):
+        """Remove the long-lived containers."""
+        self._finalizer()
+
+    def spawn(self, name, archive_path, command, volumes=None, envs=None, checksum=None):
+        """Execute the command in a long-lived container (blocking)."""
+        links = self._get_links(volumes)
+        entrypoint = None
+        if checksum and links is not None:
+            image = self._get_image(archive_path, checksum)
+            entrypoint = self._get_entrypoint(image)
+        if entrypoint is None:
+            return super().spawn(
+                name, archive_path, command, volumes=volumes, envs=envs, checksum=checksum
+            )
+
+        python, script, cwd = entrypoint
+        executor = self._acquire(image, python)
+        try:
+            exit_code, logs = executor.execute(
+                [script] + shlex.split(command), cwd, links, envs=envs
+            )
+        except Exception:
+            self._discard(executor)
+            raise
+
+        if exit_code != 0:
+            # the next execution starts from a clean container
+            self._discard(executor)
+            print(f"\n\nExecution logs: {logs}")
+            raise ExecutionError(f"Container '{name}' exited with status code '{exit_code}'")
+
+        self._release(executor)
+        return logs
@@ -0,0 +1,181 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import collections
+import json
+import logging
+import os
+import pathlib
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+from substra.sdk.backends.local.compute.spawner.base import BaseSpawner, ExecutionError, uncompress
+
+logger = logging.getLogger(__name__)
+
+# maximum duration of an execution, in seconds
+DEFAULT_TIMEOUT = 24 * 60 * 60
+
+_SANDBOX_DIR = '/sandbox'
+
+
+def get_entrypoint(dockerfile_path):
+    """Get the ENTRYPOINT of the Dockerfile, it must use the exec form:
+
+        ENTRYPOINT ["python3", "algo.py"]
+    """
+    with open(dockerfile_path) as f:
+        for line in f:
+            instruction, _, arguments = line.strip().partition(' ')
+            if instruction.upper() != 'ENTRYPOINT':
+                continue
+            try:
+                entrypoint = json.loads(arguments)
+            except ValueError:
+                entrypoint = None
+            if not isinstance(entrypoint, list) or not entrypoint:
+                raise ExecutionError(
+                    f"Invalid ENTRYPOINT in {dockerfile_path}, the exec form must be used: "
+                    'ENTRYPOINT ["python3", "algo.py"]'
+                )
+            return entrypoint
+    raise ExecutionError(f"No ENTRYPOINT in {dockerfile_path}")
+
+
+def _link(src, dst):
+    """Link the file or directory, the files are hardlinked so that the scripts are
+    executed from the sandbox."""
+    if os.path.isdir(src):
+        os.symlink(src, dst, target_is_directory=True)
+        return
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _sandbox_path(sandbox, path):
+    """Map a path of the '/sandbox' directory to the sandbox of the execution."""
+    relative_path = os.path.relpath(path, _SANDBOX_DIR)
+    if relative_path == os.curdir:
+        return str(sandbox)
+    if relative_path.startswith(os.pardir):
+        return None
+    return str(sandbox / relative_path)
+
+
+class SubprocessSpawner(BaseSpawner):
+    """Execute the command in a child process, without docker.
+
+    The archive is uncompressed once per checksum. For each execution, a sandbox
+    directory contains links to the files of the archive and to the volumes, at the
+    paths given by their 'bind' value in the '/sandbox' directory. The entrypoint of
+    the Dockerfile is executed from the sandbox, with the python interpreter of the
+    current process, and the '/sandbox' paths of the command are replaced by the path
+    of the sandbox.
+
+    The requirements of the algo must be installed in the current python environment.
+    """
+
+    host_filesystem = True
+
+    def __init__(self, local_worker_dir: pathlib.Path, timeout=None):
+        super().__init__(local_worker_dir)
+        if timeout is None:
+            timeout = float(os.getenv('DEBUG_SPAWNER_TIMEOUT') or DEFAULT_TIMEOUT)
+        self._timeout = timeout
+        self._archives_dir = self._local_worker_dir / 'archives'
+        # the same archive may be required by tuples executed concurrently
+        self._locks = collections.defaultdict(threading.Lock)
+        self._locks_lock = threading.Lock()
+
+    def _get_archive_dir(self, archive_path, checksum):
+        """Get the directory of the uncompressed archive, uncompress it if needed."""
+        archive_dir = self._archives_dir / checksum
+        with self._locks_lock:
+            lock = self._locks[checksum]
+        with lock:
+            if not archive_dir.exists():
+                self._archives_dir.mkdir(parents=True, exist_ok=True)
+                tmp_dir = tempfile.mkdtemp(dir=self._archives_dir)
+                try:
+                    uncompress(archive_path, tmp_dir)
+                    os.rename(tmp_dir, archive_dir)
+                except Exception:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    raise
+        return archive_dir
+
+    def _prepare_sandbox(self, sandbox, archive_dir, volumes):
+        for name in os.listdir(archive_dir):
+            _link(os.path.join(archive_dir, name), sandbox / name)
+        for path, volume in (volumes or {}).items():
+            destination = _sandbox_path(sandbox, volume['bind'])
+            if destination is None:
+                raise ExecutionError(
+                    f"Cannot mount {volume['bind']} without docker, only the paths of "
+                    f"{_SANDBOX_DIR} are supported"
+                )
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if os.path.lexists(destination):
+                # the archive file is replaced by the volume, as in the container
+                os.unlink(destination)
+            os.symlink(os.path.abspath(path), destination)
+
+    def spawn(self, name, archive_path, command, volumes=None, envs=None, checksum=None):
+        """Execute the command in a child process (blocking)."""
+        with tempfile.TemporaryDirectory(dir=self._local_worker_dir) as tmpdir:
+            if checksum:
+                archive_dir = self._get_archive_dir(archive_path, checksum)
+            else:
+                archive_dir = pathlib.Path(tmpdir) / 'archive'
+                uncompress(archive_path, archive_dir)
+            sandbox = pathlib.Path(tmpdir) / 'sandbox'
+            sandbox.mkdir()
+            self._prepare_sandbox(sandbox, archive_dir, volumes)
+
+            entrypoint = get_entrypoint(archive_dir / 'Dockerfile')
+            if os.path.basename(entrypoint[0]).startswith('python'):
+                entrypoint[0] = sys.executable
+            args = [
+                _sandbox_path(sandbox, arg) if arg.startswith(_SANDBOX_DIR) else arg
+                for arg in shlex.split(command)
+            ]
+            env = dict(os.environ)
+            env.update(envs or {})
+
+            try:
+                process = subprocess.run(
+                    entrypoint + args,
+                    cwd=sandbox,
+                    env=env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    timeout=self._timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                logs = (e.output or b'').decode('utf-8', errors='replace')
+                print(f"\n\nExecution logs: {logs}")
+                raise ExecutionError(f"Execution '{name}' timed out after {self._timeout}s")
+
+        execution_logs = process.stdout.decode('utf-8', errors='replace')
+        if process.returncode != 0:
+            print(f"\n\nExecution logs: {execution_logs}")
+            raise ExecutionError(
+                f"Execution '{name}' exited with status code '{process.returncode}'"
+            )
+        return execution_logs
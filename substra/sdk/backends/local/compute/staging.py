@@ -0,0 +1,114 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Staging of the data samples for the execution of a tuple.
+
+The data samples are made available in the data directory of the container without
+copying them, with one of the following strategies:
+
+- bind: each data sample is a read-only volume
+- symlink: the data directory contains symbolic links to the data samples, for the
+  spawners executing the tuples on the host
+- hardlink: the data directory contains a copy of the directory tree of the data samples
+  where the files are hardlinks, so that the data directory is a single volume
+- copy: the data samples are copied in the data directory, used when the files cannot
+  be hardlinked because the data samples are on another filesystem
+"""
+import logging
+import os
+import shutil
+
+logger = logging.getLogger(__name__)
+
+BIND = 'bind'
+SYMLINK = 'symlink'
+HARDLINK = 'hardlink'
+COPY = 'copy'
+
+# above this number of data samples, a single volume is used
+MAX_BIND_MOUNTS = 64
+
+_VOLUME_MODE = 'ro'
+
+
+def choose_strategy(n_samples, host_filesystem=False):
+    """Choose the staging strategy.
+
+    Args:
+        n_samples (int): number of data samples
+        host_filesystem (bool): whether the tuple is executed on the host filesystem
+    """
+    if host_filesystem:
+        return SYMLINK
+    if n_samples <= MAX_BIND_MOUNTS:
+        return BIND
+    return HARDLINK
+
+
+def hardlink_tree(src, dst):
+    """Recreate the directory tree of src in dst, the files are hardlinks.
+
+    Raises:
+        OSError: if a file cannot be hardlinked, for instance if src and dst are not on
+            the same filesystem
+    """
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=os.link)
+    else:
+        os.link(src, dst)
+
+
+def _copy(src, dst):
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+    else:
+        shutil.copyfile(src, dst)
+
+
+def stage(samples, data_dir, bind_dir, strategy):
+    """Stage the data samples and return the volumes to mount.
+
+    Args:
+        samples (dict): {key: path of the data sample}
+        data_dir (str): data directory of the tuple, on the host
+        bind_dir (str): data directory in the container, the data sample of a key is
+            available in bind_dir/key
+        strategy (str): staging strategy, the hardlink strategy falls back to a copy for
+            the data samples which cannot be hardlinked
+
+    Returns:
+        dict: {host path: {'bind': container path, 'mode': 'ro'}}
+    """
+    if strategy == BIND:
+        return {
+            str(path): {'bind': os.path.join(bind_dir, key), 'mode': _VOLUME_MODE}
+            for key, path in samples.items()
+        }
+
+    os.makedirs(data_dir, exist_ok=True)
+    for key, path in samples.items():
+        destination = os.path.join(data_dir, key)
+        if strategy == SYMLINK:
+            os.symlink(os.path.abspath(path), destination)
+        elif strategy == HARDLINK:
+            try:
+                hardlink_tree(path, destination)
+            except OSError as e:
+                logger.info(f'Could not hardlink the data sample {key}, copying it: {e}')
+                shutil.rmtree(destination, ignore_errors=True)
+                _copy(path, destination)
+        elif strategy == COPY:
+            _copy(path, destination)
+        else:
+            raise ValueError(f"Unknown staging strategy '{strategy}'")
+    return {str(data_dir): {'bind': bind_dir, 'mode': _VOLUME_MODE}}
@@ -16,11 +16,12 @@ import json
 import os
 import pathlib
 import shutil
+import threading
 import uuid
 
 from substra.sdk import schemas, fs, models
 from substra.sdk.backends.local import dal
-from substra.sdk.backends.local.compute import spawner
+from substra.sdk.backends.local.compute import spawner, staging
 
 _CONTAINER_MODEL_PATH = "/sandbox/model"
 
@@ -59,12 +60,21 @@ class Worker:
         local_worker_dir: pathlib.Path,
         support_chainkeys: bool,
         chainkey_dir=None,
+        compute_plan_lock=None,
+        spawner_name=spawner.DOCKER,
+        warm_containers=False,
     ):
         self._local_worker_dir = local_worker_dir
         self._db = db
-        self._spawner = spawner.get(local_worker_dir=self._local_worker_dir)
+        self._spawner = spawner.get(
+            spawner_name,
+            local_worker_dir=self._local_worker_dir,
+            warm_containers=warm_containers,
+        )
         self._support_chainkeys = support_chainkeys
         self._chainkey_dir = chainkey_dir
+        # the tuples may be executed from several threads
+        self._compute_plan_lock = compute_plan_lock or threading.Lock()
 
     def _get_owner(self, tuple_):
         if isinstance(tuple_, models.Aggregatetuple):
@@ -95,24 +105,32 @@ class Worker:
         data_sample_paths = ' '.join(data_sample_paths)
         return data_sample_paths
 
-    def _get_data_volume(self, tuple_dir, tuple_):
-        data_volume = _mkdir(os.path.join(tuple_dir, "data"))
-        samples = [
-            self._db.get(schemas.Type.DataSample, key) for key in tuple_.dataset.data_sample_keys
-        ]
-        for sample in samples:
-            # TODO more efficient link (symlink?)
-            shutil.copytree(sample.path, os.path.join(data_volume, sample.key))
-        return data_volume
+    def _get_data_volumes(self, tuple_dir, tuple_):
+        """Stage the data samples of the tuple without copying them."""
+        samples = {
+            key: self._db.get(schemas.Type.DataSample, key).path
+            for key in tuple_.dataset.data_sample_keys
+        }
+        strategy = staging.choose_strategy(
+            len(samples), host_filesystem=self._spawner.host_filesystem
+        )
+        return staging.stage(
+            samples,
+            os.path.join(tuple_dir, "data"),
+            _VOLUME_INPUT_DATASAMPLES['bind'],
+            strategy,
+        )
 
     def _save_output_model(self, tuple_, model_name, models_volume) -> models.OutModel:
         tmp_path = os.path.join(models_volume, model_name)
         model_dir = _mkdir(os.path.join(self._local_worker_dir, "models", tuple_.key))
         model_path = os.path.join(model_dir, model_name)
         shutil.copy(tmp_path, model_path)
-        return models.OutModel(key=self._db.get_local_key(str(uuid.uuid4())),
-                               checksum=fs.hash_file(model_path),
-                               storage_address=model_path)
+        out_model = models.OutModel(key=self._db.get_local_key(str(uuid.uuid4())),
+                                    checksum=fs.hash_file(model_path),
+                                    storage_address=model_path)
+        # index the model by key so that it is found without going through the tuples
+        return self._db.add(out_model)
 
     def _get_command_models_composite(self, is_train, tuple_, models_volume, container_volume):
         command = ""
@@ -155,18 +173,42 @@ class Worker:
             # delete tuple working directory
             shutil.rmtree(tmp_dir, ignore_errors=True)
 
+    @contextlib.contextmanager
+    def _execution(self, tuple_):
+        """Set the status of the tuple and of its compute plan if the execution fails."""
+        try:
+            yield
+        except Exception:
+            with self._compute_plan_lock:
+                tuple_.status = models.Status.failed
+                self._db.update(tuple_)
+                if tuple_.compute_plan_key:
+                    compute_plan = self._db.get(schemas.Type.ComputePlan, tuple_.compute_plan_key)
+                    compute_plan.status = models.Status.failed
+                    self._db.update(compute_plan)
+            raise
+
+    def _set_done(self, tuple_):
+        with self._compute_plan_lock:
+            tuple_.status = models.Status.done
+            # the outputs, logs and status of the tuple are stored at once
+            self._db.update(tuple_)
+            if tuple_.compute_plan_key:
+                compute_plan = self._db.get(schemas.Type.ComputePlan, tuple_.compute_plan_key)
+                compute_plan.done_count += 1
+                if compute_plan.done_count == compute_plan.tuple_count:
+                    compute_plan.status = models.Status.done
+                self._db.update(compute_plan)
+
     def schedule_traintuple(self, tuple_):
         """Schedules a ML task (blocking)."""
-        with self._context(tuple_.key) as tuple_dir:
+        with self._execution(tuple_), self._context(tuple_.key) as tuple_dir:
             tuple_.status = models.Status.doing
+            self._db.update(tuple_)
 
             # fetch dependencies
             algo = self._db.get_with_files(tuple_.algo_type, tuple_.algo.key)
 
-            compute_plan = None
-            if tuple_.compute_plan_key:
-                compute_plan = self._db.get(schemas.Type.ComputePlan, tuple_.compute_plan_key)
-
             volumes = dict()
             # Prepare input models
             if isinstance(tuple_, models.CompositeTraintuple):
@@ -202,8 +244,7 @@ class Worker:
                 dataset = self._db.get_with_files(schemas.Type.Dataset, tuple_.dataset.key)
                 volumes[dataset.opener.storage_address] = _VOLUME_OPENER
                 if self._db.is_local(tuple_.dataset.key):
-                    data_volume = self._get_data_volume(tuple_dir, tuple_)
-                    volumes[data_volume] = _VOLUME_INPUT_DATASAMPLES
+                    volumes.update(self._get_data_volumes(tuple_dir, tuple_))
 
             if tuple_.compute_plan_key:
                 #  Shared compute plan volume
@@ -264,6 +305,7 @@ class Worker:
                 command,
                 volumes=volumes,
                 envs=envs,
+                checksum=algo.content.checksum,
             )
 
             # save move output models
@@ -283,18 +325,13 @@ class Worker:
 
             # set logs and status
             tuple_.log = logs
-            tuple_.status = models.Status.done
-
-            if tuple_.compute_plan_key:
-                compute_plan = self._db.get(schemas.Type.ComputePlan, tuple_.compute_plan_key)
-                compute_plan.done_count += 1
-                if compute_plan.done_count == compute_plan.tuple_count:
-                    compute_plan.status = models.Status.done
+            self._set_done(tuple_)
 
     def schedule_testtuple(self, tuple_):
         """Schedules a ML task (blocking)."""
-        with self._context(tuple_.key) as tuple_dir:
+        with self._execution(tuple_), self._context(tuple_.key) as tuple_dir:
             tuple_.status = models.Status.doing
+            self._db.update(tuple_)
 
             # fetch dependencies
             traintuple = self._db.get(tuple_.traintuple_type, tuple_.traintuple_key)
@@ -303,10 +340,6 @@ class Worker:
             objective = self._db.get_with_files(schemas.Type.Objective, tuple_.objective.key)
             dataset = self._db.get_with_files(schemas.Type.Dataset, tuple_.dataset.key)
 
-            compute_plan = None
-            if tuple_.compute_plan_key:
-                compute_plan = self._db.get(schemas.Type.ComputePlan, tuple_.compute_plan_key)
-
             # prepare model and datasamples
             predictions_volume = _mkdir(os.path.join(tuple_dir, "pred"))
             models_volume = _mkdir(os.path.join(tuple_dir, "models"))
@@ -318,9 +351,10 @@ class Worker:
             }
 
             # If use fake data, no data volume
+            data_volumes = dict()
             if self._db.is_local(dataset.key):
-                data_volume = self._get_data_volume(tuple_dir, tuple_)
-                volumes[data_volume] = _VOLUME_INPUT_DATASAMPLES
+                data_volumes = self._get_data_volumes(tuple_dir, tuple_)
+                volumes.update(data_volumes)
 
             if tuple_.compute_plan_key:
                 owner = self._get_owner(tuple_)
@@ -378,7 +412,11 @@ class Worker:
 
             container_name = f"algo-{traintuple.algo.key}"
             logs = self._spawner.spawn(
-                container_name, str(algo.content.storage_address), command, volumes=volumes
+                container_name,
+                str(algo.content.storage_address),
+                command,
+                volumes=volumes,
+                checksum=algo.content.checksum,
             )
 
             # Calculate the metrics
@@ -392,7 +430,7 @@ class Worker:
                     _VOLUME_INPUT_DATASAMPLES['bind'],
                     tuple_.dataset
                 )
-                volumes[data_volume] = _VOLUME_INPUT_DATASAMPLES
+                volumes.update(data_volumes)
                 command = "--fake-data-mode DISABLED"
                 command += f" --data-sample-paths {data_sample_paths}"
             else:
@@ -405,6 +443,7 @@ class Worker:
                 str(objective.metrics.storage_address),
                 command=command,
                 volumes=volumes,
+                checksum=objective.metrics.checksum,
             )
 
             # save move performances
@@ -420,9 +459,4 @@ class Worker:
             tuple_.log = logs
             tuple_.log += "\n\n"
             tuple_.log += logs_predict
-            tuple_.status = models.Status.done
-
-            if compute_plan:
-                compute_plan.done_count += 1
-                if compute_plan.done_count == compute_plan.tuple_count:
-                    compute_plan.status = models.Status.done
+            self._set_done(tuple_)
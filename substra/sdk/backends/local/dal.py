@@ -15,9 +15,10 @@ import logging
 import pathlib
 import shutil
 import tempfile
+import threading
 import typing
 
-from substra.sdk import exceptions, schemas
+from substra.sdk import artifact_cache, exceptions, schemas
 from substra.sdk.backends.remote import backend
 from substra.sdk.backends.local import db
 
@@ -34,15 +35,30 @@ class DataAccess:
     def __init__(
         self,
         remote_backend: typing.Optional[backend.Remote],
-        local_worker_dir: pathlib.Path
+        local_worker_dir: pathlib.Path,
+        cache: typing.Optional[artifact_cache.ArtifactCache] = None,
+        workspace: typing.Optional[pathlib.Path] = None,
     ):
-        self._db = db.InMemoryDb()
         self._remote = remote_backend
-        self._tmp_dir = tempfile.TemporaryDirectory(prefix=str(local_worker_dir) + "/")
+        # persistent store of the files downloaded from the remote backend
+        self._cache = cache
+        if workspace is None:
+            self._db = db.InMemoryDb()
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix=str(local_worker_dir) + "/")
+            self._assets_dir = pathlib.Path(self._tmp_dir.name)
+        else:
+            # the assets and their files are kept in the workspace and loaded back
+            # when the workspace is opened again
+            self._db = db.SqliteDb(pathlib.Path(workspace) / "db.sqlite")
+            self._tmp_dir = None
+            self._assets_dir = pathlib.Path(workspace) / "assets"
+            self._assets_dir.mkdir(parents=True, exist_ok=True)
+        # the files may be fetched by tuples executed concurrently
+        self._files_lock = threading.Lock()
 
     @property
     def tmp_dir(self):
-        return pathlib.Path(self._tmp_dir.name)
+        return self._assets_dir
 
     @staticmethod
     def is_local(key: str):
@@ -86,11 +102,15 @@ class DataAccess:
     def add(self, asset):
         return self._db.add(asset)
 
+    @property
+    def remote_response_cache(self):
+        return self._remote.response_cache if self._remote else None
+
     def remote_download(self, asset_type, url_field_path, key, destination):
         self._remote.download(asset_type, url_field_path, key, destination)
 
-    def remote_download_model(self, key, destination_file):
-        self._remote.download_model(key, destination_file)
+    def remote_download_model(self, key, destination_file, checksum=None):
+        self._remote.download_model(key, destination_file, checksum=checksum)
 
     def get_remote_description(self, asset_type, key):
         return self._remote.describe(asset_type, key)
@@ -107,26 +127,31 @@ class DataAccess:
             tmp_directory = self.tmp_dir / key
             asset_path = tmp_directory / asset_name
 
-            if not tmp_directory.exists():
-                pathlib.Path.mkdir(tmp_directory)
-
-                self._remote.download(
-                    type_,
-                    field_name + ".storage_address",
-                    key,
-                    asset_path,
-                )
-
             attr = getattr(asset, field_name)
+            with self._files_lock:
+                if not tmp_directory.exists():
+                    pathlib.Path.mkdir(tmp_directory)
+
+                    def download(destination):
+                        self._remote.download(
+                            type_,
+                            field_name + ".storage_address",
+                            key,
+                            destination,
+                        )
+
+                    if self._cache is not None:
+                        self._cache.fetch(attr.checksum, asset_path, download)
+                    else:
+                        download(asset_path)
+
             attr.storage_address = asset_path
             return asset
 
     def get(self, type_, key: str, log: bool = True):
         if self.is_local(key):
-            if type_ == schemas.Type.Model:
-                return self._get_local_model(key)
-            else:
-                return self._db.get(type_, key, log)
+            # the local out models are indexed by key when they are saved by the worker
+            return self._db.get(type_, key, log)
         elif self._remote:
             return self._remote.get(type_, key)
         else:
@@ -137,7 +162,8 @@ class DataAccess:
         """"List assets."""
         local_assets = self._db.list(type_)
         remote_assets = list()
-        if self._remote:
+        # the models of the remote platform are not listed, only the local out models
+        if self._remote and type_ != schemas.Type.Model:
             try:
                 remote_assets = self._remote.list(type_, filters)
             except Exception as e:
@@ -181,23 +207,9 @@ class DataAccess:
             )
         return tmp_file
 
+    def remove_files(self, key: str):
+        """Remove the files saved for the asset by `save_file`."""
+        shutil.rmtree(self.tmp_dir / key, ignore_errors=True)
+
     def update(self, asset):
         return self._db.update(asset)
-
-    def _get_local_model(self, key):
-
-        for t in self.list(schemas.Type.Traintuple, filters=None):
-            if t.out_model and t.out_model.key == key:
-                return t.out_model
-
-        for t in self.list(schemas.Type.CompositeTraintuple, filters=None):
-            if t.out_head_model.out_model and t.out_head_model.out_model.key == key:
-                return t.out_head_model.out_model
-            if t.out_trunk_model.out_model and t.out_trunk_model.out_model.key == key:
-                return t.out_trunk_model.out_model
-
-        for t in self.list(schemas.Type.Aggregatetuple, filters=None):
-            if t.out_model and t.out_model.key == key:
-                return t.out_model
-
-        raise exceptions.NotFound(f"Wrong pk {key}", 404)
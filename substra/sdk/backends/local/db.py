@@ -14,8 +14,10 @@
 
 import collections
 import logging
+import sqlite3
+import threading
 
-from substra.sdk import exceptions
+from substra.sdk import exceptions, models, schemas
 
 logger = logging.getLogger(__name__)
 
@@ -59,3 +61,63 @@ class InMemoryDb:
 
         self._data[type_][key] = asset
         return asset
+
+
+class SqliteDb(InMemoryDb):
+    """Data db persisted in a SQLite file.
+
+    The assets are kept in memory and each of them is stored as a JSON row, so that the
+    assets of a local workspace are loaded back when the workspace is opened again. An
+    update, for instance of the status of a tuple, writes a single row.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._path = str(path)
+        # the tuples of a compute plan are executed in several threads
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS assets ("
+            "type TEXT NOT NULL, key TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (type, key))"
+        )
+        self._load()
+
+    def _load(self):
+        rows = self._connection.execute("SELECT type, data FROM assets ORDER BY rowid")
+        for type_, data in rows:
+            type_ = schemas.Type(type_)
+            asset = models.SCHEMA_TO_MODEL[type_].parse_raw(data)
+            self._data[type_][asset.key] = asset
+        logger.info(f"Assets loaded from '{self._path}'.")
+
+    def add(self, asset):
+        """Add an asset."""
+        asset = super().add(asset)
+        with self._lock:
+            # upserts (ON CONFLICT) are not supported by the SQLite versions shipped
+            # with older python builds
+            self._connection.execute(
+                "INSERT OR REPLACE INTO assets (type, key, data) VALUES (?, ?, ?)",
+                (asset.__class__.type_.value, asset.key, asset.json()),
+            )
+        return asset
+
+    def update(self, asset):
+        asset = super().update(asset)
+        with self._lock:
+            # the row is updated in place so that the assets are loaded in the same order
+            self._connection.execute(
+                "UPDATE assets SET data = ? WHERE type = ? AND key = ?",
+                (asset.json(), asset.__class__.type_.value, asset.key),
+            )
+        return asset
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
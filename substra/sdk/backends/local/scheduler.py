@@ -0,0 +1,85 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Execution of the tuples of a compute plan.
+
+A tuple is executed as soon as the tuples it depends on are done, instead of waiting for
+all the tuples of the previous ranks, so that independent tuples, for instance the
+trainings of the nodes in a federated round, are executed concurrently.
+"""
+import collections
+import concurrent.futures
+import heapq
+
+DEFAULT_MAX_WORKERS = 4
+
+
+def run(dependencies, execute, max_workers=DEFAULT_MAX_WORKERS):
+    """Execute the tasks once the tasks they depend on are done.
+
+    When several tasks are ready, they are started in the order of `dependencies`, so
+    that with a single worker the tasks are executed in this order.
+
+    Args:
+        dependencies (dict): ids of the tasks to execute and, for each of them, the ids
+            of the tasks it depends on. The dependencies which are not tasks to execute
+            are considered done.
+        execute (callable): executes the task whose id is given as argument, called from
+            a worker thread
+        max_workers (int): maximum number of tasks executed at the same time
+
+    Raises:
+        Exception: the error of the first task which failed. No task is started after a
+            failure, the error is raised once the running tasks are completed.
+    """
+    max_workers = max(1, max_workers)
+    order = {id_: index for index, id_ in enumerate(dependencies)}
+    waiting_for = {
+        id_: {d for d in deps if d in dependencies and d != id_}
+        for id_, deps in dependencies.items()
+    }
+    dependents = collections.defaultdict(list)
+    for id_, deps in waiting_for.items():
+        for dependency in deps:
+            dependents[dependency].append(id_)
+
+    ready = [(order[id_], id_) for id_, deps in waiting_for.items() if not deps]
+    heapq.heapify(ready)
+    running = dict()
+    error = None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as e:
+        while True:
+            while ready and error is None and len(running) < max_workers:
+                _, id_ = heapq.heappop(ready)
+                running[e.submit(execute, id_)] = id_
+            if not running:
+                break
+
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                id_ = running.pop(future)
+                try:
+                    future.result()
+                except Exception as exc:
+                    error = error or exc
+                    continue
+                for dependent in dependents[id_]:
+                    waiting_for[dependent].discard(id_)
+                    if not waiting_for[dependent]:
+                        heapq.heappush(ready, (order[dependent], dependent))
+
+    if error is not None:
+        raise error
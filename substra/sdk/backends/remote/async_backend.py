@@ -0,0 +1,307 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from copy import deepcopy
+import asyncio
+import logging
+import json
+import os
+
+from substra.sdk import exceptions, fs, schemas, models
+from substra.sdk.backends.remote import async_rest_client
+from substra.sdk.backends.remote.backend import (
+    AUTO_BATCHING,
+    BATCH_BY_RANK,
+    BATCH_SIZE,
+    DEFAULT_RETRY_TIMEOUT,
+    MAX_BATCH_BYTES,
+    _find_asset_field,
+    _find_checksum,
+    plan_batches,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRemote:
+    """Asynchronous version of the remote backend.
+
+    The methods have the same signature and return the same objects as the ones of
+    `backends.remote.Remote` but they must be awaited.
+    """
+
+    def __init__(self, url, insecure, token, retry_timeout,
+                 max_concurrency=async_rest_client.DEFAULT_MAX_CONCURRENCY,
+                 validate_responses=True, lazy_models=False):
+        self._client = async_rest_client.Client(
+            url, insecure, token, max_concurrency=max_concurrency,
+        )
+        self._retry_timeout = retry_timeout or DEFAULT_RETRY_TIMEOUT
+        # the responses of a trusted platform may be used without being validated
+        self._validate_responses = validate_responses
+        # the large fields of the assets are only built when they are read
+        self._lazy_models = lazy_models
+
+    async def close(self):
+        await self._client.close()
+
+    async def login(self, username, password):
+        return await self._client.login(username, password)
+
+    def _to_model(self, asset_type, asset):
+        model = models.SCHEMA_TO_MODEL[asset_type]
+        if self._lazy_models:
+            return models.build_lazy(model, asset, validate=self._validate_responses)
+        if self._validate_responses:
+            return model(**asset)
+        return models.construct(model, asset)
+
+    async def get(self, asset_type, key):
+        """Get an asset by key."""
+        asset = await self._client.get(asset_type.to_server(), key)
+        return self._to_model(asset_type, asset)
+
+    async def list(self, asset_type, filters=None):
+        """List assets per asset type."""
+        assets = await self._client.list(asset_type.to_server(), filters)
+        return [self._to_model(asset_type, asset) for asset in assets]
+
+    async def _add(self, asset, data, files=None):
+        data = deepcopy(data)  # make a deep copy for avoiding modification by reference
+        if files:
+            kwargs = {
+                'data': {
+                    'json': json.dumps(data),
+                },
+                'files': files,
+            }
+
+        else:
+            kwargs = {
+                'json': data,
+            }
+
+        return await self._client.add(
+            asset.to_server(),
+            retry_timeout=self._retry_timeout,
+            **kwargs,
+        )
+
+    async def _add_data_samples(self, spec, spec_options):
+        """Add data sample(s)."""
+        try:
+            with spec.build_request_kwargs(**spec_options) as (data, files):
+                data_samples = await self._add(
+                    schemas.Type.DataSample, data, files)
+        except exceptions.AlreadyExists as e:
+            if spec.is_many():
+                # We don't know which of the keys already exists
+                raise
+
+            key = e.key[0]
+            logger.warning(f"data_sample already exists: key='{key}'")
+            data_samples = [{'key': key}]
+
+        return [
+            data_sample['key'] for data_sample in data_samples
+        ] if spec.is_many() else data_samples[0]['key']
+
+    async def add(self, spec, spec_options=None):
+        """Add an asset."""
+        spec_options = spec_options or {}
+        asset_type = spec.__class__.type_
+        batch_size = spec_options.pop(BATCH_SIZE, None)
+        max_batch_bytes = spec_options.pop(MAX_BATCH_BYTES, None)
+        batch_by_rank = spec_options.pop(BATCH_BY_RANK, False)
+
+        if asset_type == schemas.Type.DataSample:
+            return await self._add_data_samples(
+                spec,
+                spec_options=spec_options,
+            )
+        elif asset_type == schemas.Type.ComputePlan and spec_options.pop(AUTO_BATCHING, False):
+            if not batch_size:
+                raise ValueError("Batch size must be defined to create a compute plan \
+                    with the auto-batching feature.")
+            return await self._auto_batching_compute_plan(
+                spec=spec,
+                batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                batch_by_rank=batch_by_rank,
+                spec_options=spec_options,
+            )
+
+        with spec.build_request_kwargs(**spec_options) as (data, files):
+            response = await self._add(asset_type, data, files=files)
+        if asset_type == schemas.Type.ComputePlan:
+            return models.ComputePlan(**response)
+
+        return response['key']
+
+    async def _auto_batching_compute_plan(self,
+                                          spec,
+                                          batch_size,
+                                          compute_plan_key=None,
+                                          spec_options=None,
+                                          max_batch_bytes=None,
+                                          batch_by_rank=False):
+        """Auto batching of the compute plan tuples, see `Remote._auto_batching_compute_plan`.
+
+        The batches are the same as the ones of `Remote`. They are sent one after the
+        other, as by default with `Remote`: a batch may depend on the previous ones and
+        concurrent updates of the same compute plan may conflict on the server. The
+        concurrency of the async client comes from the other requests sent at the same
+        time. The submission is not recorded in a journal and cannot be resumed.
+        """
+        spec_options = dict(spec_options or {})
+        spec_options[AUTO_BATCHING] = False
+        spec_options[BATCH_SIZE] = batch_size
+
+        batches = plan_batches(spec, {
+            'compute_plan_key': compute_plan_key,
+            'batch_size': batch_size,
+            'max_batch_bytes': max_batch_bytes,
+            'batch_by_rank': batch_by_rank,
+        })
+
+        id_to_keys = dict()
+        asset = None
+
+        if not compute_plan_key:
+            first_spec = next(batches, None)
+            tmp_spec = first_spec or spec  # Special case: no tuples
+            asset = await self.add(spec=tmp_spec, spec_options=dict(spec_options))
+            compute_plan_key = asset.key
+            id_to_keys = asset.id_to_key
+
+        for tmp_spec in batches:
+            asset = await self._update_compute_plan_ledger(
+                compute_plan_key, tmp_spec.dict(exclude_none=True),
+            )
+            id_to_keys.update(asset.id_to_key)
+
+        if asset is None:
+            return await self.get(
+                asset_type=schemas.Type.ComputePlan,
+                key=compute_plan_key,
+            )
+
+        asset.id_to_key = id_to_keys
+        return asset
+
+    async def _update_compute_plan_ledger(self, key, data):
+        asset = await self._client.request(
+            'post',
+            schemas.Type.ComputePlan.to_server(),
+            path=f"{key}/update_ledger/",
+            json=data,
+        )
+        return models.ComputePlan(**asset)
+
+    async def update_compute_plan(self, key, spec, spec_options=None):
+        spec_options = spec_options or {}
+        batch_size = spec_options.pop(BATCH_SIZE)
+        max_batch_bytes = spec_options.pop(MAX_BATCH_BYTES, None)
+        batch_by_rank = spec_options.pop(BATCH_BY_RANK, False)
+        if spec_options.pop(AUTO_BATCHING):
+            return await self._auto_batching_compute_plan(
+                spec=spec,
+                compute_plan_key=key,
+                batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                batch_by_rank=batch_by_rank,
+                spec_options=spec_options,
+            )
+        else:
+            return await self._update_compute_plan_ledger(key, spec.dict(exclude_none=True))
+
+    async def link_dataset_with_objective(self, dataset_key, objective_key):
+        """Returns the key of the dataset"""
+        asset = await self._client.request(
+            'post',
+            schemas.Type.Dataset.to_server(),
+            path=f"{dataset_key}/update_ledger/",
+            data={'objective_key': objective_key, },
+        )
+        return asset["key"]
+
+    async def link_dataset_with_data_samples(self, dataset_key, data_sample_keys):
+        """Returns the list of the data sample keys"""
+        data = {
+            'data_manager_keys': [dataset_key],
+            'data_sample_keys': data_sample_keys,
+        }
+        asset = await self._client.request(
+            'post',
+            schemas.Type.DataSample.to_server(),
+            path="bulk_update/",
+            data=data,
+        )
+        return json.loads(asset['key'])['keys']
+
+    async def _download(self, url, destination, checksum=None):
+        """Download the file to `<destination>.part`, verify it against its checksum, if
+        any, and rename it, as done by `download.Downloader`."""
+        part_path = f'{destination}.part'
+        await self._client.get_data(url, destination=part_path)
+        if checksum:
+            # the file is hashed in a thread so that the event loop is not blocked
+            loop = asyncio.get_running_loop()
+            actual_checksum = await loop.run_in_executor(None, fs.hash_file, part_path)
+            if actual_checksum != checksum:
+                os.remove(part_path)
+                raise exceptions.InvalidChecksum(
+                    f"Invalid checksum for {url}: expected {checksum}, got {actual_checksum}"
+                )
+        os.replace(part_path, destination)
+
+    async def download(self, asset_type, url_field_path, key, destination):
+        data = await self.get(asset_type, key)
+        url = _find_asset_field(data, url_field_path)
+        await self._download(url, destination, checksum=_find_checksum(data, url_field_path))
+        return destination
+
+    async def download_model(self, key, destination_file, checksum=None):
+        await self._download(
+            f'{self._client.base_url}/model/{key}/file/',
+            destination_file,
+            checksum=checksum,
+        )
+        return destination_file
+
+    async def describe(self, asset_type, key):
+        data = await self.get(asset_type, key)
+        url = data.description.storage_address
+        r = await self._client.get_data(url)
+        return r.text
+
+    async def node_info(self):
+        response = await self._client.get_data(f'{self._client.base_url}/info/')
+        return response.json()
+
+    async def leaderboard(self, objective_key, sort='desc'):
+        return await self._client.request(
+            'get',
+            schemas.Type.Objective.to_server(),
+            f'{objective_key}/leaderboard',
+            params={'sort': sort},
+        )
+
+    async def cancel_compute_plan(self, key):
+        asset = await self._client.request(
+            'post',
+            schemas.Type.ComputePlan.to_server(),
+            path=f"{key}/cancel",
+        )
+        return models.ComputePlan(**asset)
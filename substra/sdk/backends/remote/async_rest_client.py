@@ -0,0 +1,317 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import logging
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from substra.sdk import exceptions, utils, schemas
+from substra.sdk.backends.remote import rest_client
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 100
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _to_requests_response(response, content):
+    """Build a requests response from an aiohttp response so that the exceptions
+    and the response parsing are shared with the blocking client."""
+    r = requests.Response()
+    r.status_code = response.status
+    r.reason = response.reason
+    r.headers = CaseInsensitiveDict(response.headers)
+    r.url = str(response.url)
+    r.encoding = response.charset
+    r._content = content
+    return r
+
+
+class Client():
+    """Asynchronous REST Client to communicate with Substra server.
+
+    At most `max_concurrency` requests are sent at the same time, the other ones
+    wait for a free slot.
+    """
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    def __init__(self, url, insecure, token, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        if aiohttp is None:
+            raise exceptions.SDKException(
+                "aiohttp is required to use the async client: pip install substra[async]"
+            )
+        self._insecure = insecure
+        self._headers = {
+            'Authorization': f"Token {token}",
+            'Accept': 'application/json;version=0.0',
+        }
+        if not url:
+            raise exceptions.SDKException("url required to connect to the Substra server")
+        self._base_url = url[:-1] if url.endswith('/') else url
+        self._max_concurrency = max_concurrency
+        # the session and the semaphore must be created from a running event loop
+        self._session = None
+        self._semaphore = None
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self._max_concurrency,
+                ssl=False if self._insecure else None,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the connections of the pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+
+    async def login(self, username, password):
+        if 'Accept' not in self._headers:
+            raise exceptions.SDKException("Cannot login: missing headers")
+
+        headers = {
+            'Accept': self._headers['Accept'],
+        }
+        data = {
+            'username': username,
+            'password': password,
+        }
+
+        try:
+            r = await self.__request('post', f'{self._base_url}/api-token-auth/',
+                                     headers=headers, data=data)
+        except (exceptions.InvalidRequest, exceptions.AuthenticationError) as e:
+            raise exceptions.BadLoginException(e.msg, e.status_code)
+
+        token = r.json()['token']
+
+        self._headers['Authorization'] = f"Token {token}"
+
+        return token
+
+    @staticmethod
+    def _flatten_data(data):
+        # list values are sent as repeated fields, as done by requests
+        fields = []
+        for k, v in data.items():
+            if isinstance(v, (list, tuple)):
+                fields.extend((k, item) for item in v)
+            else:
+                fields.append((k, v))
+        return fields
+
+    def _build_form(self, data, files):
+        form = aiohttp.FormData(self._flatten_data(data or {}))
+        for k, f in files.items():
+            # rewind files so that they are properly sent in retries as well
+            f.seek(0)
+            form.add_field(k, f, filename=k)
+        return form
+
+    async def __request(self, request_name, url, headers=None, destination=None,
+                        **request_kwargs):
+        """Base request helper.
+
+        If destination is set, the response content is streamed to this file.
+        """
+        if request_name not in ('get', 'post'):
+            raise NotImplementedError
+
+        files = request_kwargs.pop('files', None)
+        if files:
+            request_kwargs['data'] = self._build_form(request_kwargs.get('data'), files)
+        elif isinstance(request_kwargs.get('data'), dict):
+            request_kwargs['data'] = self._flatten_data(request_kwargs['data'])
+
+        params = request_kwargs.pop('params', None)
+        if isinstance(params, str):
+            # the filters are already escaped, they must be sent as they are
+            url = yarl.URL(f'{url}?{params}', encoded=True)
+        elif params:
+            request_kwargs['params'] = params
+
+        session = self._get_session()
+        try:
+            async with self._semaphore:
+                async with session.request(
+                    request_name,
+                    url,
+                    headers=headers or self._headers,
+                    **request_kwargs,
+                ) as response:
+                    if response.status < 400 and destination is not None:
+                        with open(destination, 'wb') as f:
+                            async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+                                f.write(chunk)
+                        content = b''
+                    else:
+                        content = await response.read()
+
+        except aiohttp.ClientConnectionError as e:
+            raise exceptions.ConnectionError(str(e), None)
+
+        except asyncio.TimeoutError as e:
+            raise exceptions.Timeout(str(e), None)
+
+        r = _to_requests_response(response, content)
+        try:
+            r.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise rest_client.http_error_to_exception(e)
+
+        return r
+
+    @utils.async_retry_on_exception(exceptions=(exceptions.GatewayUnavailable))
+    async def _request(self, request_name, url, **request_kwargs):
+        """Wrapper to __request to emit a log for each HTTP request."""
+        ts = time.time()
+        error = None
+        try:
+            return await self.__request(request_name, url, **request_kwargs)
+        except Exception as e:
+            error = e.__class__.__name__
+            raise
+        finally:
+            te = time.time()
+            elaps = (te - ts) * 1000
+            logger.debug(f'{request_name} {url}: done in {elaps:.2f}ms error={error}')
+
+    async def request(self, request_name, asset_name, path=None, json_response=True,
+                      **request_kwargs):
+        """Base request."""
+
+        path = path or ''
+        url = f"{self._base_url}/{asset_name}/{path}"
+        if not url.endswith("/"):
+            url = url + "/"  # server requires a suffix /
+
+        response = await self._request(
+            request_name,
+            url,
+            **request_kwargs,
+        )
+
+        if not json_response:
+            return response
+
+        try:
+            return response.json()
+        except ValueError as e:
+            msg = f"Cannot parse response to JSON: {e}"
+            raise exceptions.InvalidResponse(response, msg)
+
+    async def get(self, name, key):
+        """Get asset by key."""
+        return await self.request(
+            'get',
+            name,
+            path=f"{key}",
+        )
+
+    async def list(self, name, filters=None):
+        """List assets by filters.
+
+        If the server paginates the results, all the pages are fetched.
+        """
+        request_kwargs = {}
+        if filters:
+            request_kwargs['params'] = utils.parse_filters(filters)
+
+        items = await self.request(
+            'get',
+            name,
+            **request_kwargs,
+        )
+        if not rest_client.Client._is_page(items):
+            return items
+
+        page = items
+        items = list(page['results'])
+        while page.get('next'):
+            page = rest_client.Client._parse_json(await self._request('get', page['next']))
+            items.extend(page['results'])
+        return items
+
+    async def _add(self, name, **request_kwargs):
+        """ Add asset wrapper.
+
+        Handles conflict error when created asset already exists.
+        """
+        try:
+            return await self.request('post', name, **request_kwargs)
+
+        except exceptions.AlreadyExists as e:
+            key = e.key
+            is_many = isinstance(key, list)
+            if is_many:
+                logger.warning("AlreadyExists exception was received for a list of keys. "
+                               "Unable to determine which key(s) already exist.")
+                raise
+
+            logger.warning(f"{name} already exists: key='{key}'")
+            if name == schemas.Type.ComputePlan:
+                # We only need to retrieve the full asset in the case of a Compute Plan.
+                return await self.get(name, key)
+            else:
+                return {'key': key}
+
+    async def add(self, name, retry_timeout=False, **request_kwargs):
+        """Add asset.
+
+        In case of timeout, block till resource is created.
+        """
+        try:
+            return await self._add(name, **request_kwargs)
+
+        except exceptions.RequestTimeout as e:
+            key = e.key
+            is_many = isinstance(key, list)  # timeout on many objects is not handled
+            if not retry_timeout or is_many:
+                raise e
+
+            logger.warning(
+                f'Request timeout, blocking till {name} is created: key={key}')
+            retry = utils.async_retry_on_exception(
+                exceptions=(exceptions.RequestTimeout),
+                timeout=float(retry_timeout),
+            )
+            return await retry(self._add)(name, **request_kwargs)
+
+    async def get_data(self, address, destination=None, **request_kwargs):
+        """Get asset data.
+
+        If destination is set, the data is streamed to this file.
+        """
+        return await self._request(
+            'get',
+            address,
+            destination=destination,
+            **request_kwargs,
+        )
@@ -18,13 +18,16 @@ import json
 
 from substra.sdk import exceptions, schemas, compute_plan, models
 from substra.sdk.backends import base
-from substra.sdk.backends.remote import rest_client
+from substra.sdk.backends.remote import journal, rest_client, response_cache, submission
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_RETRY_TIMEOUT = 5 * 60
 AUTO_BATCHING = "auto_batching"
 BATCH_SIZE = 'batch_size'
+MAX_BATCH_BYTES = 'max_batch_bytes'
+BATCH_BY_RANK = 'batch_by_rank'
+JOURNAL = 'journal'
 
 
 def _find_asset_field(data, field):
@@ -34,24 +37,85 @@ def _find_asset_field(data, field):
     return data
 
 
+def _find_checksum(data, url_field_path):
+    """Find the checksum of the file whose address is at `url_field_path`, it is stored
+    next to the address. Returns None if the asset has no checksum for this file."""
+    parent_path, _, _ = url_field_path.rpartition('.')
+    parent = _find_asset_field(data, parent_path) if parent_path else data
+    return getattr(parent, 'checksum', None)
+
+
+def plan_batches(spec, header):
+    """Batches of a compute plan submission, computed from the batching options of
+    the header so that the same batches are computed when the submission is resumed.
+    Shared by the synchronous and asynchronous backends."""
+    return compute_plan.auto_batching(
+        spec,
+        is_creation=header['compute_plan_key'] is None,
+        batch_size=header['batch_size'],
+        max_batch_bytes=header['max_batch_bytes'],
+        batch_by_rank=header['batch_by_rank'],
+    )
+
+
 class Remote(base.BaseBackend):
 
-    def __init__(self, url, insecure, token, retry_timeout):
-        self._client = rest_client.Client(url, insecure, token)
+    def __init__(self, url, insecure, token, retry_timeout,
+                 pool_size=rest_client.DEFAULT_POOL_SIZE, keep_alive=True,
+                 response_cache_dir=None,
+                 response_cache_max_size=response_cache.DEFAULT_MAX_SIZE,
+                 max_batches_in_flight=submission.DEFAULT_MAX_IN_FLIGHT,
+                 validate_responses=True, lazy_models=False):
+        cache = None
+        if response_cache_dir:
+            cache = response_cache.ResponseCache(
+                response_cache_dir, max_size=response_cache_max_size,
+            )
+        self._client = rest_client.Client(
+            url, insecure, token, pool_size=pool_size, keep_alive=keep_alive, cache=cache,
+        )
         self._retry_timeout = retry_timeout or DEFAULT_RETRY_TIMEOUT
+        self._max_batches_in_flight = max_batches_in_flight
+        # the responses of a trusted platform may be used without being validated
+        self._validate_responses = validate_responses
+        # the large fields of the assets are only built when they are read
+        self._lazy_models = lazy_models
+
+    @property
+    def response_cache(self):
+        """The response_cache.ResponseCache of the client, None if there is none."""
+        return self._client.cache
 
     def login(self, username, password):
         return self._client.login(username, password)
 
+    def _to_model(self, asset_type, asset):
+        model = models.SCHEMA_TO_MODEL[asset_type]
+        if self._lazy_models:
+            return models.build_lazy(model, asset, validate=self._validate_responses)
+        if self._validate_responses:
+            return model(**asset)
+        return models.construct(model, asset)
+
     def get(self, asset_type, key):
         """Get an asset by key."""
         asset = self._client.get(asset_type.to_server(), key)
-        return models.SCHEMA_TO_MODEL[asset_type](**asset)
+        return self._to_model(asset_type, asset)
 
-    def list(self, asset_type, filters=None):
-        """List assets per asset type."""
+    def list(self, asset_type, filters=None, stream=False):
+        """List assets per asset type.
+
+        If stream is True, returns an iterator which parses the assets as they are
+        received.
+        """
+        if stream:
+            return self._iter_list(asset_type, filters)
         assets = self._client.list(asset_type.to_server(), filters)
-        return [models.SCHEMA_TO_MODEL[asset_type](**asset) for asset in assets]
+        return [self._to_model(asset_type, asset) for asset in assets]
+
+    def _iter_list(self, asset_type, filters=None):
+        for asset in self._client.iter_list(asset_type.to_server(), filters):
+            yield self._to_model(asset_type, asset)
 
     def _add(self, asset, data, files=None):
         data = deepcopy(data)  # make a deep copy for avoiding modification by reference
@@ -101,8 +165,11 @@ class Remote(base.BaseBackend):
         """Add an asset."""
         spec_options = spec_options or {}
         asset_type = spec.__class__.type_
-        # Remove batch_size from spec_options
+        # Remove the batching options from spec_options
         batch_size = spec_options.pop(BATCH_SIZE, None)
+        max_batch_bytes = spec_options.pop(MAX_BATCH_BYTES, None)
+        batch_by_rank = spec_options.pop(BATCH_BY_RANK, False)
+        journal_path = spec_options.pop(JOURNAL, None)
 
         if asset_type == schemas.Type.DataSample:
             # data sample corner case
@@ -118,6 +185,9 @@ class Remote(base.BaseBackend):
             return self._auto_batching_compute_plan(
                 spec=spec,
                 batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                batch_by_rank=batch_by_rank,
+                journal_path=journal_path,
                 spec_options=spec_options,
             )
 
@@ -134,71 +204,112 @@ class Remote(base.BaseBackend):
                                     spec,
                                     batch_size,
                                     compute_plan_key=None,
-                                    spec_options=None):
+                                    spec_options=None,
+                                    max_batch_bytes=None,
+                                    batch_by_rank=False,
+                                    journal_path=None):
         """Auto batching of the compute plan tuples
 
-        It computes the batches then, for each batch, it calls the 'add' and
-        'update_compute_plan' methods with auto_batching=False.
+        It computes the batches then submits them: the first one with the 'add' method
+        if the compute plan does not exist, the next ones to the 'update_ledger' route.
+        The batches are serialized and sent in a pipeline, see `submission.BatchSubmitter`.
+
+        If journal_path is set, the acknowledged batches are recorded in a journal so that
+        the submission can be resumed, see `resume_compute_plan`.
         """
-        spec_options = spec_options or dict()
+        header = {
+            'compute_plan_key': compute_plan_key,
+            'batch_size': batch_size,
+            'max_batch_bytes': max_batch_bytes,
+            'batch_by_rank': batch_by_rank,
+        }
+        submission_journal = None
+        if journal_path:
+            header['checksum'] = journal.spec_checksum(spec)
+            submission_journal = journal.Journal.create(journal_path, header)
+        return self._submit_compute_plan(spec, header, spec_options, submission_journal)
+
+    def resume_compute_plan(self, spec, journal_path):
+        """Resume the submission of a compute plan recorded in a journal: the batches
+        which have been acknowledged by the server are skipped."""
+        submission_journal = journal.Journal.load(journal_path)
+        submission_journal.check(spec)
+        logger.info(
+            f'Resuming the submission of the compute plan, '
+            f'{len(submission_journal.batches)} batch(es) already submitted'
+        )
+        return self._submit_compute_plan(
+            spec, submission_journal.header, None, submission_journal,
+        )
+
+    def _submit_compute_plan(self, spec, header, spec_options, submission_journal):
+        spec_options = dict(spec_options or {})
         spec_options[AUTO_BATCHING] = False
-        spec_options[BATCH_SIZE] = batch_size
+        spec_options[BATCH_SIZE] = header['batch_size']
 
-        batches = compute_plan.auto_batching(
-            spec,
-            is_creation=compute_plan_key is None,
-            batch_size=batch_size,
-        )
+        batches = plan_batches(spec, header)
 
-        id_to_keys = dict()
-        asset = None
+        compute_plan_key = header['compute_plan_key']
+        submitted = dict()
+        if submission_journal:
+            compute_plan_key = submission_journal.compute_plan_key
+            submitted = submission_journal.batches
 
-        # Create the compute plan if it does not exist
-        if not compute_plan_key:
-            first_spec = next(batches, None)
-            tmp_spec = first_spec or spec  # Special case: no tuples
-            asset = self.add(spec=tmp_spec, spec_options=deepcopy(spec_options))
-            compute_plan_key = asset.key
-            id_to_keys = asset.id_to_key
+        def create(batch):
+            return self.add(spec=batch, spec_options=dict(spec_options))
 
-        # Update the compute plan
-        for tmp_spec in batches:
-            asset = self.update_compute_plan(
-                key=compute_plan_key,
-                spec=tmp_spec,
-                spec_options=deepcopy(spec_options)
-            )
-            id_to_keys.update(asset.id_to_key)
+        submitter = submission.BatchSubmitter(
+            create, self._update_compute_plan_ledger, max_in_flight=self._max_batches_in_flight,
+        )
+        asset = submitter.submit(
+            batches,
+            compute_plan_key=compute_plan_key,
+            skip=set(submitted),
+            id_to_key=submission_journal.id_to_key if submission_journal else None,
+            on_success=submission_journal.record if submission_journal else None,
+        )
 
-        # Special case: no tuples
+        # Special case: no tuples or all the batches were already submitted
         if asset is None:
-            return self.get(
+            if not compute_plan_key:
+                return self.add(spec=spec, spec_options=dict(spec_options))
+            asset = self.get(
                 asset_type=schemas.Type.ComputePlan,
                 key=compute_plan_key,
             )
+            if submitted:
+                asset.id_to_key = submission_journal.id_to_key
 
-        asset.id_to_key = id_to_keys
         return asset
 
+    def _update_compute_plan_ledger(self, key, data):
+        asset = self._client.request(
+            'post',
+            schemas.Type.ComputePlan.to_server(),
+            path=f"{key}/update_ledger/",
+            json=data,
+        )
+        return models.ComputePlan(**asset)
+
     def update_compute_plan(self, key, spec, spec_options=None):
         spec_options = spec_options or {}
         batch_size = spec_options.pop(BATCH_SIZE)
+        max_batch_bytes = spec_options.pop(MAX_BATCH_BYTES, None)
+        batch_by_rank = spec_options.pop(BATCH_BY_RANK, False)
+        journal_path = spec_options.pop(JOURNAL, None)
         if spec_options.pop(AUTO_BATCHING):
             return self._auto_batching_compute_plan(
                 spec=spec,
                 compute_plan_key=key,
                 batch_size=batch_size,
+                max_batch_bytes=max_batch_bytes,
+                batch_by_rank=batch_by_rank,
+                journal_path=journal_path,
                 spec_options=spec_options,
             )
         else:
             # Disable auto batching
-            asset = self._client.request(
-                'post',
-                schemas.Type.ComputePlan.to_server(),
-                path=f"{key}/update_ledger/",
-                json=spec.dict(exclude_none=True),
-            )
-            return models.ComputePlan(**asset)
+            return self._update_compute_plan_ledger(key, spec.dict(exclude_none=True))
 
     def link_dataset_with_objective(self, dataset_key, objective_key):
         """Returns the key of the dataset"""
@@ -227,26 +338,23 @@ class Remote(base.BaseBackend):
     def download(self, asset_type, url_field_path, key, destination):
         data = self.get(asset_type, key)
         url = _find_asset_field(data, url_field_path)
-        response = self._client.get_data(url, stream=True)
-        chunk_size = 1024
-        with open(destination, 'wb') as f:
-            for chunk in response.iter_content(chunk_size):
-                f.write(chunk)
-
+        self._client.download(
+            url, destination, checksum=_find_checksum(data, url_field_path),
+        )
         return destination
 
-    def download_model(self, key, destination_file):
-        response = self._client.get_data(f'{self._client.base_url}/model/{key}/file/', stream=True)
-        chunk_size = 1024
-        with open(destination_file, 'wb') as f:
-            for chunk in response.iter_content(chunk_size):
-                f.write(chunk)
+    def download_model(self, key, destination_file, checksum=None):
+        self._client.download(
+            f'{self._client.base_url}/model/{key}/file/',
+            destination_file,
+            checksum=checksum,
+        )
         return destination_file
 
     def describe(self, asset_type, key):
         data = self.get(asset_type, key)
         url = data.description.storage_address
-        r = self._client.get_data(url)
+        r = self._client.get_data(url, checksum=data.description.checksum)
         return r.text
 
     def node_info(self):
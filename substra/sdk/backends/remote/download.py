@@ -0,0 +1,305 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Download of large files.
+
+The file is first written to `<destination>.part`, and the state of the download to
+`<destination>.part.json`: the URL, the validator of the file (its ETag or its
+modification date) and its size. If the download is interrupted, the next download of
+the same URL to the same destination resumes from the partial file:
+
+- a file downloaded in a single request is resumed with a Range request starting at
+  the size of the partial file,
+- a file downloaded with parallel Range requests is resumed from the progress of each
+  range, saved in the state.
+
+The Range requests are sent with an If-Range header, the partial file is removed and
+the download restarted if the file has changed on the server. The partial files of
+another URL are removed.
+
+Once complete, the file is verified against its checksum, if any, and renamed.
+"""
+import concurrent.futures
+import contextlib
+import json
+import logging
+import os
+import pathlib
+import re
+import threading
+
+import requests
+
+from substra.sdk import exceptions, fs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+# files smaller than twice this size are downloaded in a single request
+DEFAULT_RANGE_SIZE = 32 * 1024 * 1024
+_MAX_ATTEMPTS = 3
+
+# errors raised while reading the body of a response
+_STREAM_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    exceptions.ConnectionError,
+)
+
+
+class _StaleDownload(exceptions.SDKException):
+    """The file has changed on the server since the partial download."""
+    pass
+
+
+def _part_paths(destination):
+    destination = pathlib.Path(destination)
+    return (
+        destination.with_name(destination.name + '.part'),
+        destination.with_name(destination.name + '.part.json'),
+    )
+
+
+def _remove(*paths):
+    for path in paths:
+        if path.exists():
+            path.unlink()
+
+
+def _save_state(state_path, content):
+    tmp_path = state_path.with_name(state_path.name + '.tmp')
+    tmp_path.write_text(content)
+    os.replace(tmp_path, state_path)
+
+
+def _load_state(url, part_path, state_path):
+    """State of the partial download of the URL, None if there is none.
+
+    The partial files which do not belong to a download of the URL are removed.
+    """
+    state = None
+    if state_path.exists():
+        try:
+            with open(state_path) as f:
+                state = json.load(f)
+        except ValueError:
+            state = None
+    if isinstance(state, dict) and state.get('url') == url and part_path.exists():
+        return state
+    if part_path.exists():
+        logger.info(f'Removing the partial file {part_path} of another download')
+    _remove(part_path, state_path)
+    return None
+
+
+def _validator(response):
+    """Value of the If-Range header identifying the file, None if there is none."""
+    etag = response.headers.get('ETag')
+    # a weak ETag cannot be used in an If-Range header
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def _total_size(response, offset):
+    """Size of the whole file, None if unknown."""
+    content_range = response.headers.get('Content-Range')
+    if content_range:
+        match = re.match(r'bytes \d+-\d+/(\d+)', content_range)
+        if match:
+            return int(match.group(1))
+    content_length = response.headers.get('Content-Length')
+    if content_length:
+        return offset + int(content_length)
+    return None
+
+
+def _accept_ranges(response):
+    return response.status_code == 206 or response.headers.get('Accept-Ranges') == 'bytes'
+
+
+class Downloader:
+    """Download a file with large chunks, parallel Range requests and resumption.
+
+    Args:
+        get (callable): sends a streamed GET request, takes the URL and the request
+            headers as arguments and returns the response
+        chunk_size (int): size of the chunks read from the responses
+        max_workers (int): maximum number of parallel Range requests
+        range_size (int): minimum size of a Range request
+    """
+
+    def __init__(self, get, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                 range_size=DEFAULT_RANGE_SIZE):
+        self._get = get
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._range_size = range_size
+
+    def download(self, url, destination, checksum=None):
+        part_path, state_path = _part_paths(destination)
+        state = _load_state(url, part_path, state_path)
+
+        try:
+            if state and state.get('ranges'):
+                logger.info(f'Resuming the download of {url} to {destination}')
+                self._download_ranges(url, part_path, state_path, state)
+            else:
+                self._download_single(url, part_path, state_path, state)
+        except _StaleDownload as e:
+            logger.warning(f'Restarting the download of {url}: {e}')
+            _remove(part_path, state_path)
+            self._download_single(url, part_path, state_path, None)
+
+        if checksum:
+            actual_checksum = fs.hash_file(part_path)
+            if actual_checksum != checksum:
+                part_path.unlink()
+                raise exceptions.InvalidChecksum(
+                    f"Invalid checksum for {url}: expected {checksum}, got {actual_checksum}"
+                )
+
+        os.replace(part_path, destination)
+        return destination
+
+    def _download_single(self, url, part_path, state_path, state):
+        """Download the file in a single request, unless it is large enough to be split
+        into parallel Range requests."""
+        attempt = 1
+        while True:
+            offset = part_path.stat().st_size if state and part_path.exists() else 0
+            size = state.get('size') if state else None
+            if offset and size is not None and offset >= size:
+                if offset == size:
+                    # the partial file is already complete
+                    _remove(state_path)
+                    return
+                offset = 0
+
+            headers = dict()
+            if offset:
+                headers['Range'] = f'bytes={offset}-'
+                if state.get('validator'):
+                    headers['If-Range'] = state['validator']
+            try:
+                response = self._get(url, headers)
+            except exceptions.HTTPError as e:
+                if offset and e.status_code == 416:
+                    # the partial file is longer than the file on the server
+                    logger.warning(f'Restarting the download of {url}: the file has changed')
+                    _remove(part_path, state_path)
+                    state = None
+                    continue
+                raise
+
+            with contextlib.closing(response):
+                if offset and response.status_code == 206 and size is not None and \
+                        _total_size(response, offset) != size:
+                    logger.warning(f'Restarting the download of {url}: the file has changed')
+                    _remove(part_path, state_path)
+                    state = None
+                    continue
+                if offset and response.status_code != 206:
+                    # the server ignored the Range header or the file has changed,
+                    # restart from the beginning
+                    offset = 0
+
+                if not offset:
+                    size = _total_size(response, offset)
+                    state = {'url': url, 'validator': _validator(response), 'size': size}
+                    if (size and self._max_workers > 1
+                            and size >= 2 * self._range_size and _accept_ranges(response)):
+                        break
+                    _save_state(state_path, json.dumps(state))
+
+                try:
+                    self._write(response, part_path, 'ab' if offset else 'wb')
+                except _STREAM_ERRORS as e:
+                    if attempt == _MAX_ATTEMPTS:
+                        raise
+                    attempt += 1
+                    logger.warning(f'Download of {url} interrupted, resuming: {e}')
+                    continue
+                _remove(state_path)
+                return
+
+        # the response has been closed, the file is downloaded with Range requests
+        n_ranges = max(2, size // self._range_size)
+        bounds = [size * i // n_ranges for i in range(n_ranges + 1)]
+        # [start, end (inclusive), number of bytes written]
+        state['ranges'] = [[bounds[i], bounds[i + 1] - 1, 0] for i in range(n_ranges)]
+        with open(part_path, 'wb') as f:
+            f.truncate(size)
+        self._download_ranges(url, part_path, state_path, state)
+
+    def _write(self, response, path, mode):
+        with open(path, mode) as f:
+            for chunk in response.iter_content(self._chunk_size):
+                f.write(chunk)
+
+    def _download_ranges(self, url, part_path, state_path, state):
+        lock = threading.Lock()
+
+        def save_state():
+            with lock:
+                content = json.dumps(state)
+            _save_state(state_path, content)
+
+        def download_range(range_):
+            start, end, _ = range_
+
+            for attempt in range(1, _MAX_ATTEMPTS + 1):
+                position = start + range_[2]
+                if position > end:
+                    return
+                headers = {'Range': f'bytes={position}-{end}'}
+                if state.get('validator'):
+                    headers['If-Range'] = state['validator']
+                try:
+                    response = self._get(url, headers)
+                except exceptions.HTTPError as e:
+                    if e.status_code == 416:
+                        raise _StaleDownload(f'the size of {url} has changed')
+                    raise
+                with contextlib.closing(response):
+                    if response.status_code != 206:
+                        if state.get('validator'):
+                            raise _StaleDownload(f'{url} has changed')
+                        raise exceptions.InvalidResponse(
+                            response, f"Range requests are not supported for {url}")
+                    if response.headers.get('Content-Range') and \
+                            _total_size(response, position) != state['size']:
+                        raise _StaleDownload(f'the size of {url} has changed')
+                    try:
+                        with open(part_path, 'r+b') as f:
+                            f.seek(position)
+                            for chunk in response.iter_content(self._chunk_size):
+                                f.write(chunk)
+                                with lock:
+                                    range_[2] += len(chunk)
+                        return
+                    except _STREAM_ERRORS as e:
+                        if attempt == _MAX_ATTEMPTS:
+                            raise
+                        logger.warning(f'Download of {url} interrupted, resuming: {e}')
+
+        save_state()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as e:
+                # raise the first error, if any
+                list(e.map(download_range, state['ranges']))
+        finally:
+            # keep the progress to resume the download later
+            save_state()
+        state_path.unlink()
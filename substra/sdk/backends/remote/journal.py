@@ -0,0 +1,128 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Journal of the submission of a compute plan.
+
+The journal is a JSON lines file. The first line describes the submission: the
+checksum of the spec and the batching options, so that the same batches are computed
+when the submission is resumed. Each following line records a batch acknowledged by
+the server, with the compute plan key and the id_to_key mapping it returned.
+"""
+import hashlib
+import json
+import os
+import pathlib
+
+from substra.sdk import exceptions
+
+JOURNAL_VERSION = 1
+
+
+def spec_checksum(spec):
+    content = spec.json(exclude_none=True, sort_keys=True)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class Journal:
+    """Append-only record of the batches of a compute plan acknowledged by the server."""
+
+    def __init__(self, path, header, batches=None):
+        self.path = pathlib.Path(path)
+        self.header = header
+        # {batch index: record}
+        self.batches = batches or dict()
+
+    @classmethod
+    def create(cls, path, header):
+        """Start the journal of a new submission."""
+        path = pathlib.Path(path)
+        if path.exists() and path.stat().st_size > 0:
+            raise exceptions.InvalidJournal(
+                f"The journal {path} already exists, resume the submission or remove it."
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {'version': JOURNAL_VERSION, **header}
+        journal = cls(path, header)
+        with open(path, 'w') as f:
+            journal._write(f, header)
+        return journal
+
+    @classmethod
+    def load(cls, path):
+        path = pathlib.Path(path)
+        with open(path) as f:
+            content = f.read()
+        lines = content.splitlines()
+        if not lines:
+            raise exceptions.InvalidJournal(f"The journal {path} is empty.")
+        header = json.loads(lines[0])
+        if header.get('version') != JOURNAL_VERSION:
+            raise exceptions.InvalidJournal(
+                f"Unsupported journal version: {header.get('version')}"
+            )
+
+        batches = dict()
+        n_lines = 1
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # the last line may be truncated if the process was killed while writing
+                break
+            batches[record['batch']] = record
+            n_lines += 1
+
+        if n_lines < len(lines) or not content.endswith('\n'):
+            # remove the truncated line so that the next records can be appended
+            with open(path, 'w') as f:
+                f.write('\n'.join(lines[:n_lines]) + '\n')
+        return cls(path, header, batches)
+
+    def check(self, spec):
+        """Check that the journal was written for the same spec."""
+        if self.header['checksum'] != spec_checksum(spec):
+            raise exceptions.InvalidJournal(
+                f"The journal {self.path} does not match the compute plan."
+            )
+
+    @property
+    def compute_plan_key(self):
+        if self.header.get('compute_plan_key'):
+            return self.header['compute_plan_key']
+        for record in self.batches.values():
+            return record['compute_plan_key']
+        return None
+
+    @property
+    def id_to_key(self):
+        id_to_key = dict()
+        for index in sorted(self.batches):
+            id_to_key.update(self.batches[index]['id_to_key'])
+        return id_to_key
+
+    def record(self, index, asset):
+        """Record a batch acknowledged by the server, the record is flushed to disk."""
+        record = {
+            'batch': index,
+            'compute_plan_key': asset.key,
+            'id_to_key': asset.id_to_key,
+        }
+        with open(self.path, 'a') as f:
+            self._write(f, record)
+        self.batches[index] = record
+
+    @staticmethod
+    def _write(f, record):
+        f.write(json.dumps(record) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
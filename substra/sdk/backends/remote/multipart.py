@@ -0,0 +1,115 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import binascii
+import io
+import os
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _iter_fields(data):
+    """Iterate over the form fields, list values are sent as repeated fields."""
+    for name, value in (data or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for v in values:
+            if v is None:
+                continue
+            if not isinstance(v, bytes):
+                v = str(v).encode('utf-8')
+            yield name, v
+
+
+def _filename(name, f):
+    """Name of the file as guessed by requests."""
+    filename = getattr(f, 'name', None)
+    if isinstance(filename, str) and not (filename.startswith('<') and filename.endswith('>')):
+        return os.path.basename(filename)
+    return name
+
+
+def _file_size(f):
+    position = f.tell()
+    size = f.seek(0, io.SEEK_END)
+    f.seek(position)
+    return size - position
+
+
+class MultipartEncoder:
+    """Multipart form-data request body which streams the files.
+
+    The body is identical to the one built by requests from the same data and files
+    but the files are read chunk by chunk while the request is sent instead of being
+    loaded in memory. The files must be positioned at the beginning of their content.
+    """
+
+    def __init__(self, data, files):
+        self.boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+
+        # the parts are either bytes or file objects
+        self._parts = []
+        for name, value in _iter_fields(data):
+            self._parts.append(self._header(name) + value + b'\r\n')
+        for name, f in files.items():
+            self._parts.append(self._header(name, _filename(name, f)))
+            self._parts.append(f)
+            self._parts.append(b'\r\n')
+        self._parts.append(f'--{self.boundary}--\r\n'.encode('ascii'))
+
+        self._length = sum(
+            len(part) if isinstance(part, bytes) else _file_size(part)
+            for part in self._parts
+        )
+        self._index = 0
+        self._offset = 0
+
+    def _header(self, name, filename=None):
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        return (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: {disposition}\r\n\r\n'
+        ).encode('utf-8')
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+        chunks = []
+        while size > 0 and self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                chunk = part[self._offset:self._offset + size]
+                self._offset += len(chunk)
+                if self._offset >= len(part):
+                    self._index += 1
+                    self._offset = 0
+            else:
+                chunk = part.read(size)
+                if not chunk:
+                    self._index += 1
+                    continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
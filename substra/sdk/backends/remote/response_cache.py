@@ -0,0 +1,212 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 100 * 1024 * 1024
+
+_META_SUFFIX = '.json'
+_BODY_SUFFIX = '.body'
+
+
+class _Entry:
+    def __init__(self, meta, body):
+        self.meta = meta
+        self.body = body
+
+    def conditional_headers(self):
+        """Headers to revalidate the entry with the server."""
+        headers = {}
+        if self.meta.get('etag'):
+            headers['If-None-Match'] = self.meta['etag']
+        if self.meta.get('last_modified'):
+            headers['If-Modified-Since'] = self.meta['last_modified']
+        return headers
+
+    def to_response(self):
+        r = requests.Response()
+        r.status_code = 200
+        r.url = self.meta['url']
+        r.encoding = self.meta.get('encoding')
+        r.headers = CaseInsensitiveDict(self.meta.get('headers') or {})
+        r._content = self.body
+        return r
+
+
+class ResponseCache:
+    """On-disk cache of the responses of GET requests.
+
+    Immutable responses are served from the cache without any request to the server,
+    the other ones are revalidated with the ETag and Last-Modified headers, they are
+    only cached if the server provides one of them.
+
+    When the size of the cache exceeds max_size (in bytes), the least recently
+    used entries are removed.
+
+    The REST client prefixes the keys with a digest of the token, so that a directory
+    shared between users does not serve the responses of one user to another.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self._directory = pathlib.Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._size = sum(path.stat().st_size for path in self._directory.iterdir())
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def size(self):
+        """Size of the cache in bytes."""
+        return self._size
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': self._size,
+        }
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _paths(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return (
+            self._directory / (digest + _META_SUFFIX),
+            self._directory / (digest + _BODY_SUFFIX),
+        )
+
+    def _read(self, key):
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            body = body_path.read_bytes()
+            if meta.get('key') != key:
+                return None
+            # mark the entry as recently used
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            # the entry may be removed at any time by another thread or process
+            return None
+        return _Entry(meta, body)
+
+    def _write_file(self, path, content):
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        # an existing entry is replaced atomically
+        os.replace(tmp_path, path)
+
+    def _write(self, key, response):
+        meta = {
+            'key': key,
+            'url': response.url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding,
+            'headers': dict(response.headers),
+        }
+        meta_content = json.dumps(meta).encode('utf-8')
+        body = response.content
+        meta_path, body_path = self._paths(key)
+
+        with self._lock:
+            self._size -= sum(p.stat().st_size for p in (meta_path, body_path) if p.exists())
+            # the body is written first so that an entry is never read without its body
+            self._write_file(body_path, body)
+            self._write_file(meta_path, meta_content)
+            self._size += len(body) + len(meta_content)
+            if self._size > self._max_size:
+                self._evict()
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_size."""
+        entries = []
+        for meta_path in self._directory.glob('*' + _META_SUFFIX):
+            try:
+                entries.append((meta_path.stat().st_mtime, meta_path))
+            except FileNotFoundError:
+                # removed by another thread or process
+                continue
+        for _, meta_path in sorted(entries):
+            if self._size <= self._max_size:
+                break
+            body_path = meta_path.with_suffix(_BODY_SUFFIX)
+            for path in (meta_path, body_path):
+                try:
+                    size = path.stat().st_size
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                self._size -= size
+            logger.debug(f'Response cache: evicted {meta_path.stem}')
+
+    def clear(self):
+        with self._lock:
+            for path in self._directory.iterdir():
+                path.unlink()
+            self._size = 0
+
+    def fetch(self, key, send, immutable=False):
+        """Get a response from the cache or from the server.
+
+        Args:
+            key (str): key of the cached response
+            send (callable): sends the request, takes the conditional headers
+                as argument and returns the response
+            immutable (bool): if True, a cached response is returned without
+                revalidation
+
+        Returns:
+            requests.Response: the response
+        """
+        entry = self._read(key)
+        if entry is not None and immutable:
+            self._count(hit=True)
+            logger.debug(f'Response cache hit: {key}')
+            return entry.to_response()
+
+        headers = entry.conditional_headers() if entry is not None else {}
+        response = send(headers)
+
+        if entry is not None and response.status_code == 304:
+            self._count(hit=True)
+            logger.debug(f'Response cache hit (revalidated): {key}')
+            return entry.to_response()
+
+        self._count(hit=False)
+        if immutable or 'ETag' in response.headers or 'Last-Modified' in response.headers:
+            self._write(key, response)
+        return response
@@ -11,15 +11,64 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextlib
+import hashlib
+import itertools
+import json
 import logging
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from substra.sdk import exceptions, utils, schemas
+from substra.sdk.backends.remote import download, multipart
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+_HTTP_ERRORS = {
+    400: exceptions.InvalidRequest,
+    401: exceptions.AuthenticationError,
+    403: exceptions.AuthorizationError,
+    404: exceptions.NotFound,
+    408: exceptions.RequestTimeout,
+    409: exceptions.AlreadyExists,
+    500: exceptions.InternalServerError,
+    502: exceptions.GatewayUnavailable,
+    503: exceptions.GatewayUnavailable,
+    504: exceptions.GatewayUnavailable,
+}
+
+
+def http_error_to_exception(e):
+    """Convert a requests HTTP error into the matching SDK exception."""
+    logger.error(f"Requests error status {e.response.status_code}: {e.response.text}")
+    exception_class = _HTTP_ERRORS.get(e.response.status_code, exceptions.HTTPError)
+    return exception_class.from_request_exception(e)
+
+
+# the assets which cannot be modified once created, their responses are served from the
+# response cache without revalidation
+_IMMUTABLE_ASSETS = {
+    schemas.Type.Algo.to_server(),
+    schemas.Type.AggregateAlgo.to_server(),
+    schemas.Type.CompositeAlgo.to_server(),
+}
+
+
+def _build_session(pool_size, keep_alive):
+    """Create a HTTP session whose connections are reused across requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
 
 class Client():
     """REST Client to communicate with Substra server."""
@@ -28,7 +77,8 @@ class Client():
     def base_url(self) -> str:
         return self._base_url
 
-    def __init__(self, url, insecure, token):
+    def __init__(self, url, insecure, token, pool_size=DEFAULT_POOL_SIZE, keep_alive=True,
+                 cache=None):
         self._default_kwargs = {
             'verify': not insecure,
         }
@@ -39,6 +89,19 @@ class Client():
         if not url:
             raise exceptions.SDKException("url required to connect to the Substra server")
         self._base_url = url[:-1] if url.endswith('/') else url
+        # a single session is shared by all the requests so that TCP/TLS connections
+        # to the server are kept alive and reused
+        self._session = _build_session(pool_size, keep_alive)
+        # optional response_cache.ResponseCache for the GET requests of assets
+        self._cache = cache
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def close(self):
+        """Close the connections of the pool."""
+        self._session.close()
 
     def login(self, username, password):
         # we do not use self._headers in order to avoid existing tokens to be sent alongside the
@@ -55,9 +118,9 @@ class Client():
         }
 
         try:
-            r = requests.post(f'{self._base_url}/api-token-auth/',
-                              data=data,
-                              headers=headers)
+            r = self._session.post(f'{self._base_url}/api-token-auth/',
+                                   data=data,
+                                   headers=headers)
             r.raise_for_status()
         except requests.exceptions.ConnectionError as e:
             raise exceptions.ConnectionError.from_request_exception(e)
@@ -81,9 +144,9 @@ class Client():
         """Base request helper."""
 
         if request_name == 'get':
-            fn = requests.get
+            fn = self._session.get
         elif request_name == 'post':
-            fn = requests.post
+            fn = self._session.post
         else:
             raise NotImplementedError
 
@@ -91,14 +154,22 @@ class Client():
         kwargs = dict(self._default_kwargs)
         kwargs.update(request_kwargs)
 
+        headers = dict(self._headers)
+        headers.update(kwargs.pop('headers', None) or {})
+
         # rewind files so that they are properly sent in retries as well
         if 'files' in kwargs:
             for file in kwargs['files'].values():
                 file.seek(0)
 
+            # stream the files instead of loading them in memory
+            body = multipart.MultipartEncoder(kwargs.pop('data', None), kwargs.pop('files'))
+            kwargs['data'] = body
+            headers['Content-Type'] = body.content_type
+
         # do HTTP request and catch generic exceptions
         try:
-            r = fn(url, headers=self._headers, **kwargs)
+            r = fn(url, headers=headers, **kwargs)
             r.raise_for_status()
 
         except requests.exceptions.ConnectionError as e:
@@ -108,33 +179,7 @@ class Client():
             raise exceptions.Timeout.from_request_exception(e)
 
         except requests.exceptions.HTTPError as e:
-            logger.error(f"Requests error status {e.response.status_code}: {e.response.text}")
-
-            if e.response.status_code == 400:
-                raise exceptions.InvalidRequest.from_request_exception(e)
-
-            if e.response.status_code == 401:
-                raise exceptions.AuthenticationError.from_request_exception(e)
-
-            if e.response.status_code == 403:
-                raise exceptions.AuthorizationError.from_request_exception(e)
-
-            if e.response.status_code == 404:
-                raise exceptions.NotFound.from_request_exception(e)
-
-            if e.response.status_code == 408:
-                raise exceptions.RequestTimeout.from_request_exception(e)
-
-            if e.response.status_code == 409:
-                raise exceptions.AlreadyExists.from_request_exception(e)
-
-            if e.response.status_code == 500:
-                raise exceptions.InternalServerError.from_request_exception(e)
-
-            if e.response.status_code in [502, 503, 504]:
-                raise exceptions.GatewayUnavailable.from_request_exception(e)
-
-            raise exceptions.HTTPError.from_request_exception(e)
+            raise http_error_to_exception(e)
 
         return r
 
@@ -153,40 +198,84 @@ class Client():
             elaps = (te - ts) * 1000
             logger.debug(f'{request_name} {url}: done in {elaps:.2f}ms error={error}')
 
+    def _cached_request(self, cache_key, request_name, url, immutable=False, **request_kwargs):
+        """Request served from the response cache, if any."""
+        if self._cache is None:
+            return self._request(request_name, url, **request_kwargs)
+
+        headers = request_kwargs.pop('headers', None) or {}
+
+        def send(conditional_headers):
+            return self._request(
+                request_name, url, headers={**headers, **conditional_headers}, **request_kwargs,
+            )
+
+        # the responses depend on the permissions of the user, they are not shared
+        # between the tokens; the token is hashed as the keys are stored in the cache
+        token_digest = hashlib.sha256(
+            self._headers.get('Authorization', '').encode('utf-8')
+        ).hexdigest()
+        return self._cache.fetch(f'{token_digest}:{cache_key}', send, immutable=immutable)
+
     def request(self, request_name, asset_name, path=None, json_response=True,
-                **request_kwargs):
-        """Base request."""
+                cache=False, **request_kwargs):
+        """Base request.
+
+        If cache is True, the response is served from the response cache if possible.
+        """
 
         path = path or ''
         url = f"{self._base_url}/{asset_name}/{path}"
         if not url.endswith("/"):
             url = url + "/"  # server requires a suffix /
 
-        response = self._request(
-            request_name,
-            url,
-            **request_kwargs,
-        )
+        if cache:
+            response = self._cached_request(
+                url,
+                request_name,
+                url,
+                immutable=asset_name in _IMMUTABLE_ASSETS,
+                **request_kwargs,
+            )
+        else:
+            response = self._request(
+                request_name,
+                url,
+                **request_kwargs,
+            )
 
         if not json_response:
             return response
 
+        return self._parse_json(response)
+
+    @staticmethod
+    def _parse_json(response):
         try:
             return response.json()
         except ValueError as e:
             msg = f"Cannot parse response to JSON: {e}"
             raise exceptions.InvalidResponse(response, msg)
 
+    @staticmethod
+    def _is_page(items):
+        """Returns True if the server paginated the list response."""
+        return isinstance(items, dict) and 'results' in items
+
     def get(self, name, key):
         """Get asset by key."""
         return self.request(
             'get',
             name,
             path=f"{key}",
+            cache=True,
         )
 
     def list(self, name, filters=None):
-        """List assets by filters."""
+        """List assets by filters.
+
+        If the server paginates the results, all the pages are fetched.
+        """
         request_kwargs = {}
         if filters:
             request_kwargs['params'] = utils.parse_filters(filters)
@@ -196,9 +285,58 @@ class Client():
             name,
             **request_kwargs,
         )
-
+        if not self._is_page(items):
+            return items
+
+        page = items
+        items = list(page['results'])
+        while page.get('next'):
+            page = self._parse_json(self._request('get', page['next']))
+            items.extend(page['results'])
         return items
 
+    def iter_list(self, name, filters=None):
+        """List assets by filters, the assets are yielded as they are received.
+
+        The response is parsed incrementally so that the whole list is never held in
+        memory. If the server paginates the results, the pages are fetched one after
+        the other.
+        """
+        request_kwargs = {}
+        if filters:
+            request_kwargs['params'] = utils.parse_filters(filters)
+
+        url = f"{self._base_url}/{name}/"
+        while url:
+            response = self._request('get', url, stream=True, **request_kwargs)
+            # the next page links already contain the query parameters
+            request_kwargs = {}
+            url = None
+
+            with contextlib.closing(response):
+                chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)
+                head = b''
+                for chunk in chunks:
+                    head += chunk
+                    if head.strip():
+                        break
+                chunks = itertools.chain([head], chunks)
+
+                try:
+                    if head.lstrip().startswith(b'['):
+                        yield from utils.iter_json_array(chunks)
+                        continue
+                    # a page is small enough to be loaded at once
+                    page = json.loads(b''.join(chunks))
+                except ValueError as e:
+                    msg = f"Cannot parse response to JSON: {e}"
+                    raise exceptions.InvalidResponse(response, msg)
+
+            if not self._is_page(page):
+                raise exceptions.InvalidResponse(response, "Expected a list of assets")
+            yield from page['results']
+            url = page.get('next')
+
     def _add(self, name, **request_kwargs):
         """ Add asset wrapper.
 
@@ -247,8 +385,32 @@ class Client():
             #     potential conflicts
             return retry(self._add)(name, **request_kwargs)
 
-    def get_data(self, address, **request_kwargs):
-        """Get asset data."""
+    def download(self, address, destination, checksum=None):
+        """Download asset data to the destination file.
+
+        Large files are downloaded with parallel Range requests and an interrupted
+        download is resumed, see `download.Downloader`. If the checksum is given,
+        the downloaded file is verified against it.
+        """
+        def get(url, headers):
+            return self._request('get', url, stream=True, headers=headers)
+
+        return download.Downloader(get).download(address, destination, checksum=checksum)
+
+    def get_data(self, address, checksum=None, **request_kwargs):
+        """Get asset data.
+
+        If the checksum of the data is given, the response is served from the response
+        cache if possible.
+        """
+        if checksum and not request_kwargs.get('stream'):
+            return self._cached_request(
+                f'{address}#{checksum}',
+                'get',
+                address,
+                immutable=True,
+                **request_kwargs,
+            )
         return self._request(
             'get',
             address,
@@ -0,0 +1,141 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pipelined submission of the batches of a compute plan.
+
+The next batch is serialized while the previous one is being sent. By default the
+batches are sent one after the other, as concurrent updates of the same compute plan may
+conflict on the server, up to `max_in_flight` batches can be sent at the same time. A
+batch is only sent once the batches defining the tuples it depends on have been
+submitted, and, when the compute plan is created, once the creation request has returned
+the compute plan key.
+"""
+import concurrent.futures
+import logging
+
+from substra.sdk import compute_plan, exceptions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 1
+
+
+class BatchSubmitter:
+    """Submit the batches of a compute plan.
+
+    Args:
+        create (callable): creates the compute plan from the first batch spec and returns
+            the compute plan
+        update (callable): adds the serialized batch given as second argument to the
+            compute plan whose key is given as first argument and returns the compute plan
+        max_in_flight (int): maximum number of batches sent at the same time
+    """
+
+    def __init__(self, create, update, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self._create = create
+        self._update = update
+        self._max_in_flight = max(1, max_in_flight)
+
+    def submit(self, batches, compute_plan_key=None, skip=None, id_to_key=None,
+               on_success=None):
+        """Submit the batches and return the compute plan returned by the last batch,
+        with the id_to_key mapping of all the batches.
+
+        If compute_plan_key is None, the compute plan is created with the first batch.
+
+        Args:
+            batches (iterable): batch specs, as generated by `compute_plan.auto_batching`
+            compute_plan_key (str, optional): key of the compute plan to update
+            skip (set, optional): indexes of the batches already submitted
+            id_to_key (dict, optional): id_to_key mapping of the skipped batches
+            on_success (callable, optional): called with the index of each submitted batch
+                and the compute plan returned by the server, from the calling thread
+
+        Raises:
+            exceptions.ComputePlanSubmissionError: if a batch could not be submitted after
+                the compute plan creation, the error lists the batches which succeeded.
+        """
+        is_creation = compute_plan_key is None
+        skip = set(skip or ())
+        assets = dict()
+        failed = dict()
+        id_to_batch = dict()
+        in_flight = dict()
+
+        def wait(return_when):
+            nonlocal compute_plan_key
+            done, _ = concurrent.futures.wait(in_flight, return_when=return_when)
+            for future in done:
+                index = in_flight.pop(future)
+                try:
+                    assets[index] = future.result()
+                except Exception as e:
+                    failed[index] = e
+                    continue
+                if is_creation and index == 0:
+                    compute_plan_key = assets[index].key
+                if on_success:
+                    on_success(index, assets[index])
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_in_flight) as e:
+            for index, batch in enumerate(batches):
+                if index in skip:
+                    continue
+
+                # serialized while the previous batches are being sent
+                if is_creation and index == 0:
+                    data = None
+                else:
+                    data = batch.dict(exclude_none=True)
+
+                ids, dependencies = compute_plan.get_ids_and_dependencies(batch)
+                required = {id_to_batch[d] for d in dependencies if d in id_to_batch}
+                if is_creation and index > 0:
+                    required.add(0)
+
+                while not failed and (
+                    not required.issubset(assets) or len(in_flight) >= self._max_in_flight
+                ):
+                    wait(concurrent.futures.FIRST_COMPLETED)
+                if failed:
+                    break
+
+                for tuple_id in ids:
+                    id_to_batch[tuple_id] = index
+                if data is None:
+                    future = e.submit(self._create, batch)
+                else:
+                    future = e.submit(self._update, compute_plan_key, data)
+                in_flight[future] = index
+
+            wait(concurrent.futures.ALL_COMPLETED)
+
+        id_to_key = dict(id_to_key or {})
+        for index in sorted(assets):
+            id_to_key.update(assets[index].id_to_key)
+
+        if failed:
+            if is_creation and 0 in failed:
+                # nothing has been created
+                raise failed[0]
+            error = exceptions.ComputePlanSubmissionError(
+                compute_plan_key, sorted(assets.keys() | skip), failed, id_to_key,
+            )
+            logger.error(str(error))
+            raise error from failed[min(failed)]
+
+        if not assets:
+            return None
+        asset = assets[max(assets)]
+        asset.id_to_key = id_to_key
+        return asset
@@ -0,0 +1,159 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Bulk registration of data samples.
+
+The paths are split into chunks which are registered concurrently, each chunk being
+archived (or copied by the local backend) and uploaded by a worker thread. A chunk
+failing with a transient error is retried. A chunk failing with any other error is
+split so that the failure is reported for the faulty paths only.
+"""
+import concurrent.futures
+import logging
+import time
+import typing
+
+from substra.sdk import exceptions
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 1
+
+CREATED = 'created'
+EXISTS = 'exists'
+FAILED = 'failed'
+
+_TRANSIENT_ERRORS = (
+    exceptions.ConnectionError,
+    exceptions.Timeout,
+    exceptions.InternalServerError,
+    exceptions.GatewayUnavailable,
+)
+
+
+class PathReport(typing.NamedTuple):
+    path: str
+    status: str
+    key: typing.Optional[str] = None
+    error: typing.Optional[str] = None
+
+
+class Report:
+    """Result of a bulk registration, with one entry per path in the input order."""
+
+    def __init__(self, results: typing.List[PathReport]):
+        self.results = results
+
+    @property
+    def keys(self) -> typing.List[str]:
+        """Keys of the registered data samples, including the existing ones, the failed
+        paths and the existing data samples whose key is unknown are skipped."""
+        return [r.key for r in self.results if r.status != FAILED and r.key is not None]
+
+    @property
+    def failed(self) -> typing.List[PathReport]:
+        return [r for r in self.results if r.status == FAILED]
+
+    def to_dict(self):
+        return {
+            'keys': self.keys,
+            'results': [r._asdict() for r in self.results],
+        }
+
+
+def _existing_key(error):
+    key = error.key
+    if isinstance(key, list):
+        key = key[0] if len(key) == 1 else None
+    return key
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class Pipeline:
+    """Register data samples by chunks in a pool of workers.
+
+    Args:
+        add (callable): registers the list of paths given as argument and returns the
+            list of keys, in the same order
+        chunk_size (int): number of paths registered in a single request
+        max_workers (int): number of chunks registered concurrently
+        max_attempts (int): number of attempts for a chunk failing with a transient error
+        retry_delay (float): delay in seconds before the first retry, doubled at each retry
+        progress (callable, optional): called with the number of processed paths each time
+            a chunk is completed
+    """
+
+    def __init__(self, add, chunk_size=DEFAULT_CHUNK_SIZE, max_workers=DEFAULT_MAX_WORKERS,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY,
+                 progress=None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self._add = add
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._max_attempts = max(1, max_attempts)
+        self._retry_delay = retry_delay
+        self._progress = progress
+
+    def run(self, paths) -> Report:
+        chunks = _chunks(list(paths), self._chunk_size)
+        results = [None] * len(chunks)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as e:
+            futures = {e.submit(self._process, chunk): i for i, chunk in enumerate(chunks)}
+            for future in concurrent.futures.as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                if self._progress:
+                    self._progress(len(chunks[i]))
+
+        return Report([r for chunk_results in results for r in chunk_results])
+
+    def _add_with_retries(self, paths):
+        delay = self._retry_delay
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                return self._add(paths)
+            except _TRANSIENT_ERRORS as e:
+                if attempt == self._max_attempts:
+                    raise
+                logger.warning(
+                    f'Registration of {len(paths)} data sample(s) failed, retrying in '
+                    f'{delay}s: {e}'
+                )
+                time.sleep(delay)
+                delay *= 2
+
+    def _process(self, paths) -> typing.List[PathReport]:
+        try:
+            keys = self._add_with_retries(paths)
+        except exceptions.SDKException as e:
+            if len(paths) > 1:
+                # isolate the faulty paths, the others are registered one by one
+                logger.info(f'Registration of a chunk failed, splitting it: {e}')
+                return [r for path in paths for r in self._process([path])]
+
+            path = str(paths[0])
+            if isinstance(e, exceptions.AlreadyExists):
+                key = _existing_key(e)
+                logger.warning(f"data_sample already exists: key='{key}'")
+                return [PathReport(path, EXISTS, key=key)]
+            return [PathReport(path, FAILED, error=f'{e.__class__.__name__}: {e}')]
+
+        return [PathReport(str(path), CREATED, key=key) for path, key in zip(paths, keys)]
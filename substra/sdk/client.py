@@ -12,22 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import functools
 import logging
 import os
 import pathlib
 import time
-from typing import Union, Optional, List
+from typing import Iterator, Union, Optional, List
 
 from substra.sdk import exceptions
 from substra.sdk import config as cfg
 from substra.sdk import backends
 from substra.sdk import schemas, models
+from substra.sdk import bulk
+from substra.sdk import sync
+from substra.sdk.backends.remote.rest_client import DEFAULT_POOL_SIZE
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_RETRY_TIMEOUT = 5 * 60
 DEFAULT_BATCH_SIZE = 20
+DEFAULT_RESPONSE_CACHE_MAX_SIZE = 100 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 10
+DEFAULT_MAX_CONCURRENT_TUPLES = 4
+DEFAULT_MAX_BATCHES_IN_FLIGHT = 1
 
 
 def logit(f):
@@ -72,6 +80,45 @@ class Client(object):
         debug (bool, optional): Whether to use the default or debug mode.
             In debug mode, new assets are created locally but can access assets from
             the deployed Substra platform. The platform is in read-only mode.
+            The files of the assets of the platform are kept in a persistent cache, in
+            '~/.substra-cache' by default, see the `substra cache` commands.
+            Defaults to False.
+        pool_size (int, optional): Maximum number of HTTP connections kept open to the
+            Substra platform and reused across requests.
+            Defaults to 10.
+        keep_alive (bool, optional): If False, the connection to the Substra platform is
+            closed after each request.
+            Defaults to True.
+        response_cache_dir (str, optional): Directory of the on-disk cache of the assets
+            returned by the Substra platform. Algos and descriptions are served from the cache,
+            the other assets are revalidated with the platform. The responses are cached per
+            token, the hits and misses are given by `Client.response_cache_stats`.
+            Defaults to None, no cache.
+        response_cache_max_size (int, optional): Maximum size of the response cache, in
+            bytes, the least recently used responses are removed when it is exceeded.
+            Defaults to 100 MiB.
+        max_batches_in_flight (int, optional): Maximum number of batches of a compute plan
+            sent at the same time when it is submitted with auto batching. The next batch is
+            always prepared while the previous one is being sent. Sending several batches at
+            the same time is faster but the concurrent updates of the compute plan may
+            conflict on the server.
+            Defaults to 1.
+        max_concurrent_tuples (int, optional): In debug mode, maximum number of tuples of a
+            compute plan executed at the same time. A tuple is executed as soon as the tuples
+            it depends on are done.
+            Defaults to 4.
+        local_workspace (str, optional): In debug mode, directory where the local assets,
+            their files and the outputs of the tuples are persisted. Opening a client with an
+            existing workspace loads back its assets.
+            Defaults to None, the local assets are deleted when the client is deleted.
+        validate_responses (bool, optional): If False, the assets returned by the Substra
+            platform are built without being validated, which is much faster for large lists.
+            The values are not converted, for instance the storage addresses are strings.
+            Only use it with a trusted platform.
+            Defaults to True.
+        lazy_models (bool, optional): If True, the large fields of the assets returned by the
+            Substra platform (`log`, `id_to_key`, `in_models` and the lists of keys) are only
+            built, and validated, when they are read for the first time.
             Defaults to False.
     """
 
@@ -82,12 +129,30 @@ class Client(object):
         retry_timeout: int = DEFAULT_RETRY_TIMEOUT,
         insecure: bool = False,
         debug: bool = False,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        response_cache_dir: Optional[str] = None,
+        response_cache_max_size: int = DEFAULT_RESPONSE_CACHE_MAX_SIZE,
+        max_batches_in_flight: int = DEFAULT_MAX_BATCHES_IN_FLIGHT,
+        max_concurrent_tuples: int = DEFAULT_MAX_CONCURRENT_TUPLES,
+        local_workspace: Optional[str] = None,
+        validate_responses: bool = True,
+        lazy_models: bool = False,
     ):
         self._retry_timeout = retry_timeout
         self._token = token
 
         self._insecure = insecure
         self._url = url
+        self._pool_size = pool_size
+        self._keep_alive = keep_alive
+        self._response_cache_dir = response_cache_dir
+        self._response_cache_max_size = response_cache_max_size
+        self._max_batches_in_flight = max_batches_in_flight
+        self._max_concurrent_tuples = max_concurrent_tuples
+        self._local_workspace = local_workspace
+        self._validate_responses = validate_responses
+        self._lazy_models = lazy_models
 
         self._backend = self._get_backend(debug)
 
@@ -105,6 +170,13 @@ class Client(object):
                 insecure=self._insecure,
                 token=self._token,
                 retry_timeout=self._retry_timeout,
+                pool_size=self._pool_size,
+                keep_alive=self._keep_alive,
+                response_cache_dir=self._response_cache_dir,
+                response_cache_max_size=self._response_cache_max_size,
+                max_batches_in_flight=self._max_batches_in_flight,
+                validate_responses=self._validate_responses,
+                lazy_models=self._lazy_models,
             )
         if debug:
             # Hybrid mode: the local backend also connects to
@@ -112,6 +184,8 @@ class Client(object):
             return backends.get(
                 "local",
                 backend,
+                max_concurrent_tuples=self._max_concurrent_tuples,
+                local_workspace=self._local_workspace,
             )
         return backend
 
@@ -123,6 +197,14 @@ class Client(object):
         if isinstance(self._backend, backends.Local):
             return self._backend.temp_directory
 
+    @property
+    def response_cache_stats(self):
+        """Hits, misses and size in bytes of the response cache, None if the client has
+        no response cache.
+        """
+        cache = self._backend.response_cache if self._backend else None
+        return cache.stats() if cache is not None else None
+
     @logit
     def login(self, username, password):
         """Login to a remote server. """
@@ -145,7 +227,9 @@ class Client(object):
         tokens_path: Union[str, pathlib.Path] = cfg.DEFAULT_TOKENS_PATH,
         token: Optional[str] = None,
         retry_timeout: int = DEFAULT_RETRY_TIMEOUT,
-        debug: bool = False
+        debug: bool = False,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
     ):
         """Returns a new Client configured with profile data from configuration files.
 
@@ -165,6 +249,12 @@ class Client(object):
                 created locally but can get remote assets. The deployed platform is in
                 read-only mode.
                 Defaults to False.
+            pool_size (int, optional): Maximum number of HTTP connections kept open to the
+                Substra platform and reused across requests.
+                Defaults to 10.
+            keep_alive (bool, optional): If False, the connection to the Substra platform is
+                closed after each request.
+                Defaults to True.
 
         Returns:
             Client: The new client.
@@ -184,6 +274,8 @@ class Client(object):
             url=profile['url'],
             insecure=profile['insecure'],
             debug=debug,
+            pool_size=pool_size,
+            keep_alive=keep_alive,
         )
 
     @logit
@@ -232,8 +324,8 @@ class Client(object):
 
         Create multiple data samples through a single HTTP request.
         This method is well suited for adding multiple small files only. For adding a
-        large amount of data it is recommended to add them one by one. It allows a
-        better control in case of failures.
+        large amount of data it is recommended to use `Client.add_data_samples_in_bulk`.
+        It allows a better control in case of failures.
 
         Args:
             data (Union[dict, schemas.DataSampleSpec]): data samples to add. If it is a dict,
@@ -259,6 +351,140 @@ class Client(object):
             spec_options=spec_options,
         )
 
+    @logit
+    def add_data_samples_in_bulk(
+        self,
+        data: Union[dict, schemas.DataSampleSpec],
+        local: bool = True,
+        chunk_size: int = bulk.DEFAULT_CHUNK_SIZE,
+        max_workers: int = bulk.DEFAULT_MAX_WORKERS,
+        max_attempts: int = bulk.DEFAULT_MAX_ATTEMPTS,
+        progress=None,
+    ) -> bulk.Report:
+        """Create a large number of data sample assets.
+
+        The paths are split into chunks of `chunk_size` data samples, each chunk is
+        archived and sent in its own request and `max_workers` chunks are sent at the
+        same time. A chunk failing with a connection error, a timeout or a server error
+        is retried, the paths of a chunk failing with another error are added one by one
+        so that a single invalid data sample does not prevent the others from being added.
+
+        Args:
+            data (Union[dict, schemas.DataSampleSpec]): data samples to add, please refer
+                to the method `Client.add_data_samples`.
+            local (bool, optional): Please refer to the method `Client.add_data_sample`.
+                Defaults to True.
+            chunk_size (int, optional): Number of data samples sent in a single request.
+                Defaults to 50.
+            max_workers (int, optional): Number of requests sent at the same time.
+                Defaults to 4.
+            max_attempts (int, optional): Number of attempts for a chunk failing with a
+                transient error. Defaults to 3.
+            progress (callable, optional): Called with the number of processed data samples
+                each time a chunk is completed.
+
+        Returns:
+            bulk.Report: the status and the key of each path in `results`, in the same
+            order as the paths. The paths which could not be added are listed in `failed`,
+            they have no key and are skipped by `keys`, as are the existing data samples
+            whose key could not be determined. The indexes of `keys` therefore do not
+            match the ones of the paths if a path is skipped.
+        """
+        spec = self._get_spec(schemas.DataSampleSpec, data)
+        if spec.path:
+            raise ValueError("data: invalid 'path' field")
+        if not spec.paths:
+            raise ValueError("data: missing 'paths' field")
+
+        def add(paths):
+            chunk_spec = schemas.DataSampleSpec(
+                paths=paths,
+                data_manager_keys=spec.data_manager_keys,
+                test_only=spec.test_only,
+            )
+            return self._backend.add(chunk_spec, spec_options={"local": local})
+
+        pipeline = bulk.Pipeline(
+            add,
+            chunk_size=chunk_size,
+            max_workers=max_workers,
+            max_attempts=max_attempts,
+            progress=progress,
+        )
+        return pipeline.run(spec.paths)
+
+    @logit
+    def sync_data_samples(
+        self,
+        dataset_key: str,
+        root_dir: str,
+        test_only: bool = False,
+        manifest_path: Optional[str] = None,
+        chunk_size: int = bulk.DEFAULT_CHUNK_SIZE,
+        max_workers: int = bulk.DEFAULT_MAX_WORKERS,
+        max_attempts: int = bulk.DEFAULT_MAX_ATTEMPTS,
+        progress=None,
+    ) -> bulk.Report:
+        """Register the data sample folders of a directory which are not registered yet.
+
+        Each sub-directory of `root_dir` is a data sample. The digests of the folders and
+        the keys of their data samples are kept in a manifest, so that when the directory is
+        synchronized again only the new or changed folders are added, with
+        `Client.add_data_samples_in_bulk`. The data samples already registered which are not
+        linked to the dataset are linked with `Client.link_dataset_with_data_samples`.
+
+        Args:
+            dataset_key (str): key of the dataset of the data samples
+            root_dir (str): directory containing the data sample folders
+            test_only (bool, optional): whether the data samples are used as test data only.
+                Defaults to False.
+            manifest_path (str, optional): path of the manifest.
+                Defaults to '.substra-sync.json' in `root_dir`.
+            chunk_size (int, optional): Please refer to the method
+                `Client.add_data_samples_in_bulk`. Defaults to 50.
+            max_workers (int, optional): Please refer to the method
+                `Client.add_data_samples_in_bulk`. Defaults to 4.
+            max_attempts (int, optional): Please refer to the method
+                `Client.add_data_samples_in_bulk`. Defaults to 3.
+            progress (callable, optional): Called with the number of processed data samples,
+                once for the folders already registered and each time a chunk of new or
+                changed data samples is completed.
+
+        Returns:
+            bulk.Report: the `keys` of the data samples, in the order of the folder names,
+            and the status of each folder in `results`: 'created' or 'exists' for the
+            folders which have been added, 'linked' or 'unchanged' for the others.
+        """
+        if manifest_path is None:
+            manifest_path = sync.get_default_manifest_path(root_dir)
+        manifest = sync.Manifest.load(manifest_path)
+
+        def add(paths):
+            data = {
+                'paths': paths,
+                'data_manager_keys': [dataset_key],
+                'test_only': test_only,
+            }
+            return self.add_data_samples_in_bulk(
+                data,
+                chunk_size=chunk_size,
+                max_workers=max_workers,
+                max_attempts=max_attempts,
+                progress=progress,
+            )
+
+        def link(keys):
+            return self.link_dataset_with_data_samples(dataset_key, keys)
+
+        synchronizer = sync.Synchronizer(
+            add,
+            link,
+            manifest,
+            hash_cache=sync.get_hash_cache(manifest_path),
+            progress=progress,
+        )
+        return synchronizer.run(root_dir, dataset_key, test_only=test_only)
+
     @logit
     def add_dataset(self, data: Union[dict, schemas.DatasetSpec]):
         """Create new dataset asset and return its key.
@@ -447,6 +673,9 @@ class Client(object):
         data: Union[dict, schemas.ComputePlanSpec],
         auto_batching: bool = True,
         batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: Optional[int] = None,
+        batch_by_rank: bool = False,
+        journal: Optional[str] = None,
     ) -> models.ComputePlan:
         """Create new compute plan asset.
 
@@ -460,6 +689,14 @@ class Client(object):
                 the compute plan at once. Defaults to True.
             batch_size (int, optional): If 'auto_batching' is True, change `batch_size` to define
                 the number of tuples uploaded in each batch (default 20).
+            max_batch_bytes (int, optional): If 'auto_batching' is True, maximum size of the
+                serialized tuples of a batch, in bytes. Defaults to None (no limit).
+            batch_by_rank (bool, optional): If 'auto_batching' is True, set `batch_by_rank` so
+                that the tuples of a batch do not depend on each other. Defaults to False.
+            journal (str, optional): If 'auto_batching' is True, path of a file where the
+                submitted batches are recorded. If the submission fails, it can be resumed
+                with `Client.resume_compute_plan`. Not supported in debug mode.
+                Defaults to None.
 
         Returns:
             models.ComputePlan: Created compute plan
@@ -468,6 +705,9 @@ class Client(object):
         spec_options = {
             "auto_batching": auto_batching,
             "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+            "batch_by_rank": batch_by_rank,
+            "journal": journal,
         }
         return self._backend.add(spec, spec_options=spec_options)
 
@@ -532,70 +772,191 @@ class Client(object):
         return self._backend.get(schemas.Type.CompositeTraintuple, key)
 
     @logit
-    def list_algo(self, filters=None) -> List[models.Algo]:
+    def get_many(
+        self,
+        asset_type: Union[str, schemas.Type],
+        keys: List[str],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        return_exceptions: bool = False,
+    ) -> list:
+        """Get many assets of the same type by key, the requests are sent concurrently.
+
+        The returned assets are in the same order as the keys, each one is described
+        in the model of the asset type, for instance
+        [models.Traintuple](sdk_models.md#Traintuple) for traintuples.
+
+        Args:
+            asset_type (Union[str, schemas.Type]): type of the assets, for instance
+                'traintuple' or 'composite_traintuple'.
+            keys (List[str]): keys of the assets.
+            max_workers (int, optional): Maximum number of requests sent at the same time,
+                it should not exceed `pool_size` so that all the connections are reused.
+                Defaults to 10.
+            return_exceptions (bool, optional): If False, the first error is raised and
+                the requests that have not started yet are cancelled. If True, the
+                exception raised for a key is returned in place of its asset.
+                Defaults to False.
+
+        Returns:
+            list: the assets, in the same order as the keys
+        """
+        asset_type = schemas.Type(asset_type)
+        if not keys:
+            return []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._backend.get, asset_type, key) for key in keys
+            ]
+            if not return_exceptions:
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_EXCEPTION,
+                )
+                for future in futures:
+                    if future in done and future.exception() is not None:
+                        for f in futures:
+                            f.cancel()
+                        raise future.exception()
+                return [future.result() for future in futures]
+
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+            return results
+
+    @logit
+    def list_algo(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Algo], Iterator[models.Algo]]:
         """List algos, the returned object is described
-        in the [models.Algo](sdk_models.md#Algo) model"""
-        return self._backend.list(schemas.Type.Algo, filters)
+        in the [models.Algo](sdk_models.md#Algo) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Algo, filters, stream=stream)
 
     @logit
-    def list_compute_plan(self, filters=None) -> List[models.ComputePlan]:
+    def list_compute_plan(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.ComputePlan], Iterator[models.ComputePlan]]:
         """List compute plans, the returned object is described
-        in the [models.ComputePlan](sdk_models.md#ComputePlan) model"""
-        return self._backend.list(schemas.Type.ComputePlan, filters)
+        in the [models.ComputePlan](sdk_models.md#ComputePlan) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.ComputePlan, filters, stream=stream)
 
     @logit
-    def list_aggregate_algo(self, filters=None) -> List[models.AggregateAlgo]:
+    def list_aggregate_algo(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.AggregateAlgo], Iterator[models.AggregateAlgo]]:
         """List aggregate algos, the returned object is described
-        in the [models.AggregateAlgo](sdk_models.md#AggregateAlgo) model"""
-        return self._backend.list(schemas.Type.AggregateAlgo, filters)
+        in the [models.AggregateAlgo](sdk_models.md#AggregateAlgo) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.AggregateAlgo, filters, stream=stream)
 
     @logit
-    def list_composite_algo(self, filters=None) -> List[models.CompositeAlgo]:
+    def list_composite_algo(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.CompositeAlgo], Iterator[models.CompositeAlgo]]:
         """List composite algos, the returned object is described
-        in the [models.CompositeAlgo](sdk_models.md#CompositeAlgo) model"""
-        return self._backend.list(schemas.Type.CompositeAlgo, filters)
+        in the [models.CompositeAlgo](sdk_models.md#CompositeAlgo) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.CompositeAlgo, filters, stream=stream)
 
     @logit
-    def list_data_sample(self, filters=None) -> List[models.DataSample]:
+    def list_data_sample(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.DataSample], Iterator[models.DataSample]]:
         """List data samples, the returned object is described
-        in the [models.DataSample](sdk_models.md#DataSample) model"""
-        return self._backend.list(schemas.Type.DataSample, filters)
+        in the [models.DataSample](sdk_models.md#DataSample) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.DataSample, filters, stream=stream)
 
     @logit
-    def list_dataset(self, filters=None) -> List[models.Dataset]:
+    def list_dataset(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Dataset], Iterator[models.Dataset]]:
         """List datasets, the returned object is described
-        in the [models.Dataset](sdk_models.md#Dataset) model"""
-        return self._backend.list(schemas.Type.Dataset, filters)
+        in the [models.Dataset](sdk_models.md#Dataset) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Dataset, filters, stream=stream)
 
     @logit
-    def list_objective(self, filters=None) -> List[models.Objective]:
+    def list_objective(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Objective], Iterator[models.Objective]]:
         """List objectives, the returned object is described
-        in the [models.Objective](sdk_models.md#Objective) model"""
-        return self._backend.list(schemas.Type.Objective, filters)
+        in the [models.Objective](sdk_models.md#Objective) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Objective, filters, stream=stream)
 
     @logit
-    def list_testtuple(self, filters=None) -> List[models.Testtuple]:
+    def list_testtuple(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Testtuple], Iterator[models.Testtuple]]:
         """List testtuples, the returned object is described
-        in the [models.Testtuple](sdk_models.md#Testtuple) model"""
-        return self._backend.list(schemas.Type.Testtuple, filters)
+        in the [models.Testtuple](sdk_models.md#Testtuple) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Testtuple, filters, stream=stream)
 
     @logit
-    def list_traintuple(self, filters=None) -> List[models.Traintuple]:
+    def list_traintuple(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Traintuple], Iterator[models.Traintuple]]:
         """List traintuples, the returned object is described
-        in the [models.Traintuple](sdk_models.md#Traintuple) model"""
-        return self._backend.list(schemas.Type.Traintuple, filters)
+        in the [models.Traintuple](sdk_models.md#Traintuple) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Traintuple, filters, stream=stream)
 
     @logit
-    def list_aggregatetuple(self, filters=None) -> List[models.Aggregatetuple]:
+    def list_aggregatetuple(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.Aggregatetuple], Iterator[models.Aggregatetuple]]:
         """List aggregatetuples, the returned object is described
-        in the [models.Aggregatetuple](sdk_models.md#Aggregatetuple) model"""
-        return self._backend.list(schemas.Type.Aggregatetuple, filters)
+        in the [models.Aggregatetuple](sdk_models.md#Aggregatetuple) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.Aggregatetuple, filters, stream=stream)
 
     @logit
-    def list_composite_traintuple(self, filters=None) -> List[models.CompositeTraintuple]:
+    def list_composite_traintuple(
+        self, filters=None, stream: bool = False,
+    ) -> Union[List[models.CompositeTraintuple], Iterator[models.CompositeTraintuple]]:
         """List composite traintuples, the returned object is described
-        in the [models.CompositeTraintuple](sdk_models.md#CompositeTraintuple) model"""
-        return self._backend.list(schemas.Type.CompositeTraintuple, filters)
+        in the [models.CompositeTraintuple](sdk_models.md#CompositeTraintuple) model
+
+        If stream is True, returns an iterator which yields the assets as they are
+        received from the server instead of waiting for the whole list."""
+        return self._backend.list(schemas.Type.CompositeTraintuple, filters, stream=stream)
+
+    @logit
+    def list_model(self, filters=None) -> List[models.OutModel]:
+        """List the out models of the local tuples, the returned object is described
+        in the [models.OutModel](sdk_models.md#OutModel) model
+
+        Only available in debug mode."""
+        if not isinstance(self._backend, backends.Local):
+            raise exceptions.SDKException('The models can only be listed in debug mode')
+        return self._backend.list(schemas.Type.Model, filters)
 
     @logit
     def list_node(self, *args, **kwargs) -> List[models.Node]:
@@ -609,7 +970,10 @@ class Client(object):
         key: str,
         data: Union[dict, schemas.UpdateComputePlanSpec],
         auto_batching: bool = True,
-        batch_size: int = DEFAULT_BATCH_SIZE
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: Optional[int] = None,
+        batch_by_rank: bool = False,
+        journal: Optional[str] = None,
     ) -> models.ComputePlan:
         """Update compute plan.
 
@@ -625,6 +989,15 @@ class Client(object):
                 the tuples of the compute plan at once. Defaults to True.
             batch_size (int, optional): If 'auto_batching' is True, change `batch_size`
                 to define the number of tuples uploaded in each batch (default 20).
+            max_batch_bytes (int, optional): If 'auto_batching' is True, maximum size of
+                the serialized tuples of a batch, in bytes. Defaults to None (no limit).
+            batch_by_rank (bool, optional): If 'auto_batching' is True, set `batch_by_rank`
+                so that the tuples of a batch do not depend on each other.
+                Defaults to False.
+            journal (str, optional): If 'auto_batching' is True, path of a file where
+                the submitted batches are recorded. If the submission fails, it can be
+                resumed with `Client.resume_compute_plan`. Not supported in debug mode.
+                Defaults to None.
 
         Returns:
             models.ComputePlan: updated compute plan, as described in the
@@ -634,6 +1007,9 @@ class Client(object):
         spec_options = {
             "auto_batching": auto_batching,
             "batch_size": batch_size,
+            "max_batch_bytes": max_batch_bytes,
+            "batch_by_rank": batch_by_rank,
+            "journal": journal,
         }
         return self._backend.update_compute_plan(
             key,
@@ -641,6 +1017,35 @@ class Client(object):
             spec_options=spec_options
         )
 
+    @logit
+    def resume_compute_plan(
+        self,
+        data: Union[dict, schemas.ComputePlanSpec, schemas.UpdateComputePlanSpec],
+        journal: str,
+    ) -> models.ComputePlan:
+        """Resume the creation or the update of a compute plan.
+
+        The batches recorded in the journal have reached the server and are skipped, the
+        other ones are submitted with the batching options of the first submission.
+        Not supported in debug mode.
+
+        Args:
+            data (Union[dict, schemas.ComputePlanSpec, schemas.UpdateComputePlanSpec]): the
+                data given to `Client.add_compute_plan` or `Client.update_compute_plan`,
+                it must not have been modified.
+            journal (str): path of the journal given to `Client.add_compute_plan` or
+                `Client.update_compute_plan`.
+
+        Returns:
+            models.ComputePlan: created or updated compute plan, with the `id_to_key`
+            mapping of all the tuples
+        """
+        if isinstance(data, schemas.UpdateComputePlanSpec):
+            spec = data
+        else:
+            spec = self._get_spec(schemas.ComputePlanSpec, data)
+        return self._backend.resume_compute_plan(spec, journal)
+
     @logit
     def link_dataset_with_objective(self, dataset_key: str, objective_key: str) -> str:
         """Link dataset with objective."""
@@ -722,14 +1127,16 @@ class Client(object):
         )
 
     @logit
-    def download_model(self, key: str, folder) -> None:
+    def download_model(self, key: str, folder, checksum: Optional[str] = None) -> None:
         """Download model to destination file.
 
         This model was saved using the 'save_model' function of the algorithm.
         To load and use the model, please refer to the 'load_model' and 'predict' functions of the
         algorithm.
+
+        If the checksum of the model is given, the downloaded file is verified against it.
         """
-        self._backend.download_model(key, os.path.join(folder, f'model_{key}'))
+        self._backend.download_model(key, os.path.join(folder, f'model_{key}'), checksum=checksum)
 
     @logit
     def download_model_from_traintuple(self, tuple_key: str, folder) -> None:
@@ -793,7 +1200,7 @@ class Client(object):
             msg = f'{tuple_type} {tuple_key}, status "{tuple.status}" has no {desc}out-model'
             raise exceptions.NotFound(msg, 404)
 
-        self.download_model(model.key, folder)
+        self.download_model(model.key, folder, checksum=model.checksum)
 
     @logit
     def describe_algo(self, key: str) -> str:
@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from copy import deepcopy
-import math
 import typing
 
 from substra.sdk import schemas, graph, exceptions
 
+_TUPLE_FIELDS = ('traintuples', 'aggregatetuples', 'composite_traintuples', 'testtuples')
+
 
 def _insert_into_graph(tuple_graph, tuple_id, in_model_ids):
     if tuple_id in tuple_graph:
@@ -71,41 +71,31 @@ def get_dependency_graph(spec: schemas._BaseComputePlanSpec):
     return tuple_graph, traintuples_by_ids, aggregatetuples_by_ids, composite_traintuples_by_ids
 
 
-def filter_tuples_in_list(
-    tuple_graph: typing.Dict[str, typing.List[str]],
-    traintuples_by_ids: typing.Dict[str, schemas.ComputePlanTraintupleSpec],
-    aggregatetuples_by_ids: typing.Dict[str, schemas.ComputePlanAggregatetupleSpec],
-    composite_traintuples_by_ids: typing.Dict[str, schemas.ComputePlanCompositeTraintupleSpec],
-    testtuples_by_ids: typing.Dict[str, schemas.ComputePlanTesttupleSpec],
-):
-    """Return the tuple lists with only the elements which are in the tuple graph.
-    """
-    filtered_traintuples = list()
-    filtered_aggregatetuples = list()
-    filtered_composite_traintuples = list()
-    filtered_testtuples = list()
-    for elem_id, _ in tuple_graph:
-        if elem_id in traintuples_by_ids:
-            filtered_traintuples.append(traintuples_by_ids[elem_id])
-        elif elem_id in aggregatetuples_by_ids:
-            filtered_aggregatetuples.append(aggregatetuples_by_ids[elem_id])
-        elif elem_id in composite_traintuples_by_ids:
-            filtered_composite_traintuples.append(composite_traintuples_by_ids[elem_id])
-        elif elem_id in testtuples_by_ids:
-            filtered_testtuples.append(testtuples_by_ids[elem_id])
-
-    return (
-        filtered_traintuples,
-        filtered_aggregatetuples,
-        filtered_composite_traintuples,
-        filtered_testtuples,
-    )
-
-
-def auto_batching(spec, is_creation: bool = True, batch_size: int = 20):
-    """Auto batching of the compute plan tuples
+def get_ids_and_dependencies(spec: schemas._BaseComputePlanSpec):
+    """Return the ids of the tuples of the spec and the ids of the tuples they depend on.
     """
-
+    ids = set()
+    dependencies = set()
+    for traintuple in spec.traintuples or list():
+        ids.add(traintuple.traintuple_id)
+        dependencies.update(traintuple.in_models_ids or list())
+    for aggregatetuple in spec.aggregatetuples or list():
+        ids.add(aggregatetuple.aggregatetuple_id)
+        dependencies.update(aggregatetuple.in_models_ids or list())
+    for compositetuple in spec.composite_traintuples or list():
+        ids.add(compositetuple.composite_traintuple_id)
+        dependencies.update(
+            model
+            for model in [compositetuple.in_head_model_id, compositetuple.in_trunk_model_id]
+            if model
+        )
+    for testtuple in spec.testtuples or list():
+        dependencies.add(testtuple.traintuple_id)
+    return ids, dependencies - ids
+
+
+def _get_ranked_tuples(spec, is_creation):
+    """Return the tuples of the spec sorted by rank, as (rank, spec field, tuple spec)."""
     # Create the dependency graph and get the dict
     # of tuples by id
     (
@@ -129,62 +119,81 @@ def auto_batching(spec, is_creation: bool = True, batch_size: int = 20):
         node_graph=tuple_graph, node_to_ignore=already_created_ids
     )
 
-    # Add the testtuples to 'visited' to take them into account in the batches
-    testtuples_by_ids = dict()
-    if spec.testtuples:
-        for testtuple in spec.testtuples:
-            # Rank 0 if testtuple.traintuple_id is in the nodes to ignore
-            if testtuple.traintuple_id not in id_ranks:
-                id_ranks["test_" + testtuple.traintuple_id] = 0
-            else:
-                id_ranks["test_" + testtuple.traintuple_id] = (
-                    id_ranks[testtuple.traintuple_id] + 1
-                )
-            testtuples_by_ids["test_" + testtuple.traintuple_id] = testtuple
-
-    # Sort the tuples by rank
-    sorted_by_rank = sorted(id_ranks.items(), key=lambda item: item[1])
-
-    # Create / update by batch
-    for i in range(math.ceil(len(sorted_by_rank) / batch_size)):
-        start = i * batch_size
-        end = min(len(sorted_by_rank), (i + 1) * batch_size)
+    ranked_tuples = list()
+    for field, tuples_by_ids in (
+        ('traintuples', traintuples_by_ids),
+        ('aggregatetuples', aggregatetuples_by_ids),
+        ('composite_traintuples', composite_traintuples_by_ids),
+    ):
+        for tuple_id, tuple_spec in tuples_by_ids.items():
+            ranked_tuples.append((id_ranks[tuple_id], field, tuple_spec))
+
+    for testtuple in spec.testtuples or list():
+        # Rank 0 if testtuple.traintuple_id is in the nodes to ignore
+        if testtuple.traintuple_id not in id_ranks:
+            rank = 0
+        else:
+            rank = id_ranks[testtuple.traintuple_id] + 1
+        ranked_tuples.append((rank, 'testtuples', testtuple))
+
+    # the sort is stable: the tuples of a same rank keep the order of the spec
+    ranked_tuples.sort(key=lambda item: item[0])
+    return ranked_tuples
+
+
+def _split_in_batches(ranked_tuples, batch_size, max_batch_bytes, batch_by_rank):
+    batch = list()
+    batch_bytes = 0
+    batch_rank = None
+    for rank, field, tuple_spec in ranked_tuples:
+        size = len(tuple_spec.json(exclude_none=True)) if max_batch_bytes else 0
+        if batch and (
+            len(batch) >= batch_size
+            or (max_batch_bytes and batch_bytes + size > max_batch_bytes)
+            or (batch_by_rank and rank != batch_rank)
+        ):
+            yield batch
+            batch = list()
+            batch_bytes = 0
+        batch.append((field, tuple_spec))
+        batch_bytes += size
+        batch_rank = rank
+    if batch:
+        yield batch
+
+
+def auto_batching(
+    spec,
+    is_creation: bool = True,
+    batch_size: int = 20,
+    max_batch_bytes: typing.Optional[int] = None,
+    batch_by_rank: bool = False,
+):
+    """Auto batching of the compute plan tuples
+
+    The tuples are sent by increasing rank so that the dependencies of a tuple are
+    always in a previous batch or in the same one. A batch contains at most `batch_size`
+    tuples and, if `max_batch_bytes` is set, the serialized tuples of a batch are at
+    most `max_batch_bytes` long, unless a single tuple is larger. If `batch_by_rank`
+    is True, a batch only contains tuples of the same rank.
+
+    The batches share the tuple specs of the spec, they are not copied.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive.")
+
+    ranked_tuples = _get_ranked_tuples(spec, is_creation)
+    batches = _split_in_batches(ranked_tuples, batch_size, max_batch_bytes, batch_by_rank)
+
+    for i, batch in enumerate(batches):
+        tuples = {field: list() for field in _TUPLE_FIELDS}
+        for field, tuple_spec in batch:
+            tuples[field].append(tuple_spec)
 
         if i == 0 and is_creation:
             # Compute plan does not exist (ie first batch of a creation):
             # we create it
-            tmp_spec = deepcopy(spec)
-            (
-                tmp_spec.traintuples,
-                tmp_spec.aggregatetuples,
-                tmp_spec.composite_traintuples,
-                tmp_spec.testtuples,
-            ) = filter_tuples_in_list(
-                sorted_by_rank[start:end],
-                traintuples_by_ids,
-                aggregatetuples_by_ids,
-                composite_traintuples_by_ids,
-                testtuples_by_ids,
-            )
-            yield tmp_spec
+            yield spec.copy(update=tuples)
         else:
-            # Compute plan exists: we update it
-            tmp_spec = schemas.UpdateComputePlanSpec(
-                traintuples=list(),
-                composite_traintuples=list(),
-                aggregatetuples=list(),
-                testtuples=list(),
-            )
-            (
-                tmp_spec.traintuples,
-                tmp_spec.aggregatetuples,
-                tmp_spec.composite_traintuples,
-                tmp_spec.testtuples,
-            ) = filter_tuples_in_list(
-                sorted_by_rank[start:end],
-                traintuples_by_ids,
-                aggregatetuples_by_ids,
-                composite_traintuples_by_ids,
-                testtuples_by_ids,
-            )
-            yield tmp_spec
+            # Compute plan exists: we update it, the tuple specs are already validated
+            yield schemas.UpdateComputePlanSpec.construct(**tuples)
@@ -164,3 +164,41 @@ class BadConfiguration(SDKException):
 class UserException(SDKException):
     """User Exception"""
     pass
+
+
+class InvalidChecksum(SDKException):
+    """The checksum of a file does not match the expected one"""
+    pass
+
+
+class InvalidJournal(SDKException):
+    """The submission journal cannot be used"""
+    pass
+
+
+class InvalidManifest(SDKException):
+    """The data samples synchronization manifest cannot be used"""
+    pass
+
+
+class ComputePlanSubmissionError(SDKException):
+    """Some batches of a compute plan could not be submitted.
+
+    Attributes:
+        compute_plan_key (str): key of the compute plan
+        succeeded (list): indexes of the batches which have been submitted
+        failed (dict): exception raised for each batch which failed, by index
+        id_to_key (dict): keys of the tuples which have been submitted, by tuple id
+    """
+
+    def __init__(self, compute_plan_key, succeeded, failed, id_to_key):
+        self.compute_plan_key = compute_plan_key
+        self.succeeded = succeeded
+        self.failed = failed
+        self.id_to_key = id_to_key
+        index = min(failed)
+        msg = (
+            f"Submission of compute plan {compute_plan_key} failed at batch {index}: "
+            f"{failed[index]} ({len(succeeded)} batch(es) submitted)"
+        )
+        super().__init__(msg)
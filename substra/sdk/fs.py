@@ -11,39 +11,144 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import concurrent.futures
+import json
 import os
+import pathlib
+import threading
 
 from substra.sdk.hasher import Hasher
 
 
-_BLOCK_SIZE = 64 * 1024
+# large reads so that hashlib, which releases the GIL, hashes long blocks
+_BLOCK_SIZE = 1024 * 1024
+# hashlib releases the GIL, the files are hashed in parallel
+DEFAULT_HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
 
 
 def hash_file(path):
     """Hash a file."""
     hasher = Hasher()
+    buffer = bytearray(_BLOCK_SIZE)
+    view = memoryview(buffer)
 
-    with open(path, 'rb') as fp:
+    with open(path, 'rb', buffering=0) as fp:
         while True:
-            data = fp.read(_BLOCK_SIZE)
-            if not data:
+            size = fp.readinto(buffer)
+            if not size:
                 break
-            hasher.update(data)
+            hasher.update(view[:size])
     return hasher.compute()
 
 
-def hash_directory(path, followlinks=False):
-    """Hash a directory."""
+class HashCache:
+    """Persistent cache of the digests of the files.
 
-    if not os.path.isdir(path):
-        raise TypeError(f'{path} is not a directory.')
+    A digest is reused as long as the path, inode, size and modification time of the file
+    are unchanged, so that the unchanged files are not read again. The cache is a JSON file
+    written when `save` is called, the owner of the cache saves it once all the files have
+    been hashed. The entries of the files which no longer exist are dropped when saving.
+    """
 
-    hash_values = []
-    for root, dirs, files in os.walk(path, topdown=True, followlinks=followlinks):
-        dirs.sort()
-        files.sort()
+    def __init__(self, path):
+        self.path = pathlib.Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._modified = False
+        # {path: [inode, size, mtime_ns, digest]}
+        self._entries = dict()
+        try:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            # no cache yet or corrupted cache
+            pass
 
-        for fname in files:
-            hash_values.append(hash_file(os.path.join(root, fname)))
+    @staticmethod
+    def _signature(stat):
+        return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
 
-    return Hasher(values=sorted(hash_values)).compute()
+    def get(self, path, stat):
+        entry = self._entries.get(path)
+        if entry and entry[:3] == self._signature(stat):
+            return entry[3]
+        return None
+
+    def set(self, path, stat, digest):
+        with self._lock:
+            self._entries[path] = self._signature(stat) + [digest]
+            self._modified = True
+
+    def save(self):
+        with self._lock:
+            removed = [path for path in self._entries if not os.path.exists(path)]
+            for path in removed:
+                del self._entries[path]
+            if not self._modified and not removed:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+            self._modified = False
+
+
+def hash_directory(path, followlinks=False, max_workers=DEFAULT_HASH_WORKERS, cache=None):
+    """Hash a directory.
+
+    The files are hashed in parallel. If a cache is given, the digests of the files
+    which did not change since they were cached are not computed again; the cache is not
+    saved, see `HashCache.save`.
+
+    Args:
+        path (str): path of the directory
+        followlinks (bool): whether to walk the directories pointed by symlinks
+        max_workers (int): maximum number of files hashed at the same time
+        cache (HashCache, optional): persistent cache of the digests of the files
+    """
+    return hash_directories(
+        [path], followlinks=followlinks, max_workers=max_workers, cache=cache,
+    )[path]
+
+
+def hash_directories(paths, followlinks=False, max_workers=DEFAULT_HASH_WORKERS, cache=None):
+    """Hash several directories, see `hash_directory`.
+
+    The files of all the directories are hashed by the same thread pool, so that many
+    small directories are hashed as fast as a large one.
+
+    Returns:
+        dict: digest of each directory, by path
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            raise TypeError(f'{path} is not a directory.')
+
+    hash_values = {path: [] for path in paths}
+    to_hash = []
+    for path in paths:
+        for root, dirs, files in os.walk(path, topdown=True, followlinks=followlinks):
+            for fname in files:
+                file_path = os.path.abspath(os.path.join(root, fname))
+                if cache is None:
+                    to_hash.append((path, file_path, None))
+                    continue
+                stat = os.stat(file_path)
+                digest = cache.get(file_path, stat)
+                if digest is None:
+                    to_hash.append((path, file_path, stat))
+                else:
+                    hash_values[path].append(digest)
+
+    if to_hash:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as e:
+            digests = list(e.map(hash_file, [file_path for _, file_path, _ in to_hash]))
+        for (path, file_path, stat), digest in zip(to_hash, digests):
+            hash_values[path].append(digest)
+            if cache is not None:
+                cache.set(file_path, stat, digest)
+
+    # the digest does not depend on the order in which the files are hashed
+    return {
+        path: Hasher(values=sorted(values)).compute() for path, values in hash_values.items()
+    }
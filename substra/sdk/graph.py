@@ -12,37 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import typing
 
 from substra.sdk import exceptions
 
 
-def _get_inverted_node_graph(node_graph, node_to_ignore):
-    """Get the graph {node_id: nodes that depend on this one}
-    Also this graph does not contain the nodes to ignore
-    """
-    inverted = dict()
-    for node, dependencies in node_graph.items():
-        if node not in node_to_ignore:
-            for dependency in dependencies:
-                if dependency not in node_to_ignore:
-                    inverted.setdefault(dependency, list())
-                    inverted[dependency].append(node)
-    return inverted
-
-
-def _get_current_node(visited, ranks):
-    """Find the next node to visit: node with the minimum rank not yet visited."""
-    current_node = None
-    current_rank = None
-    for node, rank in ranks.items():
-        if node not in visited and (current_rank is None or rank < current_rank):
-            current_node = node
-            current_rank = rank
-    # Failure means that there is a closed cycle: A -> B -> ... -> A
-    if current_node is None:
-        raise exceptions.InvalidRequest("missing dependency among inModels IDs", 400)
-    return current_node
+def _find_cycle(node_graph, remaining):
+    """Find a cycle among the remaining nodes, each of them has at least one remaining
+    dependency. Returns the nodes of the cycle, each one depending on the previous one."""
+    node = next(node for node in node_graph if node in remaining)
+    path = []
+    position = dict()
+    while node not in position:
+        position[node] = len(path)
+        path.append(node)
+        node = next(dep for dep in node_graph[node] if dep in remaining)
+    cycle = path[position[node]:]
+    cycle.append(node)
+    cycle.reverse()
+    return cycle
 
 
 def compute_ranks(
@@ -52,53 +41,76 @@ def compute_ranks(
 ) -> typing.Dict[str, int]:
     """Compute the ranks of the nodes in the graph.
 
+    The rank of a node is the length of the longest path from a node without dependencies,
+    it is computed in a single traversal of the graph in topological order.
+
     Args:
         node_graph (typing.Dict[str, typing.List[str]]):
             Dict {node_id: list of nodes it depends on}.
             Node graph keys must not contain any node to ignore.
         node_to_ignore (typing.Set[str], optional): List of nodes to ignore.
             Defaults to None.
-        ranks (typing.Dict[str, int]): Already computed ranks. Defaults to None.
+        ranks (typing.Dict[str, int]): Already computed ranks, the nodes which are not in
+            the node graph can be dependencies of the nodes of the graph. Defaults to None.
 
     Raises:
-        exceptions.InvalidRequest: If the node graph contains a cycle
+        exceptions.InvalidRequest: If the node graph contains a cycle or depends on an
+            unknown node
 
     Returns:
         typing.Dict[str, int]: Dict { node_id : rank }
     """
     ranks = ranks or dict()
-    visited = set()
     node_to_ignore = node_to_ignore or set()
 
     extra_nodes = set(node_graph.keys()).intersection(node_to_ignore)
     if len(extra_nodes) > 0:
         raise ValueError(f"node_graph keys should not contain any node to ignore: {extra_nodes}")
 
-    inverted_node_graph = _get_inverted_node_graph(node_graph, node_to_ignore)
-
-    # Assign rank 0 to nodes without deps
+    # {node_id: nodes that depend on this one} and number of dependencies not yet ranked
+    children = dict()
+    pending = dict()
     for node, dependencies in node_graph.items():
-        if node not in node_to_ignore:
-            actual_deps = [dep for dep in dependencies if dep not in node_to_ignore]
-            if len(actual_deps) == 0:
-                ranks[node] = 0
-
-    edges = set()
-
-    while len(visited) != len(node_graph):
-        current_node = _get_current_node(visited, ranks)
-        visited.add(current_node)
-        for child in inverted_node_graph.get(current_node, list()):
-            ranks[child] = max(ranks[current_node] + 1, ranks.get(child, -1))
-
-            # Cycle detection
-            edge = (current_node, child)
-            if (edge[1], edge[0]) in edges:
+        has_dependencies = False
+        count = 0
+        for dependency in dependencies:
+            if dependency in node_to_ignore:
+                continue
+            has_dependencies = True
+            if dependency in node_graph:
+                children.setdefault(dependency, list()).append(node)
+                count += 1
+            elif dependency in ranks:
+                ranks[node] = max(ranks[dependency] + 1, ranks.get(node, -1))
+            else:
                 raise exceptions.InvalidRequest(
-                    f"missing dependency among inModels IDs, \
-                        circular dependency between {edge[0]} and {edge[1]}", 400
+                    f"missing dependency among inModels IDs: {node} depends on "
+                    f"unknown {dependency}", 400
                 )
-            else:
-                edges.add(edge)
+        if not has_dependencies:
+            # Assign rank 0 to nodes without deps
+            ranks[node] = 0
+        pending[node] = count
+
+    queue = collections.deque(node for node, count in pending.items() if count == 0)
+    n_visited = 0
+    while queue:
+        current_node = queue.popleft()
+        n_visited += 1
+        rank = ranks[current_node] + 1
+        for child in children.get(current_node, ()):
+            if rank > ranks.get(child, -1):
+                ranks[child] = rank
+            pending[child] -= 1
+            if pending[child] == 0:
+                queue.append(child)
+
+    if n_visited != len(node_graph):
+        remaining = {node for node, count in pending.items() if count > 0}
+        cycle = _find_cycle(node_graph, remaining)
+        raise exceptions.InvalidRequest(
+            "missing dependency among inModels IDs, circular dependency: "
+            + " -> ".join(str(node) for node in cycle), 400
+        )
 
     return ranks
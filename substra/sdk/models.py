@@ -13,12 +13,14 @@
 # limitations under the License.
 import abc
 import enum
+import functools
 import re
 
 from typing import ClassVar, Dict, List, Optional, Union
 
 import pydantic
 from pydantic import DirectoryPath, FilePath, AnyUrl
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 
 from substra.sdk import schemas
 
@@ -355,8 +357,200 @@ SCHEMA_TO_MODEL = {
     schemas.Type.ComputePlan: ComputePlan,
     schemas.Type.DataSample: DataSample,
     schemas.Type.Dataset: Dataset,
+    schemas.Type.Model: OutModel,
     schemas.Type.Objective: Objective,
     schemas.Type.Testtuple: Testtuple,
     schemas.Type.Traintuple: Traintuple,
     schemas.Type.Node: Node
 }
+
+
+def _is_model(type_):
+    return isinstance(type_, type) and issubclass(type_, pydantic.BaseModel)
+
+
+def _is_enum(type_):
+    return isinstance(type_, type) and issubclass(type_, enum.Enum)
+
+
+@functools.lru_cache(maxsize=None)
+def _construction_plan(model_class):
+    """Fields of the model class with the conversion of their value."""
+    plan = dict()
+    for name, field in model_class.__fields__.items():
+        if _is_model(field.type_) and field.shape in (SHAPE_SINGLETON, SHAPE_LIST):
+            convert = functools.partial(construct, field.type_)
+            if field.shape == SHAPE_LIST:
+                convert = functools.partial(_map, convert)
+        elif _is_enum(field.type_) and field.shape == SHAPE_SINGLETON:
+            convert = field.type_
+        else:
+            convert = None
+        plan[name] = (field, field.pre_validators or (), convert)
+    return plan
+
+
+def _map(convert, values):
+    return [convert(v) for v in values]
+
+
+def _construct_value(model_class, name, value, values):
+    field, pre_validators, convert = _construction_plan(model_class)[name]
+    for validator in pre_validators:
+        value = validator(model_class, value, values, field, model_class.__config__)
+    if value is not None and convert is not None:
+        value = convert(value)
+    return value
+
+
+def _validate_value(model_class, name, value, values):
+    field = model_class.__fields__[name]
+    value, errors = field.validate(value, values, loc=name, cls=model_class)
+    if errors:
+        raise pydantic.ValidationError([errors], model_class)
+    return value
+
+
+def construct(model_class, data):
+    """Build a model from trusted data, without validating it.
+
+    This is much faster than the validation of large responses of the platform. The
+    nested models are built recursively, the pre validators are applied and the enums
+    are converted, the other values are used as is: the storage addresses are strings
+    and the fields unknown to the model are ignored.
+    """
+    values = dict()
+    for name in _construction_plan(model_class):
+        if name in data:
+            values[name] = _construct_value(model_class, name, data[name], values)
+    return model_class.construct(**values)
+
+
+# fields which may hold large values, parsed on first access by the lazy models
+LAZY_FIELDS = frozenset(['log', 'id_to_key', 'in_models'])
+
+
+def _is_lazy_field(name):
+    return name in LAZY_FIELDS or name.endswith('_keys')
+
+
+@functools.lru_cache(maxsize=None)
+def _lazy_field_names(model_class):
+    return tuple(name for name in model_class.__fields__ if _is_lazy_field(name))
+
+
+class _LazyModelMixin:
+    """Model whose large fields are kept as returned by the platform until they are read.
+
+    The other fields are set when the model is built. The values of the lazy fields are
+    built, and validated if required, on first access. They are all built before the
+    model is exported, compared or printed.
+    """
+
+    def __getattr__(self, name):
+        # only called for the attributes which are not set, i.e. the lazy fields
+        if name.startswith('_'):
+            raise AttributeError(name)
+        lazy_values = self._lazy_values
+        if name not in lazy_values:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+        build = _validate_value if self._validate else _construct_value
+        value = build(self.__class__, name, lazy_values[name], self.__dict__)
+        self.__dict__[name] = value
+        lazy_values.pop(name, None)
+        return value
+
+    def _materialize(self):
+        if not self._lazy_values:
+            return
+        for name in list(self._lazy_values):
+            if name in self.__dict__:
+                # the field has been set
+                self._lazy_values.pop(name, None)
+            else:
+                getattr(self, name)
+        # keep the order of the fields for the exports
+        values = {name: self.__dict__[name] for name in self.__fields__ if name in self.__dict__}
+        object.__setattr__(self, '__dict__', values)
+
+    def _iter(self, *args, **kwargs):
+        self._materialize()
+        return super()._iter(*args, **kwargs)
+
+    def __repr_args__(self):
+        self._materialize()
+        return super().__repr_args__()
+
+    def __reduce__(self):
+        # the lazy classes are created at runtime, the model is pickled as an instance of
+        # its model class
+        self._materialize()
+        return (_unpickle, (self.__model_class__, dict(self.__dict__), self.__fields_set__))
+
+
+def _unpickle(model_class, values, fields_set):
+    return model_class.construct(_fields_set=fields_set, **values)
+
+
+@functools.lru_cache(maxsize=None)
+def get_lazy_class(model_class):
+    """Subclass of the model class whose large fields are built on first access."""
+    return type(f'Lazy{model_class.__name__}', (_LazyModelMixin, model_class), {
+        '__module__': __name__,
+        '__doc__': model_class.__doc__,
+        '__model_class__': model_class,
+        '__annotations__': {'_lazy_values': dict, '_validate': bool},
+        '_lazy_values': pydantic.PrivateAttr(default_factory=dict),
+        '_validate': pydantic.PrivateAttr(default=True),
+    })
+
+
+def build_lazy(model_class, data, validate=True):
+    """Build a model whose large fields are only built on first access.
+
+    If the data has no large field, the model is built as usual.
+
+    Args:
+        model_class: class of the model
+        data (dict): values of the fields, as returned by the platform
+        validate (bool): whether to validate the values, if False the model is built as
+            with `construct`
+    """
+    if not any(name in data for name in _lazy_field_names(model_class)):
+        # nothing to defer
+        return model_class(**data) if validate else construct(model_class, data)
+
+    lazy_class = get_lazy_class(model_class)
+    if validate:
+        unknown = set(data) - set(model_class.__fields__)
+        if unknown:
+            raise pydantic.ValidationError([
+                pydantic.error_wrappers.ErrorWrapper(pydantic.errors.ExtraError(), loc=name)
+                for name in sorted(unknown)
+            ], model_class)
+
+    values = dict()
+    lazy_values = dict()
+    for name, field in model_class.__fields__.items():
+        if name not in data:
+            if validate and field.required:
+                raise pydantic.ValidationError([pydantic.error_wrappers.ErrorWrapper(
+                    pydantic.errors.MissingError(), loc=name
+                )], model_class)
+            continue
+        if _is_lazy_field(name):
+            lazy_values[name] = data[name]
+        elif validate:
+            values[name] = _validate_value(model_class, name, data[name], values)
+        else:
+            values[name] = _construct_value(model_class, name, data[name], values)
+
+    instance = lazy_class.construct(
+        _fields_set=set(values) | set(lazy_values), **values
+    )
+    for name in lazy_values:
+        # remove the default value set by construct
+        instance.__dict__.pop(name, None)
+    instance._lazy_values = lazy_values
+    instance._validate = validate
+    return instance
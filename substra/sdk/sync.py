@@ -0,0 +1,182 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Incremental registration of the data sample folders of a directory.
+
+A manifest, a JSON file, maps the digest of each data sample folder to the key of the
+data sample registered for it and to the datasets it is linked to. When the directory
+is synchronized again, only the new or changed folders are registered, the data samples
+already registered are linked to the dataset if they are not already.
+"""
+import json
+import logging
+import os
+import pathlib
+
+from substra.sdk import bulk, exceptions, fs
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '.substra-sync.json'
+MANIFEST_VERSION = 1
+
+# status of the folders whose data sample is already registered and linked
+UNCHANGED = 'unchanged'
+# status of the folders whose data sample is already registered and has been linked
+LINKED = 'linked'
+
+
+def get_default_manifest_path(root_dir):
+    return pathlib.Path(root_dir) / MANIFEST_NAME
+
+
+def get_hash_cache(manifest_path):
+    """Cache of the digests of the files, stored next to the manifest."""
+    manifest_path = pathlib.Path(manifest_path)
+    return fs.HashCache(manifest_path.with_name(manifest_path.name + '.hashes'))
+
+
+class Manifest:
+    """Data samples registered for the folders of a directory, per folder digest."""
+
+    def __init__(self, path, data_samples=None, folders=None):
+        self.path = pathlib.Path(path)
+        # {digest: {'key': key, 'test_only': bool, 'data_manager_keys': [keys]}}
+        self.data_samples = data_samples or dict()
+        # {folder name: digest}, digests of the folders at the last synchronization
+        self.folders = folders or dict()
+
+    @classmethod
+    def load(cls, path):
+        path = pathlib.Path(path)
+        if not path.exists():
+            return cls(path)
+        with open(path) as f:
+            content = json.load(f)
+        if content.get('version') != MANIFEST_VERSION:
+            raise exceptions.InvalidManifest(
+                f"Unsupported manifest version: {content.get('version')}"
+            )
+        return cls(path, content['data_samples'], content['folders'])
+
+    def save(self):
+        """Write the manifest atomically so that it is never partially written."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'data_samples': self.data_samples,
+                'folders': self.folders,
+            }, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, digest, test_only):
+        entry = self.data_samples.get(digest)
+        if entry is None or entry['test_only'] != test_only:
+            return None
+        return entry
+
+    def record(self, digest, key, test_only, dataset_key):
+        entry = self.data_samples.get(digest)
+        if entry is None or entry['key'] != key:
+            entry = {'key': key, 'test_only': test_only, 'data_manager_keys': []}
+            self.data_samples[digest] = entry
+        if dataset_key not in entry['data_manager_keys']:
+            entry['data_manager_keys'].append(dataset_key)
+
+
+def list_folders(root_dir):
+    """Data sample folders of the directory, sorted by name."""
+    names = sorted(
+        entry.name for entry in os.scandir(root_dir)
+        if entry.is_dir() and not entry.name.startswith('.')
+    )
+    return [os.path.join(root_dir, name) for name in names]
+
+
+class Synchronizer:
+    """Register the new or changed data sample folders of a directory.
+
+    Args:
+        add (callable): registers the data samples of the folders whose paths are given
+            as argument, returns a `bulk.Report`
+        link (callable): links the data samples whose keys are given as argument to the
+            dataset
+        manifest (Manifest): data samples already registered
+        hash_cache (fs.HashCache, optional): cache of the digests of the files
+        progress (callable, optional): called with the number of folders which are not
+            registered again, the progress of the others is reported by `add`
+    """
+
+    def __init__(self, add, link, manifest, hash_cache=None, progress=None):
+        self._add = add
+        self._link = link
+        self._manifest = manifest
+        self._hash_cache = hash_cache
+        self._progress = progress
+
+    def run(self, root_dir, dataset_key, test_only=False) -> bulk.Report:
+        paths = list_folders(root_dir)
+        digests = fs.hash_directories(paths, cache=self._hash_cache)
+        if self._hash_cache is not None:
+            self._hash_cache.save()
+
+        results = dict()
+        to_add = list()
+        to_link = list()
+        for path in paths:
+            entry = self._manifest.get(digests[path], test_only)
+            if entry is None:
+                to_add.append(path)
+            elif dataset_key in entry['data_manager_keys']:
+                results[path] = bulk.PathReport(path, UNCHANGED, entry['key'])
+            else:
+                to_link.append(path)
+
+        if self._progress:
+            self._progress(len(paths) - len(to_add))
+
+        if to_link:
+            keys = [self._manifest.get(digests[p], test_only)['key'] for p in to_link]
+            self._link(keys)
+            for path, key in zip(to_link, keys):
+                self._manifest.record(digests[path], key, test_only, dataset_key)
+                results[path] = bulk.PathReport(path, LINKED, key)
+            self._manifest.save()
+
+        if to_add:
+            n_changed = sum(1 for p in to_add if os.path.basename(p) in self._manifest.folders)
+            logger.info(
+                f'{len(to_add) - n_changed} new and {n_changed} changed data sample '
+                f'folder(s) in {root_dir}'
+            )
+            report = self._add(to_add)
+            # the data samples which already exist have not been linked to the dataset
+            # when they were added
+            existing_keys = [
+                r.key for r in report.results if r.status == bulk.EXISTS and r.key
+            ]
+            if existing_keys:
+                self._link(existing_keys)
+            for result in report.results:
+                results[result.path] = result
+                if result.status == bulk.FAILED or result.key is None:
+                    continue
+                self._manifest.record(digests[result.path], result.key, test_only,
+                                      dataset_key)
+            self._manifest.save()
+
+        self._manifest.folders = {os.path.basename(p): digests[p] for p in paths}
+        self._manifest.save()
+        return bulk.Report([results[path] for path in paths])
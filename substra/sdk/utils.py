@@ -12,20 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import codecs
 import contextlib
 import copy
 import io
 import functools
+import json
 import logging
 import time
 import os
 import re
+import tempfile
 from urllib.parse import quote
-import zipfile
 
 import ntpath
 
-from substra.sdk import exceptions
+from substra.sdk import archive, exceptions
 
 
 def path_leaf(path):
@@ -58,19 +61,23 @@ def extract_files(data, file_attributes):
             f.close()
 
 
-def zip_folder(fp, path):
-    zipf = zipfile.ZipFile(fp, 'w', zipfile.ZIP_DEFLATED)
-    for root, dirs, files in os.walk(path):
-        for f in files:
-            abspath = os.path.join(root, f)
-            archive_path = os.path.relpath(abspath, start=path)
-            zipf.write(abspath, arcname=archive_path)
-    zipf.close()
+def zip_folder(fp, path, compresslevel=None):
+    """Zip a folder, the files are compressed in parallel and the already compressed
+    files are stored as is."""
+    archive.write_zip(fp, path, compresslevel=compresslevel)
 
 
-def zip_folder_in_memory(path):
+def zip_folder_in_memory(path, compresslevel=None):
     fp = io.BytesIO()
-    zip_folder(fp, path)
+    zip_folder(fp, path, compresslevel=compresslevel)
+    fp.seek(0)
+    return fp
+
+
+def zip_folder_in_temporary_file(path, compresslevel=None):
+    """Zip a folder in an anonymous temporary file, deleted when closed."""
+    fp = tempfile.TemporaryFile()
+    zip_folder(fp, path, compresslevel=compresslevel)
     fp.seek(0)
     return fp
 
@@ -87,15 +94,23 @@ def extract_data_sample_files(data):
         del data[attr]
 
     if data.get('paths'):  # field is set and is not None/empty
-        for p in data['paths']:
+        for p in list(data['paths']):
             folders[path_leaf(p)] = p
             data['paths'].remove(p)
 
-    files = {}
-    for k, f in folders.items():
+    for f in folders.values():
         if not os.path.isdir(f):
             raise exceptions.LoadDataException(f"Paths '{f}' is not an existing directory")
-        files[k] = zip_folder_in_memory(f)
+
+    # the archives are written to disk as data samples may not fit in memory
+    files = {}
+    try:
+        for k, f in folders.items():
+            files[k] = zip_folder_in_temporary_file(f)
+    except Exception:
+        for f in files.values():
+            f.close()
+        raise
 
     try:
         yield (data, files)
@@ -192,6 +207,35 @@ def retry_on_exception(exceptions, timeout=300):
     return _retry
 
 
+def async_retry_on_exception(exceptions, timeout=300):
+    """Retry coroutine function in case of exception(s).
+
+    Same as `retry_on_exception` but the delay between two attempts does not block
+    the event loop.
+    """
+    def _retry(f):
+        @functools.wraps(f)
+        async def wrapper(*args, **kwargs):
+            delay = 1
+            backoff = 2
+            tstart = time.time()
+
+            while True:
+                try:
+                    return await f(*args, **kwargs)
+
+                except exceptions:
+                    if timeout is not False and time.time() - tstart > timeout:
+                        raise
+                    logging.warning(
+                        f'Function {f.__name__} failed: retrying in {delay}s')
+                    await asyncio.sleep(delay)
+                    delay *= backoff
+
+        return wrapper
+    return _retry
+
+
 def response_get_destination_filename(response):
     """Get filename from content-disposition header."""
     disposition = response.headers.get('content-disposition')
@@ -203,3 +247,149 @@ def response_get_destination_filename(response):
     filename = filenames[0]
     filename = filename.strip('\'"')
     return filename
+
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACES = ' \t\n\r'
+_JSON_SEPARATORS = _JSON_WHITESPACES + ',]'
+# characters delimiting the JSON values, outside and inside of the strings
+_JSON_STRUCTURE = re.compile(r'["\[\]{},\s]')
+_JSON_STRING = re.compile(r'["\\]')
+
+
+class _ValueScanner:
+    """Find the end of a JSON value received in several chunks.
+
+    The scan resumes where it stopped when the next chunk is received, so that the
+    characters of a large value are scanned once and the value is decoded once.
+    """
+
+    def __init__(self, position):
+        self.position = position
+        self._depth = 0
+        self._in_string = False
+
+    def scan(self, buffer):
+        """Return the end of the value if it is complete in the buffer, None otherwise."""
+        while True:
+            if self._in_string:
+                match = _JSON_STRING.search(buffer, self.position)
+                if match is None:
+                    self.position = len(buffer)
+                    return None
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        # the escaped character is in the next chunk
+                        self.position = match.start()
+                        return None
+                    self.position = match.end() + 1
+                    continue
+                self._in_string = False
+                self.position = match.end()
+                if self._depth == 0:
+                    return self.position
+                continue
+
+            match = _JSON_STRUCTURE.search(buffer, self.position)
+            if match is None:
+                self.position = len(buffer)
+                return None
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in '[{':
+                self._depth += 1
+            elif char in ']}' and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    return match.end()
+            elif self._depth == 0:
+                # end of a number or of a literal
+                return match.start()
+            self.position = match.end()
+
+
+def iter_json_array(chunks):
+    """Parse a JSON array from an iterable of bytes chunks.
+
+    Items are yielded as soon as they are complete so that the whole document never
+    needs to be held in memory. Raises ValueError if the document is not a valid
+    JSON array.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    expect_item = True
+    after_comma = False
+    # scanner of an item received in several chunks
+    scanner = None
+    chunks = iter(chunks)
+    exhausted = False
+
+    while True:
+        # skip the separators of the array
+        while scanner is None and position < len(buffer):
+            char = buffer[position]
+            if char in _JSON_WHITESPACES:
+                position += 1
+            elif not started:
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array, got '{char}'")
+                started = True
+                position += 1
+            elif char == ',' and not expect_item:
+                expect_item = True
+                after_comma = True
+                position += 1
+            elif char == ']':
+                if after_comma:
+                    raise ValueError(f"Expected an item at position {position}")
+                return
+            else:
+                break
+
+        if started and position < len(buffer):
+            end = None
+            if scanner is None:
+                try:
+                    item, end = _JSON_DECODER.raw_decode(buffer, position)
+                except ValueError:
+                    if exhausted:
+                        raise
+                # a number may be cut by the end of the chunk: only accept an item which
+                # is followed by a separator
+                if end is not None and not exhausted and not (
+                        end < len(buffer) and buffer[end] in _JSON_SEPARATORS):
+                    end = None
+                if end is None:
+                    # the item is completed by the next chunks, it is only decoded again
+                    # once it has been received
+                    scanner = _ValueScanner(position)
+            if scanner is not None and (scanner.scan(buffer) is not None or exhausted):
+                scanner = None
+                item, end = _JSON_DECODER.raw_decode(buffer, position)
+            if end is not None:
+                if not expect_item:
+                    raise ValueError(f"Expected ',' or ']' at position {position}")
+                yield item
+                expect_item = False
+                after_comma = False
+                position = end
+                continue
+
+        if exhausted:
+            raise ValueError("Unexpected end of JSON array")
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            exhausted = True
+            chunk = b''
+            buffer += decoder.decode(chunk, final=True)
+        else:
+            buffer += decoder.decode(chunk)
+        if position:
+            buffer = buffer[position:]
+            if scanner is not None:
+                scanner.position -= position
+            position = 0
@@ -18,7 +18,7 @@ from substra.sdk import models
 import pydantic
 
 from .. import datastore
-from .utils import mock_requests
+from .utils import mock_requests, mock_requests_responses, mock_response
 
 
 def test_add_dataset(client, dataset_query, mocker):
@@ -136,3 +136,63 @@ def test_add_data_samples(client, data_samples_query, mocker):
 def test_add_data_samples_with_path(client, data_sample_query):
     with pytest.raises(ValueError):
         client.add_data_samples(data_sample_query)
+
+
+def test_add_data_samples_in_bulk(client, data_samples_query, mocker):
+    m = mock_requests_responses(mocker, "post", [
+        mock_response([{"key": "1"}, {"key": "2"}]),
+        mock_response([{"key": "3"}]),
+    ])
+    progress = mocker.MagicMock()
+    report = client.add_data_samples_in_bulk(
+        data_samples_query, chunk_size=2, max_workers=1, progress=progress,
+    )
+
+    assert report.keys == ['1', '2', '3']
+    assert [r.status for r in report.results] == ['created'] * 3
+    assert report.failed == []
+    assert m.call_count == 2
+    assert progress.call_args_list == [mocker.call(2), mocker.call(1)]
+
+
+def test_add_data_samples_in_bulk_retry(client, data_samples_query, mocker):
+    mocker.patch('substra.sdk.bulk.time.sleep')
+    m = mock_requests_responses(mocker, "post", [
+        mock_response(status=500),
+        mock_response([{"key": "1"}, {"key": "2"}, {"key": "3"}]),
+    ])
+    report = client.add_data_samples_in_bulk(data_samples_query)
+
+    assert report.keys == ['1', '2', '3']
+    assert m.call_count == 2
+
+
+def test_add_data_samples_in_bulk_partial_failure(client, data_samples_query, mocker):
+    data_samples_query['paths'].insert(1, '/does/not/exist')
+    m = mock_requests_responses(mocker, "post", [
+        mock_response([{"key": "1"}]),
+        mock_response([{"key": "2"}], status=409),
+        mock_response([{"key": "3"}]),
+    ])
+    report = client.add_data_samples_in_bulk(data_samples_query, max_workers=1)
+
+    assert report.keys == ['1', '2', '3']
+    assert [r.status for r in report.results] == ['created', 'failed', 'exists', 'created']
+    assert report.failed[0].path == '/does/not/exist'
+    assert 'LoadDataException' in report.failed[0].error
+    # the invalid chunk is split, each path is sent in its own request
+    assert m.call_count == 3
+
+
+def test_add_data_samples_in_bulk_unknown_existing_key(client, data_samples_query, mocker):
+    mock_requests_responses(mocker, "post", [
+        # the key of the existing data sample cannot be determined
+        mock_response([{"key": "a"}, {"key": "b"}], status=409),
+        mock_response([{"key": "1"}]),
+        mock_response([{"key": "2"}]),
+    ])
+    report = client.add_data_samples_in_bulk(data_samples_query, chunk_size=1, max_workers=1)
+
+    # the existing data sample whose key is unknown is not listed in the keys
+    assert [r.status for r in report.results] == ['exists', 'created', 'created']
+    assert report.keys == ['1', '2']
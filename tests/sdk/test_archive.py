@@ -0,0 +1,119 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import zipfile
+
+import pytest
+
+from substra.sdk import archive
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / 'folder'
+    files = {
+        'text.txt': b'content ' * 10000,
+        'dir/image.PNG': b'png ' * 1000,
+        'dir/random.bin': os.urandom(10000),
+        'dir/sub/données.csv': b'a,b\n1,2\n' * 1000,
+        'empty.txt': b'',
+    }
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return root, files
+
+
+def _zip(path, **kwargs):
+    fp = io.BytesIO()
+    archive.write_zip(fp, str(path), **kwargs)
+    fp.seek(0)
+    return zipfile.ZipFile(fp)
+
+
+def _check_content(zipf, files):
+    assert zipf.testzip() is None
+    assert sorted(zipf.namelist()) == sorted(files)
+    for name, content in files.items():
+        assert zipf.read(name) == content
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_write_zip(folder, max_workers):
+    path, files = folder
+
+    zipf = _zip(path, max_workers=max_workers)
+
+    _check_content(zipf, files)
+    compress_types = {info.filename: info.compress_type for info in zipf.infolist()}
+    assert compress_types['text.txt'] == zipfile.ZIP_DEFLATED
+    # already compressed file type
+    assert compress_types['dir/image.PNG'] == zipfile.ZIP_STORED
+    # deflate does not reduce the size
+    assert compress_types['dir/random.bin'] == zipfile.ZIP_STORED
+
+
+def test_write_zip_compresslevel(folder):
+    path, files = folder
+
+    sizes = dict()
+    for level in (0, 1, 9):
+        zipf = _zip(path, compresslevel=level)
+        _check_content(zipf, files)
+        sizes[level] = zipf.getinfo('text.txt').compress_size
+
+    assert sizes[9] <= sizes[1] < sizes[0]
+
+
+def test_write_zip_large_files(folder, monkeypatch):
+    path, files = folder
+    # the large files are compressed while they are written and the compressed files
+    # are written as soon as the pending size is exceeded
+    monkeypatch.setattr(archive, '_MAX_PARALLEL_SIZE', 20000)
+    monkeypatch.setattr(archive, '_MAX_PENDING_SIZE', 10000)
+
+    zipf = _zip(path)
+
+    _check_content(zipf, files)
+    assert zipf.getinfo('text.txt').compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_write_zip_larger_than_parallel_size(tmp_path):
+    # files larger than 32 MiB are compressed by ZipFile.write
+    path = tmp_path / 'folder'
+    path.mkdir()
+    files = {
+        'large.csv': b'a,b\n1,2\n' * (archive._MAX_PARALLEL_SIZE // 8 + 1),
+        'small.csv': b'a,b\n1,2\n' * 1000,
+    }
+    for name, content in files.items():
+        (path / name).write_bytes(content)
+
+    zipf = _zip(path)
+
+    _check_content(zipf, files)
+    assert zipf.getinfo('large.csv').compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_write_zip_without_zipfile_state(folder, monkeypatch):
+    path, files = folder
+    # the private state of ZipFile is not available
+    monkeypatch.setattr(archive, '_ZIPFILE_STATE', ('_unknown',))
+
+    zipf = _zip(path)
+
+    _check_content(zipf, files)
+    assert zipf.getinfo('text.txt').compress_type == zipfile.ZIP_DEFLATED
@@ -0,0 +1,72 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pathlib
+
+import pytest
+
+from substra.sdk import artifact_cache, exceptions
+from substra.sdk.hasher import Hasher
+
+
+def _downloader(content, calls):
+    def download(destination):
+        calls.append(destination)
+        pathlib.Path(destination).write_bytes(content)
+    return download
+
+
+def test_fetch(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path / 'cache')
+    content = b'algo content'
+    checksum = Hasher(values=[content]).compute()
+    calls = []
+
+    assert not cache.fetch(checksum, tmp_path / 'first', _downloader(content, calls))
+    assert cache.fetch(checksum, tmp_path / 'second', _downloader(content, calls))
+
+    assert len(calls) == 1
+    assert (tmp_path / 'second').read_bytes() == content
+    # the files are hardlinked to the cached file
+    assert os.path.samefile(tmp_path / 'first', cache.get(checksum))
+    assert [entry.checksum for entry in cache.entries()] == [checksum]
+
+
+def test_fetch_invalid_checksum(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path / 'cache')
+
+    with pytest.raises(exceptions.InvalidChecksum):
+        cache.fetch('bad-checksum', tmp_path / 'file', _downloader(b'content', []))
+
+    assert cache.entries() == []
+    assert not (tmp_path / 'file').exists()
+
+
+def test_prune(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path / 'cache', max_size=25)
+    checksums = []
+    for i in range(3):
+        content = f'content-{i}'.encode()
+        checksum = Hasher(values=[content]).compute()
+        checksums.append(checksum)
+        cache.fetch(checksum, tmp_path / f'file-{i}', _downloader(content, []))
+        # make sure each file has a different last access time
+        os.utime(cache.get(checksum), (i, i))
+
+    # 3 files of 9 bytes, the least recently used one has been removed
+    assert [entry.checksum for entry in cache.entries()] == checksums[1:]
+
+    removed = cache.prune(0)
+    assert [entry.checksum for entry in removed] == checksums[1:]
+    assert cache.size() == 0
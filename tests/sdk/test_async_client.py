@@ -0,0 +1,221 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+
+import pytest
+
+import substra
+from substra.sdk import models
+from substra.sdk.hasher import Hasher
+
+from .. import datastore
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+
+def _run(handlers, scenario, **client_kwargs):
+    """Start a stub server with the given routes and run the scenario against it."""
+    async def main():
+        app = web.Application()
+        app.add_routes(handlers)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            url = str(server.make_url(''))
+            async with substra.AsyncClient(url=url, token='foo', **client_kwargs) as client:
+                return await scenario(client)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_get():
+    async def handler(request):
+        assert request.headers['Authorization'] == 'Token foo'
+        return web.json_response(datastore.TRAINTUPLE)
+
+    async def scenario(client):
+        return await client.get_traintuple('foo')
+
+    response = _run([web.get('/traintuple/{key}/', handler)], scenario)
+    assert response == models.Traintuple(**datastore.TRAINTUPLE)
+
+
+def test_list_with_filters():
+    queries = []
+
+    async def handler(request):
+        queries.append(request.raw_path)
+        return web.json_response([datastore.ALGO])
+
+    async def scenario(client):
+        return await client.list_algo(['algo:name:ABC'])
+
+    response = _run([web.get('/algo/', handler)], scenario)
+    assert response == [models.Algo(**datastore.ALGO)]
+    assert queries == ['/algo/?search=algo%3Aname%3AABC']
+
+
+def test_list_pagination():
+    items = [dict(datastore.ALGO, key=str(i)) for i in range(3)]
+
+    async def handler(request):
+        if request.query.get('page') == '2':
+            return web.json_response({'count': 3, 'next': None, 'results': items[2:]})
+        next_url = str(request.url.with_query({'page': '2'}))
+        return web.json_response({'count': 3, 'next': next_url, 'results': items[:2]})
+
+    async def scenario(client):
+        return await client.list_algo()
+
+    response = _run([web.get('/algo/', handler)], scenario)
+    assert response == [models.Algo(**item) for item in items]
+
+
+@pytest.mark.parametrize("status, exception", [
+    (400, substra.exceptions.InvalidRequest),
+    (404, substra.exceptions.NotFound),
+    (500, substra.exceptions.InternalServerError),
+])
+def test_http_errors(status, exception):
+    async def handler(request):
+        return web.json_response({"message": "error"}, status=status)
+
+    async def scenario(client):
+        return await client.get_algo('foo')
+
+    with pytest.raises(exception):
+        _run([web.get('/algo/{key}/', handler)], scenario)
+
+
+def test_add_already_exists(dataset_query):
+    async def handler(request):
+        form = await request.post()
+        assert json.loads(form['json'])['name'] == dataset_query['name']
+        assert 'data_opener' in form
+        return web.json_response({"key": "a-key"}, status=409)
+
+    async def scenario(client):
+        return await client.add_dataset(dataset_query)
+
+    assert _run([web.post('/data_manager/', handler)], scenario) == 'a-key'
+
+
+def _download_routes(checksum):
+    item = dict(datastore.ALGO)
+
+    async def metadata(request):
+        item['content'] = dict(
+            item['content'],
+            storage_address=str(request.url.with_path('/file/')),
+            checksum=checksum,
+        )
+        return web.json_response(item)
+
+    async def content(request):
+        return web.Response(body=b'content')
+
+    return [web.get('/algo/{key}/', metadata), web.get('/file/', content)]
+
+
+def test_download(tmp_path):
+    async def scenario(client):
+        await client.download_algo('foo', str(tmp_path))
+
+    _run(_download_routes(Hasher(values=[b'content']).compute()), scenario)
+    assert (tmp_path / 'algo.tar.gz').read_bytes() == b'content'
+
+
+def test_download_invalid_checksum(tmp_path):
+    async def scenario(client):
+        await client.download_algo('foo', str(tmp_path))
+
+    with pytest.raises(substra.exceptions.InvalidChecksum):
+        _run(_download_routes('bad-checksum'), scenario)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_model_invalid_checksum(tmp_path):
+    async def content(request):
+        return web.Response(body=b'content')
+
+    async def scenario(client):
+        await client.download_model('foo', str(tmp_path), checksum='bad-checksum')
+
+    with pytest.raises(substra.exceptions.InvalidChecksum):
+        _run([web.get('/model/{key}/file/', content)], scenario)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_max_concurrency():
+    in_flight = {'current': 0, 'max': 0}
+
+    async def handler(request):
+        in_flight['current'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        await asyncio.sleep(0.01)
+        in_flight['current'] -= 1
+        return web.json_response(datastore.TRAINTUPLE)
+
+    async def scenario(client):
+        return await asyncio.gather(*[client.get_traintuple(str(i)) for i in range(20)])
+
+    responses = _run([web.get('/traintuple/{key}/', handler)], scenario, max_concurrency=3)
+    assert len(responses) == 20
+    assert in_flight['max'] == 3
+
+
+def test_add_compute_plan_batch_by_rank():
+    received = []
+
+    def _response(batch):
+        ids = [t['traintuple_id'] for t in batch.get('traintuples', [])]
+        received.append(ids)
+        return web.json_response({**datastore.COMPUTE_PLAN, 'id_to_key': {i: i for i in ids}})
+
+    async def create(request):
+        return _response(await request.json())
+
+    async def update(request):
+        return _response(await request.json())
+
+    traintuples = [
+        {
+            'algo_key': 'algo',
+            'data_manager_key': 'dataset',
+            'train_data_sample_keys': ['sample'],
+            'traintuple_id': f'{chain}{i}',
+            'in_models_ids': [f'{chain}{i - 1}'] if i > 0 else None,
+        }
+        for chain in 'ab' for i in range(2)
+    ]
+
+    async def scenario(client):
+        return await client.add_compute_plan(
+            {'traintuples': traintuples}, batch_size=4, batch_by_rank=True,
+        )
+
+    asset = _run([
+        web.post('/compute_plan/', create),
+        web.post('/compute_plan/{key}/update_ledger/', update),
+    ], scenario)
+
+    # the batches are the same as the ones of the synchronous client
+    assert received == [['a0', 'b0'], ['a1', 'b1']]
+    assert asset.id_to_key == {'a0': 'a0', 'b0': 'b0', 'a1': 'a1', 'b1': 'b1'}
@@ -0,0 +1,273 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+import substra
+from substra.sdk import compute_plan, exceptions, models, schemas
+from substra.sdk.backends.remote import journal, submission
+
+from .. import datastore
+from .utils import mock_requests_responses, mock_response
+
+
+def _traintuple(traintuple_id, in_models_ids=None):
+    return {
+        'algo_key': 'algo',
+        'data_manager_key': 'dataset',
+        'train_data_sample_keys': ['sample'],
+        'traintuple_id': traintuple_id,
+        'in_models_ids': in_models_ids,
+    }
+
+
+@pytest.fixture
+def spec():
+    # two independent chains of 3 traintuples, each traintuple is tested twice
+    traintuples = list()
+    testtuples = list()
+    for chain in ('a', 'b'):
+        for i in range(3):
+            in_models_ids = [f'{chain}{i - 1}'] if i > 0 else None
+            traintuples.append(_traintuple(f'{chain}{i}', in_models_ids))
+            for objective_key in ('o1', 'o2'):
+                testtuples.append({'objective_key': objective_key,
+                                   'traintuple_id': f'{chain}{i}'})
+    return schemas.ComputePlanSpec(
+        traintuples=traintuples, testtuples=testtuples, tag='foo',
+    )
+
+
+def _ids(batch):
+    return [t.traintuple_id for t in batch.traintuples] + \
+        [f'test_{t.traintuple_id}' for t in batch.testtuples]
+
+
+def test_auto_batching(spec):
+    batches = list(compute_plan.auto_batching(spec, batch_size=5))
+
+    assert [len(_ids(b)) for b in batches] == [5, 5, 5, 3]
+    assert isinstance(batches[0], schemas.ComputePlanSpec)
+    assert batches[0].tag == 'foo'
+    assert all(isinstance(b, schemas.UpdateComputePlanSpec) for b in batches[1:])
+    # the tuples are sorted by rank and all the testtuples are kept
+    assert _ids(batches[0]) == ['a0', 'b0', 'a1', 'b1', 'test_a0']
+    assert sum(len(b.testtuples) for b in batches) == 12
+
+
+def test_auto_batching_does_not_copy_tuples(spec):
+    batches = list(compute_plan.auto_batching(spec, batch_size=5))
+
+    tuples = [t for b in batches for t in b.traintuples + b.testtuples]
+    spec_tuples = spec.traintuples + spec.testtuples
+    assert {id(t) for t in tuples} == {id(t) for t in spec_tuples}
+
+
+def test_auto_batching_by_rank(spec):
+    batches = list(compute_plan.auto_batching(spec, batch_size=3, batch_by_rank=True))
+
+    assert [_ids(b) for b in batches] == [
+        ['a0', 'b0'],
+        ['a1', 'b1', 'test_a0'],
+        ['test_a0', 'test_b0', 'test_b0'],
+        ['a2', 'b2', 'test_a1'],
+        ['test_a1', 'test_b1', 'test_b1'],
+        ['test_a2', 'test_a2', 'test_b2'],
+        ['test_b2'],
+    ]
+
+
+def test_auto_batching_max_bytes():
+    spec = schemas.ComputePlanSpec(
+        traintuples=[_traintuple(f'{i}') for i in range(5)],
+    )
+    size = len(spec.traintuples[0].json(exclude_none=True))
+    batches = list(compute_plan.auto_batching(
+        spec, batch_size=100, max_batch_bytes=2 * size,
+    ))
+
+    assert [len(b.traintuples) for b in batches] == [2, 2, 1]
+
+
+def test_auto_batching_update(spec):
+    spec = schemas.UpdateComputePlanSpec(
+        traintuples=[_traintuple('new', ['existing'])],
+    )
+    batches = list(compute_plan.auto_batching(spec, is_creation=False))
+
+    assert len(batches) == 1
+    assert isinstance(batches[0], schemas.UpdateComputePlanSpec)
+    assert batches[0].dict(exclude_none=True) == {
+        'traintuples': [spec.traintuples[0].dict(exclude_none=True)],
+        'aggregatetuples': [],
+        'composite_traintuples': [],
+        'testtuples': [],
+    }
+
+
+def test_add_compute_plan_auto_batching(client, spec, mocker):
+    m = mock_requests_responses(mocker, "post", [
+        mock_response(datastore.COMPUTE_PLAN) for _ in range(4)
+    ])
+
+    client.add_compute_plan(spec, batch_size=20, batch_by_rank=True)
+
+    # one request per rank, the testtuples have the rank of their traintuple + 1
+    assert m.call_count == 4
+    urls = [call[0][0] for call in m.call_args_list]
+    assert urls[0].endswith('/compute_plan/')
+    assert all(url.endswith('/update_ledger/') for url in urls[1:])
+
+
+class _Server:
+    """Record the batches received and check that their dependencies were submitted."""
+
+    def __init__(self, fail_at=None):
+        self.received = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._fail_at = fail_at
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    def _receive(self, spec):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        ids, dependencies = compute_plan.get_ids_and_dependencies(spec)
+        with self._lock:
+            self.in_flight -= 1
+            assert dependencies.issubset(self._ids)
+            index = len(self.received)
+            self.received.append(spec)
+            if index == self._fail_at:
+                raise exceptions.InvalidRequest('bad batch', 400)
+            self._ids.update(ids)
+        return models.ComputePlan(**{
+            **datastore.COMPUTE_PLAN, 'id_to_key': {i: f'key-{i}' for i in ids},
+        })
+
+    def create(self, spec):
+        return self._receive(spec)
+
+    def update(self, key, data):
+        assert key == datastore.COMPUTE_PLAN['key']
+        return self._receive(schemas.UpdateComputePlanSpec(**data))
+
+
+def test_batch_submitter(spec):
+    server = _Server()
+    batches = compute_plan.auto_batching(spec, batch_size=1, batch_by_rank=True)
+    submitter = submission.BatchSubmitter(server.create, server.update, max_in_flight=3)
+
+    asset = submitter.submit(batches)
+
+    assert len(server.received) == 18
+    assert server.max_in_flight == 3
+    assert asset.id_to_key == {f'{c}{i}': f'key-{c}{i}' for c in 'ab' for i in range(3)}
+
+
+def test_batch_submitter_default_sends_one_batch_at_a_time(spec):
+    server = _Server()
+    batches = compute_plan.auto_batching(spec, batch_size=1, batch_by_rank=True)
+    submitter = submission.BatchSubmitter(server.create, server.update)
+
+    submitter.submit(batches)
+
+    assert len(server.received) == 18
+    assert server.max_in_flight == 1
+
+
+def test_client_max_batches_in_flight():
+    client = substra.Client(url="http://foo.io", max_batches_in_flight=3)
+    assert client._backend._max_batches_in_flight == 3
+
+
+def test_batch_submitter_failure(spec):
+    server = _Server(fail_at=3)
+    batches = compute_plan.auto_batching(spec, batch_size=1)
+    submitter = submission.BatchSubmitter(server.create, server.update, max_in_flight=1)
+
+    with pytest.raises(exceptions.ComputePlanSubmissionError) as e:
+        submitter.submit(batches)
+
+    assert e.value.compute_plan_key == datastore.COMPUTE_PLAN['key']
+    assert e.value.succeeded == [0, 1, 2]
+    assert list(e.value.failed) == [3]
+    assert e.value.id_to_key == {'a0': 'key-a0', 'b0': 'key-b0', 'a1': 'key-a1'}
+
+
+def _compute_plan_response(ids):
+    return mock_response({**datastore.COMPUTE_PLAN, 'id_to_key': {i: f'key-{i}' for i in ids}})
+
+
+def test_resume_compute_plan(client, spec, tmp_path, mocker):
+    journal_path = tmp_path / 'journal'
+    mock_requests_responses(mocker, "post", [
+        _compute_plan_response(['a0', 'b0', 'a1', 'b1']),
+        _compute_plan_response([]),
+        mock_response({'message': 'bad batch'}, status=400),
+    ])
+
+    with pytest.raises(exceptions.ComputePlanSubmissionError) as e:
+        client.add_compute_plan(spec, batch_size=4, journal=str(journal_path))
+    assert e.value.succeeded == [0, 1]
+    assert list(e.value.failed) == [2]
+
+    m = mock_requests_responses(mocker, "post", [
+        _compute_plan_response(['a2', 'b2']),
+        _compute_plan_response([]),
+        _compute_plan_response([]),
+    ])
+    asset = client.resume_compute_plan(spec.dict(exclude_none=True), str(journal_path))
+
+    # the remaining batches are sent as updates of the compute plan
+    assert m.call_count == 3
+    assert all(call[0][0].endswith('/update_ledger/') for call in m.call_args_list)
+    assert asset.id_to_key == {f'{c}{i}': f'key-{c}{i}' for c in 'ab' for i in range(3)}
+
+
+def test_resume_compute_plan_modified_spec(client, spec, tmp_path, mocker):
+    journal_path = tmp_path / 'journal'
+    mock_requests_responses(mocker, "post", [
+        _compute_plan_response([]) for _ in range(5)
+    ])
+    client.add_compute_plan(spec, batch_size=4, journal=str(journal_path))
+
+    with pytest.raises(exceptions.InvalidJournal):
+        client.add_compute_plan(spec, batch_size=4, journal=str(journal_path))
+
+    spec.traintuples.pop()
+    with pytest.raises(exceptions.InvalidJournal):
+        client.resume_compute_plan(spec, str(journal_path))
+
+
+def test_journal_truncated_record(tmp_path):
+    journal_path = tmp_path / 'journal'
+    asset = models.ComputePlan(**datastore.COMPUTE_PLAN)
+    submission_journal = journal.Journal.create(journal_path, {'compute_plan_key': None})
+    submission_journal.record(0, asset)
+    with open(journal_path, 'a') as f:
+        f.write('{"batch": 1, "compute_pl')
+
+    submission_journal = journal.Journal.load(journal_path)
+    assert list(submission_journal.batches) == [0]
+    assert submission_journal.compute_plan_key == asset.key
+
+    submission_journal.record(1, asset)
+    assert list(journal.Journal.load(journal_path).batches) == [0, 1]
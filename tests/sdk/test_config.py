@@ -124,3 +124,14 @@ def test_token_with_tokens_path(tmpdir):
         token='bar',
     )
     assert client._token == 'bar'
+
+
+def test_from_config_file_session_options(tmpdir):
+    config_path = tmpdir / 'substra.json'
+    config_path.write_text(json.dumps(DUMMY_CONFIG), "UTF-8")
+
+    client = substra.Client.from_config_file(
+        config_path=config_path, profile_name='default', pool_size=3, keep_alive=False
+    )
+    assert client._pool_size == 3
+    assert client._keep_alive is False
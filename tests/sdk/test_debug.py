@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 import substra
 
 
@@ -107,3 +109,34 @@ def test_compute_plan_add_update(asset_factory):
             "traintuples": [traintuple],
         }
     )
+
+
+def test_compute_plan_journal(monkeypatch, tmp_path):
+    monkeypatch.setenv('DEBUG_SPAWNER', 'subprocess')
+    client = substra.Client(debug=True)
+    spec = substra.sdk.schemas.ComputePlanSpec(tag=None, clean_models=False, metadata=dict())
+    journal = str(tmp_path / 'journal')
+
+    # the journal is only supported by the remote backend
+    with pytest.raises(substra.exceptions.SDKException, match='journal'):
+        client.add_compute_plan(spec, journal=journal)
+    with pytest.raises(substra.exceptions.SDKException, match='resumed'):
+        client.resume_compute_plan(spec, journal)
+
+
+def test_add_data_samples_failure(monkeypatch, asset_factory, tmp_path):
+    monkeypatch.setenv('DEBUG_SPAWNER', 'subprocess')
+    client = substra.Client(debug=True)
+    dataset_key = client.add_dataset(asset_factory.create_dataset())
+    paths = [asset_factory.create_data_sample().path for _ in range(3)]
+    paths.append(tmp_path / 'missing')
+    files = set(client.temp_directory.iterdir())
+
+    with pytest.raises(substra.exceptions.InvalidRequest):
+        client.add_data_samples({
+            'paths': paths, 'data_manager_keys': [dataset_key], 'test_only': False,
+        })
+
+    # the copies of the data samples which are not registered are removed
+    assert set(client.temp_directory.iterdir()) == files
+    assert client.list_data_sample() == []
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import pytest
 import os
 
@@ -20,9 +21,33 @@ import substra
 from .. import datastore
 from .utils import mock_requests_responses, mock_requests, mock_response
 from substra.sdk import Client, backends, schemas
+from substra.sdk.hasher import Hasher
 from unittest.mock import patch
 
 
+CONTENT = b'content'
+# field of the asset describing the downloaded file
+FILE_FIELDS = {
+    'dataset': 'opener',
+    'algo': 'content',
+    'aggregate_algo': 'content',
+    'composite_algo': 'content',
+    'objective': 'metrics',
+}
+
+
+def _asset_with_checksum(asset_name, checksum):
+    item = copy.deepcopy(getattr(datastore, asset_name.upper()))
+    item[FILE_FIELDS[asset_name]]['checksum'] = checksum
+    return item
+
+
+def _content_response():
+    response = mock_response()
+    response.iter_content.return_value = [CONTENT]
+    return response
+
+
 @pytest.mark.parametrize(
     'asset_name, filename', [
         ('dataset', 'opener.py'),
@@ -34,11 +59,10 @@ from unittest.mock import patch
     ]
 )
 def test_download_asset(asset_name, filename, tmp_path, client, mocker):
-    item = getattr(datastore, asset_name.upper())
-    responses = [
-        mock_response(item),  # metadata
-        mock_response('foo'),  # data
-    ]
+    responses = [_content_response()]
+    if asset_name != 'model':
+        checksum = Hasher(values=[CONTENT]).compute()
+        responses.insert(0, mock_response(_asset_with_checksum(asset_name, checksum)))
     m = mock_requests_responses(mocker, 'get', responses)
 
     method = getattr(client, f'download_{asset_name}')
@@ -49,6 +73,21 @@ def test_download_asset(asset_name, filename, tmp_path, client, mocker):
     m.assert_called()
 
 
+@pytest.mark.parametrize('asset_name', list(FILE_FIELDS))
+def test_download_asset_invalid_checksum(asset_name, tmp_path, client, mocker):
+    responses = [
+        mock_response(_asset_with_checksum(asset_name, 'bad-checksum')),
+        _content_response(),
+    ]
+    mock_requests_responses(mocker, 'get', responses)
+
+    method = getattr(client, f'download_{asset_name}')
+    with pytest.raises(substra.sdk.exceptions.InvalidChecksum):
+        method("foo", tmp_path)
+
+    assert os.listdir(tmp_path) == []
+
+
 @pytest.mark.parametrize(
     'asset_name', ['dataset', 'algo', 'aggregate_algo', 'composite_algo', 'objective', 'model']
 )
@@ -0,0 +1,256 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import re
+
+import pytest
+import requests
+
+from substra.sdk import exceptions
+from substra.sdk.backends.remote import download
+from substra.sdk.hasher import Hasher
+
+CONTENT = os.urandom(1000)
+CHECKSUM = Hasher(values=[CONTENT]).compute()
+ETAG = '"v1"'
+
+
+class _Response:
+    def __init__(self, content, status_code, headers, fail_after=None):
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers
+        self._fail_after = fail_after
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            if self._fail_after is not None and i >= self._fail_after:
+                raise requests.exceptions.ChunkedEncodingError('connection lost')
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class _Server:
+    """Serve the content, with support of the Range and If-Range requests."""
+
+    def __init__(self, accept_ranges=True, fail_after=None, content=CONTENT, etag=ETAG):
+        self.requests = []
+        self.if_ranges = []
+        self._accept_ranges = accept_ranges
+        self._fail_after = fail_after
+        self._content = content
+        self._etag = etag
+
+    def get(self, url, headers):
+        range_ = headers.get('Range')
+        self.requests.append(range_)
+        self.if_ranges.append(headers.get('If-Range'))
+        fail_after, self._fail_after = self._fail_after, None
+        content = self._content
+
+        if range_ and self._accept_ranges and headers.get('If-Range', self._etag) == self._etag:
+            start, end = re.match(r'bytes=(\d+)-(\d*)', range_).groups()
+            start, end = int(start), int(end or len(content) - 1)
+            if start >= len(content):
+                raise exceptions.HTTPError('416', 416)
+            end = min(end, len(content) - 1)
+            return _Response(content[start:end + 1], 206, {
+                'Content-Range': f'bytes {start}-{end}/{len(content)}',
+                'ETag': self._etag,
+            }, fail_after)
+
+        return _Response(content, 200, {
+            'Content-Length': str(len(content)),
+            'Accept-Ranges': 'bytes' if self._accept_ranges else 'none',
+            'ETag': self._etag,
+        }, fail_after)
+
+
+def _downloader(server, range_size=1000):
+    return download.Downloader(server.get, chunk_size=64, range_size=range_size)
+
+
+def test_download_single_request(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == [None]
+    assert os.listdir(tmp_path) == ['model']
+
+
+def test_download_parallel_ranges(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+
+    _downloader(server, range_size=100).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    # the first request is used to get the size of the file
+    assert len(server.requests) == 11
+    assert sorted(server.requests[1:])[0] == 'bytes=0-99'
+    assert os.listdir(tmp_path) == ['model']
+
+
+def test_download_server_without_ranges(tmp_path):
+    server = _Server(accept_ranges=False)
+    destination = tmp_path / 'model'
+
+    _downloader(server, range_size=100).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == [None]
+
+
+def test_download_interrupted(tmp_path):
+    server = _Server(fail_after=128)
+    destination = tmp_path / 'model'
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == [None, 'bytes=128-']
+
+
+def _write_partial(tmp_path, content, **state):
+    (tmp_path / 'model.part').write_bytes(content)
+    state = {'url': 'url', 'validator': ETAG, 'size': len(CONTENT), **state}
+    (tmp_path / 'model.part.json').write_text(json.dumps(state))
+
+
+def test_download_interrupted_keeps_state(tmp_path):
+    server = _Server(fail_after=128)
+    destination = tmp_path / 'model'
+    downloader = download.Downloader(server.get, chunk_size=64)
+    downloader._write = _write_and_stop
+
+    with pytest.raises(KeyboardInterrupt):
+        downloader.download('url', destination)
+
+    state = json.loads((tmp_path / 'model.part.json').read_text())
+    assert state == {'url': 'url', 'validator': ETAG, 'size': len(CONTENT)}
+
+
+def _write_and_stop(response, path, mode):
+    with open(path, mode) as f:
+        f.write(next(response.iter_content(64)))
+    raise KeyboardInterrupt
+
+
+def test_resume_partial_file(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(tmp_path, CONTENT[:300])
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == ['bytes=300-']
+    assert server.if_ranges == [ETAG]
+    assert os.listdir(tmp_path) == ['model']
+
+
+@pytest.mark.parametrize('with_state', [False, True])
+def test_resume_partial_file_of_another_download(tmp_path, with_state):
+    # the partial file of another URL downloaded to the same destination is not resumed
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(tmp_path, os.urandom(400), url='other-url')
+    if not with_state:
+        (tmp_path / 'model.part.json').unlink()
+
+    _downloader(server).download('url', destination)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == [None]
+
+
+def test_resume_changed_file(tmp_path):
+    # the server ignores the Range header as the If-Range header does not match
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(tmp_path, os.urandom(300), validator='"v0"')
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == ['bytes=300-']
+
+
+def test_resume_longer_partial_file(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(tmp_path, os.urandom(1200), size=None)
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    # the server answers 416, the partial file is removed
+    assert server.requests == ['bytes=1200-', None]
+
+
+def test_resume_partial_file_of_another_size(tmp_path):
+    # the file has changed on a server without validator
+    server = _Server(etag=None)
+    destination = tmp_path / 'model'
+    _write_partial(tmp_path, os.urandom(300), validator=None, size=2000)
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests == ['bytes=300-', None]
+
+
+def test_resume_parallel_ranges(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(
+        tmp_path, CONTENT[:100] + bytes(900), ranges=[[0, 499, 100], [500, 999, 0]],
+    )
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert sorted(server.requests) == ['bytes=100-499', 'bytes=500-999']
+    assert server.if_ranges == [ETAG, ETAG]
+    assert os.listdir(tmp_path) == ['model']
+
+
+def test_resume_parallel_ranges_changed_file(tmp_path):
+    server = _Server()
+    destination = tmp_path / 'model'
+    _write_partial(
+        tmp_path, os.urandom(100) + bytes(900), validator='"v0"',
+        ranges=[[0, 499, 100], [500, 999, 0]],
+    )
+
+    _downloader(server).download('url', destination, checksum=CHECKSUM)
+
+    assert destination.read_bytes() == CONTENT
+    assert server.requests[-1] is None
+    assert os.listdir(tmp_path) == ['model']
+
+
+def test_download_invalid_checksum(tmp_path):
+    destination = tmp_path / 'model'
+
+    with pytest.raises(exceptions.InvalidChecksum):
+        _downloader(_Server()).download('url', destination, checksum='bad-checksum')
+
+    assert os.listdir(tmp_path) == []
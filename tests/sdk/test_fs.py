@@ -0,0 +1,100 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import json
+import os
+from unittest import mock
+
+import pytest
+
+from substra.sdk import fs
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / 'tree'
+    for i in range(20):
+        directory = root / f'dir_{i % 3}'
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f'file_{i}').write_bytes(os.urandom(i * 1000))
+    # larger than a block
+    (root / 'large').write_bytes(os.urandom(3 * 1024 * 1024 + 7))
+    return root
+
+
+def _expected_digest(path):
+    digests = []
+    for root, _, files in os.walk(path):
+        for fname in files:
+            with open(os.path.join(root, fname), 'rb') as f:
+                digests.append(hashlib.sha256(f.read()).hexdigest())
+    return hashlib.sha256(''.join(sorted(digests)).encode('utf-8')).hexdigest()
+
+
+def test_hash_file(tree):
+    path = tree / 'large'
+    assert fs.hash_file(path) == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_hash_directory(tree, max_workers):
+    assert fs.hash_directory(tree, max_workers=max_workers) == _expected_digest(tree)
+
+
+def test_hash_directory_not_a_directory(tree):
+    with pytest.raises(TypeError):
+        fs.hash_directory(tree / 'large')
+
+
+def test_hash_directory_cache(tree, tmp_path):
+    cache_path = tmp_path / 'hashes.json'
+    cache = fs.HashCache(cache_path)
+    expected = fs.hash_directory(tree, cache=cache)
+    # the cache is saved by its owner
+    assert not cache_path.exists()
+    cache.save()
+
+    # the unchanged files are not read again, even by a new cache instance
+    with mock.patch.object(fs, 'hash_file', wraps=fs.hash_file) as m:
+        assert fs.hash_directory(tree, cache=fs.HashCache(cache_path)) == expected
+    assert m.call_count == 0
+
+    (tree / 'dir_0' / 'file_0').write_bytes(b'modified')
+    with mock.patch.object(fs, 'hash_file', wraps=fs.hash_file) as m:
+        digest = fs.hash_directory(tree, cache=fs.HashCache(cache_path))
+    assert m.call_count == 1
+    assert digest == _expected_digest(tree) != expected
+
+
+def test_hash_cache_corrupted(tree, tmp_path):
+    cache_path = tmp_path / 'hashes.json'
+    cache_path.write_text('{')
+
+    assert fs.hash_directory(tree, cache=fs.HashCache(cache_path)) == _expected_digest(tree)
+
+
+def test_hash_cache_drops_removed_files(tree, tmp_path):
+    cache_path = tmp_path / 'hashes.json'
+    cache = fs.HashCache(cache_path)
+    fs.hash_directory(tree, cache=cache)
+    cache.save()
+    removed = os.path.abspath(tree / 'dir_0' / 'file_0')
+    assert removed in json.loads(cache_path.read_text())
+    os.remove(removed)
+
+    fs.HashCache(cache_path).save()
+
+    entries = json.loads(cache_path.read_text())
+    assert removed not in entries
+    assert all(os.path.exists(path) for path in entries)
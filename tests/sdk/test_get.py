@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pickle
+
+import pydantic
 import pytest
 import substra
 from substra.sdk import models, schemas
 
 from .. import datastore
-from .utils import mock_requests
+from .utils import mock_requests, mock_response
 
 
 @pytest.mark.parametrize('asset_name', [
@@ -44,8 +47,92 @@ def test_get_asset(asset_name, client, mocker):
     m.assert_called()
 
 
+def test_get_asset_without_validation(mocker):
+    client = substra.Client(url="http://foo.io", validate_responses=False)
+    item = dict(datastore.TESTTUPLE, traintuple_type='compositeTraintuple')
+    mock_requests(mocker, "get", response=item)
+
+    response = client.get_testtuple("magic-key")
+
+    assert response == models.Testtuple(**item)
+    # the nested models are built and the validators are applied
+    assert isinstance(response.objective.metrics, models._Metric)
+    assert response.traintuple_type == schemas.Type.CompositeTraintuple
+
+
 def test_get_asset_not_found(client, mocker):
     mock_requests(mocker, "get", status=404)
 
     with pytest.raises(substra.sdk.exceptions.NotFound):
         client.get_dataset("magic-key")
+
+
+def _mock_get_by_key(mocker, items):
+    """Mock the GET requests, the response depends on the key in the URL."""
+    def get(url, **kwargs):
+        key = url.rstrip('/').split('/')[-1]
+        if key not in items:
+            return mock_response(status=404)
+        return mock_response(items[key])
+
+    return mocker.patch(
+        'substra.sdk.backends.remote.rest_client.requests.Session.get',
+        side_effect=get,
+    )
+
+
+def test_get_many(client, mocker):
+    keys = [f'key-{i}' for i in range(50)]
+    items = {key: dict(datastore.TRAINTUPLE, key=key) for key in keys}
+    m = _mock_get_by_key(mocker, items)
+
+    response = client.get_many('traintuple', keys, max_workers=4)
+
+    assert [asset.key for asset in response] == keys
+    assert all(isinstance(asset, models.Traintuple) for asset in response)
+    assert m.call_count == len(keys)
+
+
+def test_get_many_not_found(client, mocker):
+    items = {'key-0': dict(datastore.TRAINTUPLE, key='key-0')}
+    _mock_get_by_key(mocker, items)
+
+    with pytest.raises(substra.sdk.exceptions.NotFound):
+        client.get_many(schemas.Type.Traintuple, ['key-0', 'key-1'])
+
+
+def test_get_many_return_exceptions(client, mocker):
+    items = {'key-0': dict(datastore.TRAINTUPLE, key='key-0')}
+    _mock_get_by_key(mocker, items)
+
+    response = client.get_many('traintuple', ['key-1', 'key-0'], return_exceptions=True)
+
+    assert isinstance(response[0], substra.sdk.exceptions.NotFound)
+    assert response[1].key == 'key-0'
+
+
+def test_get_asset_lazy_model(mocker):
+    client = substra.Client(url="http://foo.io", lazy_models=True)
+    mock_requests(mocker, "get", response=datastore.COMPUTE_PLAN)
+
+    response = client.get_compute_plan("magic-key")
+
+    assert isinstance(response, models.ComputePlan)
+    # the large fields are built on first access
+    assert 'id_to_key' not in response.__dict__
+    assert response.id_to_key == datastore.COMPUTE_PLAN['id_to_key']
+    assert 'id_to_key' in response.__dict__
+    assert response == models.ComputePlan(**datastore.COMPUTE_PLAN)
+    assert pickle.loads(pickle.dumps(response)) == response
+
+
+def test_get_asset_lazy_model_invalid_field(mocker):
+    client = substra.Client(url="http://foo.io", lazy_models=True)
+    item = dict(datastore.COMPUTE_PLAN, traintuple_keys='not-a-list')
+    mock_requests(mocker, "get", response=item)
+
+    response = client.get_compute_plan("magic-key")
+
+    assert response.key == item['key']
+    with pytest.raises(pydantic.ValidationError):
+        response.traintuple_keys
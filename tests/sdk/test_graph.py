@@ -78,3 +78,36 @@ def test_compute_ranks_ignore(node_graph):
     visited = graph.compute_ranks(node_graph=node_graph, node_to_ignore=node_to_ignore)
     for key, rank in visited.items():
         assert rank == key - 5
+
+
+def test_compute_ranks_cycle_report(node_graph_linear):
+    node_graph_linear[3].append(7)
+    with pytest.raises(exceptions.InvalidRequest) as e:
+        graph.compute_ranks(node_graph=node_graph_linear)
+
+    assert 'circular dependency: 3 -> 4 -> 5 -> 6 -> 7 -> 3' in str(e.value)
+
+
+def test_compute_ranks_unknown_dependency(node_graph_linear):
+    node_graph_linear[3].append('foo')
+    with pytest.raises(exceptions.InvalidRequest) as e:
+        graph.compute_ranks(node_graph=node_graph_linear)
+
+    assert 'missing dependency among inModels IDs: 3 depends on unknown foo' in str(e.value)
+
+
+def test_compute_ranks_with_ranks():
+    node_graph = {
+        'a': ['existing'],
+        'b': ['a', 'other'],
+        'c': [],
+    }
+    ranks = graph.compute_ranks(node_graph=node_graph, ranks={'existing': 3, 'other': 10})
+    assert ranks == {'existing': 3, 'other': 10, 'a': 4, 'b': 11, 'c': 0}
+
+
+def test_compute_ranks_large_graph():
+    n = 100000
+    node_graph = {key: [key - 1, key // 2] if key > 0 else [] for key in range(n)}
+    ranks = graph.compute_ranks(node_graph=node_graph)
+    assert ranks[n - 1] == n - 1
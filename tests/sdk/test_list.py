@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+
 import pytest
 
+import substra
 from substra.sdk import models, schemas
 
 from .. import datastore
-from .utils import mock_requests
+from .utils import mock_requests, mock_requests_responses, mock_response
 
 
 @pytest.mark.parametrize('asset_name', [
@@ -44,6 +47,27 @@ def test_list_asset(asset_name, client, mocker):
     m.assert_called()
 
 
+@pytest.mark.parametrize('asset_name', [
+    'objective',
+    'dataset',
+    'algo',
+    'testtuple',
+    'traintuple',
+    'aggregatetuple',
+    'composite_traintuple',
+    'compute_plan',
+])
+def test_list_asset_without_validation(asset_name, mocker):
+    client = substra.Client(url="http://foo.io", validate_responses=False)
+    item = getattr(datastore, asset_name.upper())
+    # the validation would fail on the unknown field
+    mock_requests(mocker, "get", response=[dict(item, unknown_field='foo')])
+
+    response = getattr(client, f'list_{asset_name}')()
+
+    assert response == [models.SCHEMA_TO_MODEL[schemas.Type(asset_name)](**item)]
+
+
 def test_list_asset_with_filters(client, mocker):
     items = [datastore.ALGO]
     m = mock_requests(mocker, "get", response=items)
@@ -65,3 +89,54 @@ def test_list_asset_with_filters_failure(client, mocker):
 
     m.assert_not_called()
     assert str(exc_info.value).startswith("Cannot load filters")
+
+
+def _mock_stream_response(content):
+    r = mock_response()
+    # small chunks to check that the items are parsed across chunks
+    r.iter_content = lambda chunk_size=None: (
+        content[i:i + 10] for i in range(0, len(content), 10)
+    )
+    return r
+
+
+def test_list_asset_stream(client, mocker):
+    items = [dict(datastore.ALGO, key=f'key-{i}') for i in range(5)]
+    content = json.dumps(items).encode('utf-8')
+    m = mock_requests_responses(mocker, "get", [_mock_stream_response(content)])
+
+    response = client.list_algo(stream=True)
+
+    m.assert_not_called()  # the request is sent when the iterator is consumed
+    assert [asset.key for asset in response] == [item['key'] for item in items]
+    assert m.call_args[1]['stream'] is True
+
+
+def test_list_asset_pagination(client, mocker):
+    items = [dict(datastore.ALGO, key=f'key-{i}') for i in range(3)]
+    pages = [
+        {'count': 3, 'next': 'http://foo.io/algo/?page=2', 'results': items[:2]},
+        {'count': 3, 'next': None, 'results': items[2:]},
+    ]
+    m = mock_requests_responses(mocker, "get", [mock_response(page) for page in pages])
+
+    response = client.list_algo()
+
+    assert [asset.key for asset in response] == [item['key'] for item in items]
+    assert m.call_args[0][0] == 'http://foo.io/algo/?page=2'
+
+
+def test_list_asset_stream_pagination(client, mocker):
+    items = [dict(datastore.ALGO, key=f'key-{i}') for i in range(3)]
+    pages = [
+        {'count': 3, 'next': 'http://foo.io/algo/?page=2', 'results': items[:2]},
+        {'count': 3, 'next': None, 'results': items[2:]},
+    ]
+    m = mock_requests_responses(mocker, "get", [
+        _mock_stream_response(json.dumps(page).encode('utf-8')) for page in pages
+    ])
+
+    response = list(client.list_algo(stream=True))
+
+    assert [asset.key for asset in response] == [item['key'] for item in items]
+    assert m.call_count == 2
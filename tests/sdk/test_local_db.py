@@ -0,0 +1,134 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from unittest import mock
+
+import pytest
+
+import substra
+from substra.sdk import exceptions, models, schemas
+from substra.sdk.backends.local import compute, dal, db
+from substra.sdk.backends.local.compute import spawner
+
+from .. import datastore
+
+
+@pytest.mark.parametrize('model,data', [
+    (models.Dataset, datastore.DATASET),
+    (models.Objective, datastore.OBJECTIVE),
+    (models.Algo, datastore.ALGO),
+    (models.AggregateAlgo, datastore.AGGREGATE_ALGO),
+    (models.CompositeAlgo, datastore.COMPOSITE_ALGO),
+    (models.Traintuple, datastore.TRAINTUPLE),
+    (models.Aggregatetuple, datastore.AGGREGATETUPLE),
+    (models.CompositeTraintuple, datastore.COMPOSITE_TRAINTUPLE),
+    (models.Testtuple, datastore.TESTTUPLE),
+    (models.ComputePlan, datastore.COMPUTE_PLAN),
+])
+def test_sqlite_db_reopen(tmp_path, model, data):
+    path = tmp_path / 'db.sqlite'
+    asset = model(**data)
+    store = db.SqliteDb(path)
+    store.add(asset)
+    store.close()
+
+    store = db.SqliteDb(path)
+    assert store.list(model.type_) == [asset]
+    assert store.get(model.type_, asset.key) == asset
+
+
+def test_sqlite_db_update(tmp_path):
+    path = tmp_path / 'db.sqlite'
+    store = db.SqliteDb(path)
+    traintuple = store.add(models.Traintuple(**datastore.TRAINTUPLE))
+    store.add(models.ComputePlan(**datastore.COMPUTE_PLAN))
+
+    traintuple.status = models.Status.failed
+    store.update(traintuple)
+    store.close()
+
+    store = db.SqliteDb(path)
+    assert store.get(schemas.Type.Traintuple, traintuple.key).status == models.Status.failed
+    # the update replaces the stored asset
+    assert len(store.list(schemas.Type.Traintuple)) == 1
+    assert len(store.list(schemas.Type.ComputePlan)) == 1
+
+
+def test_sqlite_db_update_keeps_order(tmp_path):
+    path = tmp_path / 'db.sqlite'
+    store = db.SqliteDb(path)
+    keys = ['key-1', 'key-2']
+    for key in keys:
+        store.add(models.Traintuple(**{**datastore.TRAINTUPLE, 'key': key}))
+
+    traintuple = store.get(schemas.Type.Traintuple, 'key-1')
+    traintuple.status = models.Status.failed
+    store.update(traintuple)
+    store.close()
+
+    store = db.SqliteDb(path)
+    assert [t.key for t in store.list(schemas.Type.Traintuple)] == keys
+
+
+def test_sqlite_db_update_unknown_asset(tmp_path):
+    store = db.SqliteDb(tmp_path / 'db.sqlite')
+
+    with pytest.raises(exceptions.NotFound):
+        store.update(models.Traintuple(**datastore.TRAINTUPLE))
+
+
+def test_client_local_workspace(tmp_path, dataset_query):
+    workspace = tmp_path / 'workspace'
+    with mock.patch('docker.from_env'):
+        client = substra.Client(debug=True, local_workspace=str(workspace))
+        key = client.add_dataset(dataset_query)
+
+        client = substra.Client(debug=True, local_workspace=str(workspace))
+    dataset = client.get_dataset(key)
+
+    assert dataset.name == dataset_query['name']
+    assert dataset.opener.storage_address.exists()
+    assert str(workspace) in str(dataset.opener.storage_address)
+
+
+def test_model_index(tmp_path):
+    data_access = dal.DataAccess(None, local_worker_dir=tmp_path)
+    worker = compute.Worker(
+        data_access, local_worker_dir=tmp_path, support_chainkeys=False,
+        spawner_name=spawner.SUBPROCESS,
+    )
+    traintuple = models.Traintuple(**datastore.TRAINTUPLE)
+    models_volume = tmp_path / 'output_models'
+    models_volume.mkdir()
+    (models_volume / 'model').write_text('model')
+
+    out_model = worker._save_output_model(traintuple, 'model', models_volume)
+
+    assert data_access.get(schemas.Type.Model, out_model.key) == out_model
+    assert data_access.list(schemas.Type.Model, filters=None) == [out_model]
+
+
+def test_list_model(tmp_path):
+    with mock.patch('docker.from_env'):
+        client = substra.Client(debug=True, local_workspace=str(tmp_path))
+    model = models.OutModel(**datastore.TRAINTUPLE['out_model'])
+    client._backend._db.add(model)
+
+    assert client.list_model() == [model]
+
+
+def test_list_model_remote():
+    client = substra.Client(url='http://foo.io')
+
+    with pytest.raises(exceptions.SDKException):
+        client.list_model()
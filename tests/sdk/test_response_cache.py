@@ -0,0 +1,177 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import pathlib
+from unittest import mock
+
+import pytest
+
+import substra
+from substra.sdk import models
+from substra.sdk.backends.remote import response_cache
+
+from .. import datastore
+from .utils import mock_response, mock_requests_responses
+
+
+def _response(item, status=200, headers=None):
+    r = mock_response(item, status=status, headers=headers)
+    if status == 304:
+        r.raise_for_status = mock.MagicMock()
+    r.url = 'http://foo.io/asset/'
+    r.encoding = 'utf-8'
+    r.content = r.text.encode('utf-8') if isinstance(item, str) else json.dumps(item).encode()
+    return r
+
+
+@pytest.fixture
+def cached_client(tmp_path):
+    return substra.Client(url="http://foo.io", response_cache_dir=str(tmp_path / 'cache'))
+
+
+def _cache(client):
+    return client._backend._client.cache
+
+
+def test_immutable_asset_served_from_cache(cached_client, mocker):
+    m = mock_requests_responses(mocker, 'get', [_response(datastore.ALGO)])
+
+    first = cached_client.get_algo('magic-key')
+    second = cached_client.get_algo('magic-key')
+
+    assert first == second == models.Algo(**datastore.ALGO)
+    assert m.call_count == 1
+    assert _cache(cached_client).stats()['hits'] == 1
+    assert _cache(cached_client).stats()['misses'] == 1
+
+
+def test_cache_not_shared_between_tokens(tmp_path, mocker):
+    cache_dir = str(tmp_path / 'cache')
+    m = mock_requests_responses(mocker, 'get', [
+        _response(datastore.ALGO),
+        _response(datastore.ALGO),
+    ])
+
+    for token in ('foo', 'bar'):
+        client = substra.Client(url="http://foo.io", token=token, response_cache_dir=cache_dir)
+        client.get_algo('magic-key')
+
+    assert m.call_count == 2
+    assert client.response_cache_stats['misses'] == 1
+
+
+def test_client_response_cache_options(tmp_path):
+    client = substra.Client(
+        url="http://foo.io",
+        response_cache_dir=str(tmp_path / 'cache'),
+        response_cache_max_size=1000,
+    )
+
+    assert _cache(client)._max_size == 1000
+    assert client.response_cache_stats == {'hits': 0, 'misses': 0, 'size': 0}
+    assert substra.Client(url="http://foo.io").response_cache_stats is None
+
+
+def test_mutable_asset_revalidated(cached_client, mocker):
+    headers = {'ETag': '"v1"'}
+    m = mock_requests_responses(mocker, 'get', [
+        _response(datastore.TRAINTUPLE, headers=headers),
+        _response(None, status=304),
+    ])
+
+    first = cached_client.get_traintuple('magic-key')
+    second = cached_client.get_traintuple('magic-key')
+
+    assert first == second == models.Traintuple(**datastore.TRAINTUPLE)
+    assert m.call_count == 2
+    assert m.call_args[1]['headers']['If-None-Match'] == '"v1"'
+    assert _cache(cached_client).hits == 1
+
+
+def test_mutable_asset_without_validator_not_cached(cached_client, mocker):
+    m = mock_requests_responses(mocker, 'get', [
+        _response(datastore.TRAINTUPLE),
+        _response(datastore.TRAINTUPLE),
+    ])
+
+    cached_client.get_traintuple('magic-key')
+    cached_client.get_traintuple('magic-key')
+
+    assert 'If-None-Match' not in m.call_args[1]['headers']
+    assert _cache(cached_client).stats() == {'hits': 0, 'misses': 2, 'size': 0}
+
+
+def test_description_served_from_cache(cached_client, mocker):
+    m = mock_requests_responses(mocker, 'get', [
+        _response(datastore.ALGO),
+        _response('foo'),
+    ])
+
+    assert cached_client.describe_algo('magic-key') == 'foo'
+    assert cached_client.describe_algo('magic-key') == 'foo'
+    assert m.call_count == 2
+
+
+def test_lru_eviction(tmp_path):
+    cache = response_cache.ResponseCache(tmp_path, max_size=1000)
+    item = {'content': 'x' * 200}
+
+    for key in ('a', 'b', 'c'):
+        cache.fetch(key, lambda headers: _response(item), immutable=True)
+    # 'a' becomes the most recently used entry
+    cache.fetch('a', lambda headers: pytest.fail('should be cached'), immutable=True)
+    cache.fetch('d', lambda headers: _response(item), immutable=True)
+
+    assert cache.size <= 1000
+    assert cache.fetch('a', lambda headers: pytest.fail('should be cached'), immutable=True)
+    cache.fetch('b', lambda headers: _response(item), immutable=True)
+    assert cache.misses == 5
+
+
+def test_entry_removed_while_read(tmp_path, mocker):
+    cache = response_cache.ResponseCache(tmp_path)
+    item = {'content': 'x'}
+    cache.fetch('a', lambda headers: _response(item), immutable=True)
+    # another process removes the entry before it is marked as recently used
+    mocker.patch.object(response_cache.os, 'utime', side_effect=FileNotFoundError)
+
+    cache.fetch('a', lambda headers: _response(item), immutable=True)
+
+    assert cache.misses == 2
+
+
+def test_entry_removed_while_evicted(tmp_path, mocker):
+    cache = response_cache.ResponseCache(tmp_path, max_size=500)
+    item = {'content': 'x' * 200}
+    missing = tmp_path / ('0' * 64 + '.json')
+    glob = pathlib.Path.glob
+    mocker.patch.object(
+        pathlib.Path, 'glob', lambda self, pattern: list(glob(self, pattern)) + [missing],
+    )
+
+    for key in ('a', 'b', 'c'):
+        cache.fetch(key, lambda headers: _response(item), immutable=True)
+
+    assert cache.size <= 500
+
+
+def test_cached_request_with_headers(cached_client, mocker):
+    m = mock_requests_responses(mocker, 'get', [_response('foo')])
+
+    response = cached_client._backend._client.get_data(
+        'http://foo.io/file/', checksum='checksum', headers={'X-Foo': 'bar'},
+    )
+
+    assert response.text == 'foo'
+    assert m.call_args[1]['headers']['X-Foo'] == 'bar'
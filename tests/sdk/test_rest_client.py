@@ -12,11 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+
 import pytest
 import requests
 
 from substra.sdk import exceptions
-from substra.sdk.backends.remote import rest_client
+from substra.sdk.backends.remote import multipart, rest_client
 
 from .utils import mock_response, mock_requests, mock_requests_responses
 
@@ -76,7 +78,7 @@ def test_request_http_errors(mocker, status_code, http_response, sdk_exception):
 
 
 def test_request_connection_error(mocker):
-    mocker.patch('substra.sdk.backends.remote.rest_client.requests.post',
+    mocker.patch('substra.sdk.backends.remote.rest_client.requests.Session.post',
                  side_effect=requests.exceptions.ConnectionError)
     with pytest.raises(exceptions.ConnectionError):
         _client_from_config(CONFIG).add('foo', {})
@@ -100,3 +102,81 @@ def test_add_already_exist(mocker):
     asset = _client_from_config(CONFIG).add(asset_name)
     assert len(m_post.call_args_list) == 1
     assert asset == {"key": "a-key"}
+
+
+def test_requests_share_session(mocker):
+    responses = [
+        mock_response(response={"token": "a-token"}),
+        mock_response(response={"key": "a-key"}),
+    ]
+    m_post = mock_requests_responses(mocker, "post", responses)
+    m_get = mock_requests(mocker, "get", response={"key": "a-key"})
+    client = _client_from_config(CONFIG)
+    session = client._session
+
+    client.login('foo', 'bar')
+    client.add('traintuple')
+    client.get('traintuple', 'a-key')
+
+    assert client._session is session
+    assert len(m_post.call_args_list) == 2
+    assert len(m_get.call_args_list) == 1
+
+
+@pytest.mark.parametrize("pool_size", [1, 25])
+def test_session_pool_size(pool_size):
+    client = rest_client.Client(CONFIG['url'], CONFIG['insecure'], None, pool_size=pool_size)
+    adapter = client._session.get_adapter(CONFIG['url'])
+    assert adapter._pool_maxsize == pool_size
+
+
+@pytest.mark.parametrize("keep_alive, connection_header", [
+    (True, 'keep-alive'),
+    (False, 'close'),
+])
+def test_session_keep_alive(keep_alive, connection_header):
+    client = rest_client.Client(CONFIG['url'], CONFIG['insecure'], None, keep_alive=keep_alive)
+    assert client._session.headers['Connection'] == connection_header
+
+
+def test_multipart_encoder_matches_requests(tmp_path):
+    path = tmp_path / 'algo.tar.gz'
+    path.write_bytes(os.urandom(3000))
+    data = {'json': '{"name": "foo"}', 'keys': ['a', 'b']}
+
+    with open(path, 'rb') as f:
+        expected, content_type = requests.models.RequestEncodingMixin._encode_files(
+            {'file': f}, data)
+        boundary = content_type.split('boundary=')[1]
+        f.seek(0)
+
+        body = multipart.MultipartEncoder(data, {'file': f})
+        chunks = list(iter(lambda: body.read(1000), b''))
+
+    assert len(body) == len(expected)
+    assert b''.join(chunks).replace(body.boundary.encode(), boundary.encode()) == expected
+
+
+def test_add_with_files_retry(mocker, tmp_path):
+    path = tmp_path / 'data.zip'
+    path.write_bytes(b'content')
+    bodies = []
+
+    def post(url, data, headers, **kwargs):
+        assert headers['Content-Type'] == data.content_type
+        bodies.append(data.read())
+        if len(bodies) == 1:
+            return mock_response(status=502)
+        return mock_response(response={"key": "a-key"})
+
+    mocker.patch('substra.sdk.backends.remote.rest_client.requests.Session.post',
+                 side_effect=post)
+    mocker.patch('substra.sdk.utils.time.sleep')
+    with open(path, 'rb') as f:
+        asset = _client_from_config(CONFIG).add('data_sample', data={'json': '{}'},
+                                                files={'file': f})
+
+    assert asset == {"key": "a-key"}
+    # the file has been rewound for the retry
+    assert len(bodies) == 2
+    assert b'content' in bodies[1]
@@ -0,0 +1,93 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+
+import pytest
+
+from substra.sdk.backends.local import scheduler
+
+
+class _Recorder:
+    def __init__(self, fail=None):
+        self.executed = []
+        self._fail = fail or set()
+        self._lock = threading.Lock()
+
+    def __call__(self, id_):
+        with self._lock:
+            self.executed.append(id_)
+        if id_ in self._fail:
+            raise ValueError(id_)
+
+
+def test_run_in_order_with_single_worker():
+    dependencies = {'a': [], 'b': [], 'c': ['a', 'b'], 'd': ['c'], 0: ['d']}
+    execute = _Recorder()
+
+    scheduler.run(dependencies, execute, max_workers=1)
+
+    assert execute.executed == ['a', 'b', 'c', 'd', 0]
+
+
+def test_run_independent_tasks_concurrently():
+    # the two trainings can only complete if they are executed at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    dependencies = {'train_1': [], 'train_2': [], 'aggregate': ['train_1', 'train_2']}
+    executed = []
+
+    def execute(id_):
+        if id_ != 'aggregate':
+            barrier.wait()
+        executed.append(id_)
+
+    scheduler.run(dependencies, execute, max_workers=2)
+
+    assert executed[-1] == 'aggregate'
+
+
+def test_run_ready_before_rank():
+    # 'c' only depends on 'a', it does not wait for 'b' which has the same rank as 'a'
+    b_started = threading.Event()
+    c_done = threading.Event()
+    dependencies = {'a': [], 'b': [], 'c': ['a']}
+
+    def execute(id_):
+        if id_ == 'b':
+            b_started.set()
+            assert c_done.wait(timeout=5)
+        elif id_ == 'c':
+            c_done.set()
+
+    scheduler.run(dependencies, execute, max_workers=2)
+
+    assert b_started.is_set()
+
+
+def test_run_dependencies_outside_of_the_tasks():
+    execute = _Recorder()
+
+    scheduler.run({'a': ['existing'], 'b': ['a']}, execute)
+
+    assert execute.executed == ['a', 'b']
+
+
+def test_run_failure():
+    dependencies = {'a': [], 'b': ['a'], 'c': ['b'], 'd': []}
+    execute = _Recorder(fail={'a'})
+
+    with pytest.raises(ValueError, match='a'):
+        scheduler.run(dependencies, execute, max_workers=1)
+
+    # the tasks depending on the failed task and the tasks not started are not executed
+    assert execute.executed == ['a']
@@ -0,0 +1,387 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import concurrent.futures
+import os
+import subprocess
+import sys
+import tarfile
+import threading
+import time
+from unittest import mock
+
+import docker
+import pytest
+
+from substra.sdk import fs
+from substra.sdk.backends.local.compute import runner, spawner
+from substra.sdk.backends.local.compute.spawner import subprocess as subprocess_spawner
+
+CHECKSUM = 'a' * 64
+IMAGE = f'{spawner.IMAGE_REPOSITORY}:{CHECKSUM}'
+
+
+class _Images:
+    """Images of a fake docker daemon."""
+
+    def __init__(self, existing=()):
+        self.tags = set(existing)
+        self.builds = []
+        self._lock = threading.Lock()
+
+    def get(self, tag):
+        if tag not in self.tags:
+            raise docker.errors.ImageNotFound(tag)
+        return mock.Mock(tags=[tag])
+
+    def build(self, path, tag, rm):
+        time.sleep(0.05)
+        with self._lock:
+            self.builds.append(tag)
+            self.tags.add(tag)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    dockerfile = tmp_path / 'Dockerfile'
+    dockerfile.write_text('FROM scratch')
+    path = tmp_path / 'algo.tar.gz'
+    with tarfile.open(path, 'w:gz') as tf:
+        tf.add(dockerfile, arcname='Dockerfile')
+    return str(path)
+
+
+def _spawner(tmp_path, images):
+    client = mock.Mock()
+    client.images = images
+    container = client.containers.run.return_value
+    container.logs.return_value = [b'logs']
+    container.wait.return_value = {'StatusCode': 0}
+    with mock.patch('docker.from_env', return_value=client):
+        return spawner.DockerSpawner(local_worker_dir=tmp_path), client
+
+
+def test_spawn_builds_image_once(tmp_path, archive):
+    images = _Images()
+    docker_spawner, client = _spawner(tmp_path, images)
+
+    for _ in range(3):
+        logs = docker_spawner.spawn('algo-key', archive, 'train', checksum=CHECKSUM)
+
+    assert logs == 'logs'
+    assert images.builds == [IMAGE]
+    assert client.containers.run.call_args[0][0] == IMAGE
+
+
+def test_spawn_reuses_existing_image(tmp_path, archive):
+    images = _Images(existing=[IMAGE])
+    docker_spawner, _ = _spawner(tmp_path, images)
+
+    docker_spawner.spawn('algo-key', archive, 'train', checksum=CHECKSUM)
+
+    assert images.builds == []
+
+
+def test_spawn_concurrent_builds(tmp_path, archive):
+    images = _Images()
+    docker_spawner, _ = _spawner(tmp_path, images)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as e:
+        for _ in range(4):
+            e.submit(docker_spawner.spawn, 'algo-key', archive, 'train', checksum=CHECKSUM)
+
+    assert images.builds == [IMAGE]
+
+
+def test_spawn_without_checksum(tmp_path, archive):
+    images = _Images()
+    docker_spawner, _ = _spawner(tmp_path, images)
+
+    docker_spawner.spawn('algo-key', archive, 'train')
+    docker_spawner.spawn('algo-key', archive, 'train')
+
+    assert images.builds == ['algo-key', 'algo-key']
+
+
+def test_prune_images():
+    used = mock.Mock(id='used', tags=[IMAGE])
+    stale = mock.Mock(id='stale', tags=[f'{spawner.IMAGE_REPOSITORY}:{"b" * 64}'])
+    client = mock.Mock()
+    client.images.list.return_value = [used, stale]
+
+    removed = spawner.prune_images(client, keep=[IMAGE])
+
+    assert removed == [f'{spawner.IMAGE_REPOSITORY}:{"b" * 64}']
+    client.images.remove.assert_called_once_with('stale')
+
+
+class _Container:
+    """Runner executed in a local process instead of a container."""
+
+    def __init__(self, image, entrypoint, volumes, detach, shm_size):
+        _, _, control_dir = entrypoint
+        self._process = subprocess.Popen([sys.executable, runner.__file__, control_dir])
+        self.status = 'running'
+
+    def reload(self):
+        self.status = 'running' if self._process.poll() is None else 'exited'
+
+    def logs(self):
+        return b''
+
+    def remove(self, force):
+        self._process.kill()
+        self._process.wait()
+
+
+_ALGO = '''
+import os
+import sys
+
+with open(os.path.join('output', 'argv'), 'w') as f:
+    f.write(' '.join(sys.argv[1:]))
+print('executed', os.environ.get('NODE_INDEX'))
+if 'fail' in sys.argv:
+    sys.exit(3)
+'''
+
+
+@pytest.fixture
+def warm_spawner(tmp_path, archive, monkeypatch):
+    local_worker_dir = tmp_path / 'local-worker'
+    local_worker_dir.mkdir()
+    # the local worker directory has the same path in the runner process
+    monkeypatch.setattr(
+        'substra.sdk.backends.local.compute.spawner.docker._WORKER_DIR',
+        str(local_worker_dir.resolve()),
+    )
+    # the read-only mount of the local worker directory
+    read_only_worker_dir = tmp_path / 'local-worker-ro'
+    read_only_worker_dir.symlink_to(local_worker_dir.resolve())
+    monkeypatch.setattr(
+        'substra.sdk.backends.local.compute.spawner.docker._READ_ONLY_WORKER_DIR',
+        str(read_only_worker_dir),
+    )
+    sandbox = tmp_path / 'sandbox'
+    sandbox.mkdir()
+    (sandbox / 'algo.py').write_text(_ALGO)
+
+    client = mock.Mock()
+    client.images = _Images(existing=[IMAGE])
+    client.images.get = mock.Mock(return_value=mock.Mock(attrs={'Config': {
+        'Entrypoint': ['python3', 'algo.py'],
+        'WorkingDir': str(sandbox),
+    }}))
+    client.containers.run = mock.Mock(side_effect=_Container)
+    with mock.patch('docker.from_env', return_value=client):
+        docker_spawner = spawner.WarmDockerSpawner(local_worker_dir=local_worker_dir)
+    yield docker_spawner, client, local_worker_dir, sandbox
+    docker_spawner.close()
+
+
+def _spawn_warm(docker_spawner, local_worker_dir, sandbox, archive, command):
+    output = local_worker_dir / 'tuple' / 'output'
+    output.mkdir(parents=True, exist_ok=True)
+    volumes = {str(output): {'bind': str(sandbox / 'output'), 'mode': 'rw'}}
+    logs = docker_spawner.spawn(
+        'algo-key', archive, command, volumes=volumes, envs={'NODE_INDEX': '2'},
+        checksum=CHECKSUM,
+    )
+    return logs, (output / 'argv').read_text()
+
+
+def test_warm_spawner_reuses_container(warm_spawner, archive):
+    docker_spawner, client, local_worker_dir, sandbox = warm_spawner
+
+    logs, argv = _spawn_warm(docker_spawner, local_worker_dir, sandbox, archive, 'train 1')
+    assert logs == 'executed 2\n'
+    assert argv == 'train 1'
+
+    logs, argv = _spawn_warm(docker_spawner, local_worker_dir, sandbox, archive, 'train 2')
+    assert argv == 'train 2'
+    assert client.containers.run.call_count == 1
+
+
+def test_warm_spawner_restarts_after_failure(warm_spawner, archive):
+    docker_spawner, client, local_worker_dir, sandbox = warm_spawner
+
+    with pytest.raises(spawner.ExecutionError, match="status code '3'"):
+        _spawn_warm(docker_spawner, local_worker_dir, sandbox, archive, 'train fail')
+
+    _, argv = _spawn_warm(docker_spawner, local_worker_dir, sandbox, archive, 'train')
+    assert argv == 'train'
+    assert client.containers.run.call_count == 2
+
+
+_READ_ONLY_ALGO = '''
+import os
+
+with open(os.path.join('output', 'argv'), 'w') as f:
+    f.write(os.readlink('opener.py'))
+'''
+
+
+def test_warm_spawner_read_only_volume(warm_spawner, archive, tmp_path):
+    docker_spawner, client, local_worker_dir, sandbox = warm_spawner
+    (sandbox / 'algo.py').write_text(_READ_ONLY_ALGO)
+    opener = local_worker_dir / 'assets' / 'opener.py'
+    opener.parent.mkdir()
+    opener.write_text('')
+    output = local_worker_dir / 'tuple' / 'output'
+    output.mkdir(parents=True)
+    volumes = {
+        str(output): {'bind': str(sandbox / 'output'), 'mode': 'rw'},
+        str(opener): {'bind': str(sandbox / 'opener.py'), 'mode': 'ro'},
+    }
+
+    docker_spawner.spawn('algo-key', archive, 'train', volumes=volumes, checksum=CHECKSUM)
+
+    # the read-only volumes are linked to the read-only mount of the local worker dir
+    assert f'{local_worker_dir}:{spawner.docker._READ_ONLY_WORKER_DIR}:ro' in \
+        client.containers.run.call_args[1]['volumes']
+    assert (output / 'argv').read_text() == \
+        str(tmp_path / 'local-worker-ro' / 'assets' / 'opener.py')
+
+
+def test_warm_spawner_write_to_read_only_volume(tmp_path):
+    # executed by the docker daemon
+    content = tmp_path / 'content'
+    content.mkdir()
+    (content / 'Dockerfile').write_text(
+        'FROM python:3-slim\nCOPY algo.py .\nENTRYPOINT ["python3", "algo.py"]\n'
+    )
+    (content / 'algo.py').write_text(
+        "open('/sandbox/opener/__init__.py', 'w').write('modified')\n"
+    )
+    archive = tmp_path / 'algo.tar.gz'
+    with tarfile.open(archive, 'w:gz') as tf:
+        for name in ('Dockerfile', 'algo.py'):
+            tf.add(content / name, arcname=name)
+    local_worker_dir = tmp_path / 'local-worker'
+    opener = local_worker_dir / 'assets' / 'opener.py'
+    opener.parent.mkdir(parents=True)
+    opener.write_text('VALUE = 1')
+    volumes = {str(opener): {'bind': '/sandbox/opener/__init__.py', 'mode': 'ro'}}
+
+    docker_spawner = spawner.WarmDockerSpawner(local_worker_dir=local_worker_dir)
+    try:
+        with pytest.raises(spawner.ExecutionError):
+            docker_spawner.spawn(
+                'algo-key', str(archive), 'train', volumes=volumes,
+                checksum=fs.hash_file(str(archive)),
+            )
+    finally:
+        docker_spawner.close()
+    assert opener.read_text() == 'VALUE = 1'
+
+
+def test_warm_spawner_volume_outside_of_worker_dir(warm_spawner, archive, tmp_path):
+    docker_spawner, client, _, sandbox = warm_spawner
+    volumes = {str(tmp_path): {'bind': str(sandbox / 'output'), 'mode': 'rw'}}
+
+    with mock.patch.object(spawner.DockerSpawner, 'spawn', return_value='logs') as m:
+        docker_spawner.spawn('algo-key', archive, 'train', volumes=volumes, checksum=CHECKSUM)
+
+    m.assert_called_once()
+    assert client.containers.run.call_count == 0
+
+
+_SUBPROCESS_ALGO = '''
+import os
+import sys
+import time
+
+import opener
+
+if sys.argv[1] == 'sleep':
+    time.sleep(10)
+with open(sys.argv[2], 'w') as f:
+    f.write(opener.VALUE + os.environ['NODE_INDEX'])
+print('executed')
+if sys.argv[1] == 'fail':
+    sys.exit(3)
+'''
+
+
+@pytest.fixture
+def subprocess_archive(tmp_path):
+    content = tmp_path / 'content'
+    content.mkdir()
+    (content / 'Dockerfile').write_text(
+        'FROM python:3\nCOPY algo.py .\nENTRYPOINT ["python3", "algo.py"]\n'
+    )
+    (content / 'algo.py').write_text(_SUBPROCESS_ALGO)
+    path = tmp_path / 'algo.tar.gz'
+    with tarfile.open(path, 'w:gz') as tf:
+        for name in ('Dockerfile', 'algo.py'):
+            tf.add(content / name, arcname=name)
+    return str(path)
+
+
+def _spawn_subprocess(tmp_path, archive, command, timeout=None):
+    local_worker_dir = tmp_path / 'local-worker'
+    local_worker_dir.mkdir(exist_ok=True)
+    output = tmp_path / 'output'
+    output.mkdir(exist_ok=True)
+    opener = tmp_path / 'opener.py'
+    opener.write_text('VALUE = "opener-"')
+    volumes = {
+        str(output): {'bind': '/sandbox/output', 'mode': 'rw'},
+        str(opener): {'bind': '/sandbox/opener/__init__.py', 'mode': 'ro'},
+    }
+    subprocess_spawner = spawner.SubprocessSpawner(local_worker_dir, timeout=timeout)
+    logs = subprocess_spawner.spawn(
+        'algo-key', archive, command, volumes=volumes, envs={'NODE_INDEX': '2'},
+        checksum=CHECKSUM,
+    )
+    return logs, (output / 'result').read_text()
+
+
+def test_subprocess_spawner(tmp_path, subprocess_archive):
+    logs, result = _spawn_subprocess(
+        tmp_path, subprocess_archive, 'train /sandbox/output/result'
+    )
+
+    assert logs == 'executed\n'
+    assert result == 'opener-2'
+    # the archive is uncompressed once
+    assert os.listdir(tmp_path / 'local-worker' / 'archives') == [CHECKSUM]
+
+
+def test_subprocess_spawner_failure(tmp_path, subprocess_archive):
+    with pytest.raises(spawner.ExecutionError, match="status code '3'"):
+        _spawn_subprocess(tmp_path, subprocess_archive, 'fail /sandbox/output/result')
+
+
+def test_subprocess_spawner_timeout(tmp_path, subprocess_archive):
+    with pytest.raises(spawner.ExecutionError, match='timed out'):
+        _spawn_subprocess(
+            tmp_path, subprocess_archive, 'sleep /sandbox/output/result', timeout=0.5
+        )
+
+
+@pytest.mark.parametrize('dockerfile,error', [
+    ('FROM python:3\n', 'No ENTRYPOINT'),
+    ('FROM python:3\nENTRYPOINT python3 algo.py\n', 'exec form'),
+])
+def test_get_entrypoint_invalid(tmp_path, dockerfile, error):
+    path = tmp_path / 'Dockerfile'
+    path.write_text(dockerfile)
+
+    with pytest.raises(spawner.ExecutionError, match=error):
+        subprocess_spawner.get_entrypoint(path)
+
+
+def test_get_unknown_spawner(tmp_path):
+    with pytest.raises(ValueError):
+        spawner.get('unknown', tmp_path)
@@ -0,0 +1,92 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import errno
+import os
+from unittest import mock
+
+import pytest
+
+from substra.sdk.backends.local.compute import staging
+
+
+@pytest.fixture
+def samples(tmp_path):
+    samples = dict()
+    for key in ('key_1', 'key_2'):
+        path = tmp_path / 'samples' / key
+        (path / 'subdir').mkdir(parents=True)
+        (path / 'data.csv').write_text(f'{key} data')
+        (path / 'subdir' / 'labels.csv').write_text(f'{key} labels')
+        samples[key] = path
+    return samples
+
+
+@pytest.fixture
+def no_copy():
+    with mock.patch.object(staging, '_copy', side_effect=AssertionError('copied')):
+        yield
+
+
+@pytest.mark.parametrize('n_samples,host_filesystem,strategy', [
+    (1, False, staging.BIND),
+    (staging.MAX_BIND_MOUNTS + 1, False, staging.HARDLINK),
+    (1, True, staging.SYMLINK),
+])
+def test_choose_strategy(n_samples, host_filesystem, strategy):
+    assert staging.choose_strategy(n_samples, host_filesystem=host_filesystem) == strategy
+
+
+def test_stage_bind(tmp_path, samples, no_copy):
+    volumes = staging.stage(samples, tmp_path / 'data', '/sandbox/data', staging.BIND)
+
+    assert volumes == {
+        str(samples['key_1']): {'bind': '/sandbox/data/key_1', 'mode': 'ro'},
+        str(samples['key_2']): {'bind': '/sandbox/data/key_2', 'mode': 'ro'},
+    }
+    assert not (tmp_path / 'data').exists()
+
+
+def test_stage_symlink(tmp_path, samples, no_copy):
+    data_dir = tmp_path / 'data'
+
+    volumes = staging.stage(samples, data_dir, '/sandbox/data', staging.SYMLINK)
+
+    assert volumes == {str(data_dir): {'bind': '/sandbox/data', 'mode': 'ro'}}
+    assert os.path.islink(data_dir / 'key_1')
+    assert (data_dir / 'key_1' / 'data.csv').read_text() == 'key_1 data'
+
+
+def test_stage_hardlink(tmp_path, samples, no_copy):
+    data_dir = tmp_path / 'data'
+
+    volumes = staging.stage(samples, data_dir, '/sandbox/data', staging.HARDLINK)
+
+    assert volumes == {str(data_dir): {'bind': '/sandbox/data', 'mode': 'ro'}}
+    for key, path in samples.items():
+        for name in ('data.csv', os.path.join('subdir', 'labels.csv')):
+            staged = data_dir / key / name
+            assert not os.path.islink(staged)
+            assert os.stat(staged).st_ino == os.stat(path / name).st_ino
+
+
+def test_stage_hardlink_other_filesystem(tmp_path, samples):
+    data_dir = tmp_path / 'data'
+    error = OSError(errno.EXDEV, 'Invalid cross-device link')
+
+    with mock.patch('os.link', side_effect=error):
+        staging.stage(samples, data_dir, '/sandbox/data', staging.HARDLINK)
+
+    staged = data_dir / 'key_1' / 'subdir' / 'labels.csv'
+    assert staged.read_text() == 'key_1 labels'
+    assert os.stat(staged).st_ino != os.stat(samples['key_1'] / 'subdir' / 'labels.csv').st_ino
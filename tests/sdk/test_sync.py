@@ -0,0 +1,159 @@
+# Copyright 2018 Owkin, inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+
+import pytest
+
+import substra
+from substra.sdk import bulk, exceptions, fs, sync
+
+
+@pytest.fixture
+def root_dir(tmp_path):
+    root = tmp_path / 'samples'
+    for name in ('a', 'b'):
+        (root / name).mkdir(parents=True)
+        (root / name / 'data.csv').write_text(f'content {name}')
+    return root
+
+
+class _Platform:
+    """Records the data samples added and linked."""
+
+    def __init__(self):
+        self.added = []
+        self.linked = []
+
+    def add(self, data, **kwargs):
+        self.added.append(data['paths'])
+        return bulk.Report([
+            bulk.PathReport(path, bulk.CREATED, key=f'key-{len(self.added)}-{i}')
+            for i, path in enumerate(data['paths'])
+        ])
+
+    def link(self, dataset_key, keys):
+        self.linked.append((dataset_key, keys))
+        return keys
+
+
+@pytest.fixture
+def client(mocker):
+    client = substra.Client(url='http://foo.io')
+    platform = _Platform()
+    mocker.patch.object(client, 'add_data_samples_in_bulk', side_effect=platform.add)
+    mocker.patch.object(client, 'link_dataset_with_data_samples', side_effect=platform.link)
+    return client, platform
+
+
+def test_sync_data_samples(client, root_dir):
+    client, platform = client
+
+    report = client.sync_data_samples('dataset', str(root_dir))
+    assert [r.status for r in report.results] == [bulk.CREATED, bulk.CREATED]
+    assert platform.added == [[str(root_dir / 'a'), str(root_dir / 'b')]]
+
+    # only the new and changed folders are added
+    (root_dir / 'b' / 'data.csv').write_text('changed')
+    (root_dir / 'c').mkdir()
+    report = client.sync_data_samples('dataset', str(root_dir))
+    assert [r.status for r in report.results] == [sync.UNCHANGED, bulk.CREATED, bulk.CREATED]
+    assert platform.added[1] == [str(root_dir / 'b'), str(root_dir / 'c')]
+    assert report.keys == ['key-1-0', 'key-2-0', 'key-2-1']
+    assert platform.linked == []
+
+    # the registered data samples are linked to another dataset
+    report = client.sync_data_samples('other', str(root_dir))
+    assert [r.status for r in report.results] == [sync.LINKED] * 3
+    assert platform.linked == [('other', ['key-1-0', 'key-2-0', 'key-2-1'])]
+    assert len(platform.added) == 2
+
+
+def test_sync_data_samples_test_only(client, root_dir):
+    client, platform = client
+
+    client.sync_data_samples('dataset', str(root_dir))
+    report = client.sync_data_samples('dataset', str(root_dir), test_only=True)
+
+    # a data sample cannot be used for both train and test
+    assert [r.status for r in report.results] == [bulk.CREATED, bulk.CREATED]
+    assert len(platform.added) == 2
+
+
+def test_sync_data_samples_failure(client, root_dir, tmp_path):
+    client, platform = client
+    manifest_path = tmp_path / 'manifest.json'
+    client.add_data_samples_in_bulk.side_effect = lambda data, **kwargs: bulk.Report([
+        bulk.PathReport(data['paths'][0], bulk.CREATED, key='key-a'),
+        bulk.PathReport(data['paths'][1], bulk.FAILED, error='error'),
+    ])
+
+    report = client.sync_data_samples('dataset', str(root_dir), manifest_path=manifest_path)
+    assert [r.path for r in report.failed] == [str(root_dir / 'b')]
+
+    # the failed folders are added again
+    client.add_data_samples_in_bulk.side_effect = platform.add
+    report = client.sync_data_samples('dataset', str(root_dir), manifest_path=manifest_path)
+    assert [r.status for r in report.results] == [sync.UNCHANGED, bulk.CREATED]
+    assert platform.added == [[str(root_dir / 'b')]]
+    assert not (root_dir / sync.MANIFEST_NAME).exists()
+
+
+def test_sync_data_samples_exists(client, root_dir):
+    client, platform = client
+    client.add_data_samples_in_bulk.side_effect = lambda data, **kwargs: bulk.Report([
+        bulk.PathReport(data['paths'][0], bulk.EXISTS, key='key-a'),
+        bulk.PathReport(data['paths'][1], bulk.EXISTS, key=None),
+    ])
+
+    report = client.sync_data_samples('dataset', str(root_dir))
+    assert [r.status for r in report.results] == [bulk.EXISTS, bulk.EXISTS]
+    # the existing data samples are linked to the dataset
+    assert platform.linked == [('dataset', ['key-a'])]
+
+    # the data samples whose key is unknown are added again
+    client.add_data_samples_in_bulk.side_effect = platform.add
+    report = client.sync_data_samples('dataset', str(root_dir))
+    assert [r.status for r in report.results] == [sync.UNCHANGED, bulk.CREATED]
+    assert platform.added == [[str(root_dir / 'b')]]
+
+
+def test_sync_many_data_samples(client, tmp_path, mocker):
+    client, platform = client
+    root = tmp_path / 'samples'
+    for i in range(50):
+        (root / f'{i:02d}').mkdir(parents=True)
+        (root / f'{i:02d}' / 'data.csv').write_text(f'content {i}')
+    manifest_path = tmp_path / 'manifest.json'
+    cache_path = sync.get_hash_cache(manifest_path).path
+    replace = mocker.patch('os.replace', wraps=os.replace)
+    pool = mocker.spy(fs.concurrent.futures, 'ThreadPoolExecutor')
+
+    report = client.sync_data_samples('dataset', str(root), manifest_path=manifest_path)
+
+    assert len(report.results) == 50
+    # the files of all the folders are hashed by one pool and the cache is written once
+    assert pool.call_count == 1
+    assert [c for c in replace.call_args_list if c[0][1] == cache_path] == [
+        mocker.call(cache_path.with_name(cache_path.name + '.tmp'), cache_path),
+    ]
+    assert len(json.loads(cache_path.read_text())) == 50
+
+
+def test_manifest_invalid_version(tmp_path):
+    path = tmp_path / 'manifest.json'
+    path.write_text(json.dumps({'version': 0}))
+
+    with pytest.raises(exceptions.InvalidManifest):
+        sync.Manifest.load(path)
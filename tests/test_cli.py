@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import json
+import pathlib
 import re
 import sys
 from unittest import mock
@@ -23,7 +24,8 @@ from click.testing import CliRunner
 import pytest
 
 import substra
-from substra.sdk import models
+from substra.sdk import artifact_cache, bulk, models
+from substra.sdk.hasher import Hasher
 from substra.cli.interface import cli, error_printer
 
 from . import datastore
@@ -276,6 +278,68 @@ def test_command_add_data_sample(workdir, mocker):
     assert re.search(r"Directory '.*' does not exist\.", res)
 
 
+@pytest.mark.parametrize('command', [
+    ['add', 'compute_plan'],
+    ['update', 'compute_plan', 'foo'],
+])
+def test_command_compute_plan_resume(command, workdir, mocker):
+    m = mock_client_call(mocker, 'resume_compute_plan', response={'key': 'foo'})
+    json_file = workdir / "valid_json_file.json"
+    json_file.write_text(json.dumps({}))
+    journal = workdir / "journal"
+
+    res = client_execute(workdir, command + [str(json_file), '--resume'], exit_code=2)
+    assert 'The --resume option requires a --journal.' in res
+
+    res = client_execute(workdir, command + [str(json_file), '--resume', '--journal',
+                                             str(journal)], exit_code=2)
+    assert 'does not exist' in res
+
+    journal.write_text('{}')
+    client_execute(workdir, command + [str(json_file), '--resume', '--journal', str(journal)])
+    m.assert_called_once_with({}, str(journal))
+
+
+def test_command_add_data_sample_multiple(workdir, mocker):
+    temp_dir = workdir / "test"
+    for name in ('a', 'b'):
+        (temp_dir / name).mkdir(parents=True)
+
+    report = bulk.Report([
+        bulk.PathReport(str(temp_dir / 'a'), bulk.CREATED, key='foo'),
+        bulk.PathReport(str(temp_dir / 'b'), bulk.FAILED, error='LoadDataException: bar'),
+    ])
+    m = mock_client_call(mocker, 'add_data_samples_in_bulk', report)
+    output = client_execute(workdir, ['add', 'data_sample', str(temp_dir), '--dataset-key',
+                                      'foo', '--multiple', '--chunk-size', '10'], exit_code=1)
+
+    data = m.call_args[0][0]
+    assert data['paths'] == [str(temp_dir / 'a'), str(temp_dir / 'b')]
+    assert m.call_args[1]['chunk_size'] == 10
+    assert '"foo"' in output
+    assert 'LoadDataException: bar' in output
+    assert '1 of 2 data samples could not be added' in output
+
+
+def test_command_sync_data_sample(workdir, mocker):
+    temp_dir = workdir / "test"
+    for name in ('a', 'b'):
+        (temp_dir / name).mkdir(parents=True)
+
+    report = bulk.Report([
+        bulk.PathReport(str(temp_dir / 'a'), 'unchanged', key='foo'),
+        bulk.PathReport(str(temp_dir / 'b'), bulk.CREATED, key='bar'),
+    ])
+    m = mock_client_call(mocker, 'sync_data_samples', report)
+    output = client_execute(workdir, ['sync', 'data_sample', str(temp_dir), '--dataset-key',
+                                      'foo', '--test-only'])
+
+    assert m.call_args[0] == ('foo', str(temp_dir))
+    assert m.call_args[1]['test_only'] is True
+    assert m.call_args[1]['manifest_path'] is None
+    assert '"foo"' in output and '"bar"' in output
+
+
 def test_command_add_data_sample_already_exists(workdir, mocker):
     m = mock_client_call(mocker, 'add_data_samples',
                          side_effect=substra.exceptions.AlreadyExists('foo', 409))
@@ -402,6 +466,32 @@ def test_command_update_data_sample(workdir, mocker):
     assert re.search(r"File '.*' does not exist\.", res)
 
 
+def test_command_cache(tmp_path):
+    cache = artifact_cache.ArtifactCache(tmp_path / 'cache')
+    content = b'content'
+    checksum = Hasher(values=[content]).compute()
+    cache.fetch(checksum, tmp_path / 'file', lambda path: pathlib.Path(path).write_bytes(content))
+
+    output = execute(['cache', 'ls', '--cache-dir', str(tmp_path / 'cache')])
+    assert checksum in output
+
+    output = execute(['cache', 'prune', '--cache-dir', str(tmp_path / 'cache')])
+    assert output == 'Removed 0 files (0 bytes).\n'
+
+    output = execute(['cache', 'prune', '--all', '--cache-dir', str(tmp_path / 'cache')])
+    assert output == 'Removed 1 files (7 bytes).\n'
+    assert cache.entries() == []
+
+
+def test_command_cache_prune_images(mocker, tmp_path):
+    m = mocker.patch('substra.cli.interface.spawner.prune_images', return_value=['image'])
+
+    output = execute(['cache', 'prune', '--images', '--cache-dir', str(tmp_path / 'cache')])
+
+    assert output == 'Removed 0 files (0 bytes).\nRemoved 1 images.\n'
+    m.assert_called_once_with()
+
+
 @pytest.mark.parametrize('exception', [
     (substra.exceptions.RequestException("foo", 400)),
     (substra.exceptions.ConnectionError("foo", 400)),
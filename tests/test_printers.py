@@ -53,3 +53,13 @@ def test_get_asset_printer(asset, output_format, printer_cls):
 ])
 def test_get_leaderboard_printer(output_format, printer_cls):
     assert isinstance(printers.get_leaderboard_printer(output_format), printer_cls)
+
+
+def test_print_table_stream(capsys, mocker):
+    mocker.patch('substra.cli.printers.TABLE_BUFFER_SIZE', 2)
+    items = ({'key': f'key-{i}'} for i in range(4))
+
+    printers.AssetPrinter().print(items, is_list=True)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.strip() for line in lines] == ['KEY', 'key-0', 'key-1', 'key-2', 'key-3']
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import os
 import zipfile
 
@@ -90,3 +91,30 @@ def test_parse_filters(raw, parsed, exception):
             utils.parse_filters(raw)
     else:
         assert utils.parse_filters(raw) == parsed
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1000])
+def test_iter_json_array(chunk_size):
+    items = [{'key': 'é' * i, 'rank': i} for i in range(10)] + [1.5, -2, None, 'foo', [1, 2]]
+    content = json.dumps(items).encode('utf-8')
+    chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    assert list(utils.iter_json_array(chunks)) == items
+
+
+@pytest.mark.parametrize('content', [
+    b'{}', b'[1 2]', b'[1,', b'[{"a": 1}', b'', b'[1,]', b'[,1]', b'[{"a": 1},\n]',
+])
+def test_iter_json_array_invalid(content):
+    with pytest.raises(ValueError):
+        list(utils.iter_json_array([content]))
+
+
+def test_iter_json_array_large_item(mocker):
+    # a large item received in many chunks is only decoded once it is complete
+    items = [{'key': 'a\\"]}' * 1000, 'values': list(range(1000))}, 'b' * 1000, 12345678]
+    content = json.dumps(items).encode('utf-8')
+    chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+    raw_decode = mocker.spy(utils._JSON_DECODER, 'raw_decode')
+
+    assert list(utils.iter_json_array(chunks)) == items
+    assert raw_decode.call_count < 10